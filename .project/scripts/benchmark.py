@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for Project Management System
+Generates a synthetic .project tree at a configurable scale (tasks across
+active/completed/backlog, task logs, large core memory files) and times the
+scripts against it through their non-interactive commands: listing, moving,
+bulk creation, module scaffolding, validation and search. Every command runs
+in its own process; wall time, throughput and peak memory are compared with
+a stored baseline so each optimisation comes with numbers. --replay also
+replays a slow-request trace from the MCP server's flight recorder against
+the tree, timing each request.
+
+Usage:
+    python .project/scripts/benchmark.py                      # small scale, compare with the baseline
+    python .project/scripts/benchmark.py --scale large --repeat 5
+    python .project/scripts/benchmark.py --tasks 20000 --logs 0 --only list next
+    python .project/scripts/benchmark.py --save-baseline
+    python .project/scripts/benchmark.py --replay .project/.mcp-trace.jsonl --only mcp
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import datetime
+import platform
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+
+from file_ops import atomic_write
+from template_engine import substitute
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+SOURCE_PROJECT_DIR = SCRIPTS_DIR.parent
+BASELINE_PATH = SOURCE_PROJECT_DIR / "benchmarks" / "baseline.json"
+BASELINE_VERSION = 1
+MCP_SERVER_PATH = SOURCE_PROJECT_DIR.parent / "bmad-agent" / "mcp-server" / "bmad_mcp_server.py"
+MCP_CONFIG_PATH = SOURCE_PROJECT_DIR.parent / "bmad-agent" / "ide-bmad-orchestrator.cfg.md"
+MCP_PROTOCOL_VERSION = "2025-06-18"
+TRACE_VERSION = 1
+REGRESSION_THRESHOLD = 10.0
+
+SCALES = {
+    "small": {"tasks": 1000, "logs": 5000, "core_kb": 256, "modules": 10, "batch": 100},
+    "medium": {"tasks": 5000, "logs": 20000, "core_kb": 512, "modules": 25, "batch": 250},
+    "large": {"tasks": 10000, "logs": 50000, "core_kb": 1024, "modules": 50, "batch": 500},
+}
+# Share of tasks generated in each state
+STATE_SHARES = [("active", 0.3), ("completed", 0.5), ("backlog", 0.2)]
+MODULE_NAMES = ["auth", "billing", "search", "reports", "notifications", "storage", "api", "ui",
+                "analytics", "admin", "import", "export", "scheduler", "audit", "sync", "cache"]
+WORDS = ("task module cache index plan review release migration schema endpoint queue worker "
+         "latency throughput regression fixture deploy rollback config parser template status "
+         "backlog milestone decision lesson incident metric budget query handler").split()
+# Written into a few task logs so the search benchmark has something to find
+SEARCH_NEEDLE = "synthetic-needle-7f3a"
+
+# Copied from the source .project; tasks and task logs are generated instead
+SKIPPED_ON_COPY = shutil.ignore_patterns(".*", "__pycache__", "*.pyc", "benchmarks")
+
+def sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def paragraph(rng, sentences=5):
+    return " ".join(sentence(rng) for _ in range(sentences))
+
+def generate_tree(root, tasks, logs, core_kb, seed=0, source=SOURCE_PROJECT_DIR):
+    """Create <root>/.project with synthetic tasks, task logs and core files; returns counts"""
+    rng = random.Random(seed)
+    project_dir = Path(root) / ".project"
+    shutil.copytree(source, project_dir, ignore=SKIPPED_ON_COPY)
+
+    task_template = (project_dir / "templates" / "task-template.md").read_text(encoding='utf-8')
+    shares = []
+    for state, share in STATE_SHARES:
+        (project_dir / "tasks" / state).mkdir(parents=True, exist_ok=True)
+        shares.append((state, int(tasks * share)))
+    shares[0] = (shares[0][0], tasks - sum(count for _, count in shares[1:]))
+
+    number = 0
+    for state, count in shares:
+        for _ in range(count):
+            task_id = f"task-SYN{number:021d}"
+            # Dependencies only point at earlier tasks, so the graph stays acyclic
+            depends_on = "None"
+            if number and rng.random() < 0.2:
+                depends_on = ", ".join(sorted({f"task-SYN{rng.randrange(number):021d}"
+                                               for _ in range(rng.randint(1, 2))}))
+            due = datetime.date(2025, 1, 1) + datetime.timedelta(days=rng.randrange(3 * 365))
+            content = substitute(task_template, {
+                "[Task Title]": f"Synthetic task {number}",
+                "[Unique task ID - auto-generated]": task_id,
+                "**Created**: [YYYY-MM-DD]": "**Created**: 2025-01-01",
+                "**Completed Date**: [YYYY-MM-DD]": "**Completed Date**: " + ("2025-01-01" if state == "completed" else "N/A"),
+                "[High/Medium/Low]": rng.choice(["High", "Medium", "Low"]),
+                "[Time estimate]": rng.choice(["2h", "4h", "1d", "3d", "1w"]),
+                "[Team member or self]": "Self",
+                "[Todo/In Progress/Completed]": "Completed" if state == "completed" else rng.choice(["Todo", "In Progress"]),
+                "[YYYY-MM-DD or N/A]": due.isoformat() if rng.random() < 0.5 else "N/A",
+                "[Task IDs this task is blocked by, or None]": depends_on,
+                "[Module name or N/A]": rng.choice(MODULE_NAMES),
+                "[Detailed description of what needs to be done]": paragraph(rng),
+            })
+            with open(project_dir / "tasks" / state / f"{task_id}_synthetic-task-{number}.md", 'w',
+                      encoding='utf-8') as f:
+                f.write(content)
+            number += 1
+
+    logs_dir = project_dir / "task-logs"
+    shutil.rmtree(logs_dir, ignore_errors=True)
+    logs_dir.mkdir()
+    start = datetime.datetime(2023, 1, 1)
+    for number in range(logs):
+        written = start + datetime.timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+        body = [f"# Task Log: Synthetic change {number}", "",
+                "## Task Information", f"- **Date**: {written:%Y-%m-%d}", f"- **Time Started**: {written:%H:%M}",
+                "", "## Details", paragraph(rng), "", "## Lessons Learned", paragraph(rng, 2)]
+        if number % 997 == 0:
+            body.append(f"Tracked under {SEARCH_NEEDLE}.")
+        with open(logs_dir / f"task-log_{written:%Y-%m-%d-%H-%M}_synthetic-{number}.md", 'w', encoding='utf-8') as f:
+            f.write("\n".join(body) + "\n")
+
+    target = core_kb * 1024
+    for core_file in sorted((project_dir / "core").glob("*.md")):
+        parts = [core_file.read_text(encoding='utf-8').rstrip("\n"), ""]
+        size = len(parts[0])
+        section = 0
+        while size < target:
+            text = f"\n## Synthetic Notes {section}\n\n" + "\n\n".join(paragraph(rng) for _ in range(8)) + "\n"
+            parts.append(text)
+            size += len(text)
+            section += 1
+        core_file.write_text("\n".join(parts), encoding='utf-8')
+
+    return {"tasks": tasks, "logs": logs, "core_kb": core_kb}
+
+def run_process(argv, cwd, allowed=(0,)):
+    """Run a command; return (wall seconds, peak RSS in KiB or None)
+
+    On Unix the child's own resource usage is collected with wait4, so the
+    peak memory is that of the script alone.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        started = time.perf_counter()
+        process = subprocess.Popen(argv, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                   stderr=stderr)
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(process.pid, 0)
+            wall = time.perf_counter() - started
+            process.returncode = os.waitstatus_to_exitcode(status)
+            max_rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        else:
+            process.wait()
+            wall = time.perf_counter() - started
+            max_rss = None
+        if process.returncode not in allowed:
+            stderr.seek(0)
+            raise RuntimeError(f"{' '.join(map(str, argv))} exited with {process.returncode}:\n"
+                               f"{stderr.read().decode('utf-8', errors='replace')}")
+    return wall, max_rss
+
+class Benchmark:
+    """One timed command with its optional setup and teardown around each run"""
+
+    def __init__(self, name, argv, items, unit, setup=None, teardown=None, allowed=(0,)):
+        self.name = name
+        self.argv = argv
+        self.items = items
+        self.unit = unit
+        self.setup = setup
+        self.teardown = teardown
+        self.allowed = allowed
+
+    def run(self, root, repeat, warmup):
+        walls = []
+        peaks = []
+        for run in range(warmup + repeat):
+            if self.setup:
+                self.setup()
+            try:
+                wall, max_rss = run_process([sys.executable] + self.argv, root, self.allowed)
+            finally:
+                if self.teardown:
+                    self.teardown()
+            if run >= warmup:
+                walls.append(wall)
+                peaks.append(max_rss)
+        median = statistics.median(walls)
+        return {
+            "name": self.name,
+            "runs": [round(wall, 6) for wall in walls],
+            "median": round(median, 6),
+            "min": round(min(walls), 6),
+            "items": self.items,
+            "unit": self.unit,
+            "throughput": round(self.items / median, 2) if median else None,
+            "max_rss_kb": max(peaks) if None not in peaks else None,
+        }
+
+def load_trace(path):
+    """Read the replayable requests of an MCP flight recorder trace (JSON Lines)"""
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("v") == TRACE_VERSION and entry.get("method"):
+                entries.append(entry)
+    return entries
+
+class McpReplay:
+    """Replays traced MCP requests against one server process on the generated tree
+
+    Each request is sent warmup + repeat times and timed from writing the
+    request to reading its response, so the figures compare with the
+    latency the flight recorder saw. Requests naming tasks or files of the
+    traced project may fail on the synthetic tree; those are reported.
+    """
+
+    def __init__(self, entries, server=MCP_SERVER_PATH, config=MCP_CONFIG_PATH):
+        self.entries = entries
+        self.server = Path(server)
+        self.config = Path(config)
+        self.next_id = 0
+
+    def call(self, process, method, params):
+        self.next_id += 1
+        message = {"jsonrpc": "2.0", "id": self.next_id, "method": method, "params": params}
+        process.stdin.write(json.dumps(message) + "\n")
+        process.stdin.flush()
+        # Skip progress notifications until the response arrives
+        for line in process.stdout:
+            response = json.loads(line)
+            if response.get("id") == self.next_id:
+                return response
+        raise RuntimeError("MCP server exited during replay")
+
+    def run(self, root, repeat, warmup):
+        env = dict(os.environ, BMAD_CONFIG_PATH=str(self.config), BMAD_PROJECT_ROOT=str(root),
+                   BMAD_TRACE_PATH=os.devnull)
+        results = []
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen([sys.executable, str(self.server)], cwd=root, env=env, text=True,
+                                       stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr)
+            try:
+                self.call(process, "initialize", {"protocolVersion": MCP_PROTOCOL_VERSION, "capabilities": {}})
+                for number, entry in enumerate(self.entries, 1):
+                    walls = []
+                    for run in range(warmup + repeat):
+                        started = time.perf_counter()
+                        response = self.call(process, entry["method"], entry.get("params") or {})
+                        wall = time.perf_counter() - started
+                        if run >= warmup:
+                            walls.append(wall)
+                    if "error" in response:
+                        outcome = "rpc_error"
+                    else:
+                        outcome = "tool_error" if response["result"].get("isError") else "ok"
+                    median = statistics.median(walls)
+                    results.append({
+                        "name": f"mcp #{number} {entry.get('tool') or entry['method']}",
+                        "runs": [round(wall, 6) for wall in walls],
+                        "median": round(median, 6),
+                        "min": round(min(walls), 6),
+                        "items": 1,
+                        "unit": "requests",
+                        "throughput": round(1 / median, 2) if median else None,
+                        "max_rss_kb": None,
+                        "traced_ms": entry.get("total_ms"),
+                        "traced_outcome": entry.get("outcome"),
+                        "outcome": outcome,
+                    })
+            except (OSError, ValueError, RuntimeError) as e:
+                stderr.seek(0)
+                log = stderr.read().decode('utf-8', errors='replace')
+                raise RuntimeError(f"Replay failed: {e}\n{log[-2000:]}")
+            finally:
+                process.stdin.close()
+                if hasattr(os, "wait4"):
+                    _, status, usage = os.wait4(process.pid, 0)
+                    process.returncode = os.waitstatus_to_exitcode(status)
+                    max_rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+                else:
+                    process.wait()
+                    max_rss = None
+        for result in results:
+            result["max_rss_kb"] = max_rss
+        return results
+
+def script(name):
+    return str(SCRIPTS_DIR / name)
+
+def define_benchmarks(root, scale):
+    """Return the benchmarks for a generated tree at root"""
+    project_dir = Path(root) / ".project"
+    tasks_dir = project_dir / "tasks"
+    work_dir = Path(root) / ".benchmark"
+    work_dir.mkdir(exist_ok=True)
+    batch = scale["batch"]
+    benchmarks = []
+
+    def drop_index():
+        for name in (".task-index.json", ".task-graph.json"):
+            (tasks_dir / name).unlink(missing_ok=True)
+
+    benchmarks.append(Benchmark("list (cold index)", [script("manage-tasks.py"), "list", "--json", "--no-daemon"],
+                                scale["tasks"], "tasks", setup=drop_index))
+    benchmarks.append(Benchmark("list", [script("manage-tasks.py"), "list", "--json", "--no-daemon"],
+                                scale["tasks"], "tasks"))
+    benchmarks.append(Benchmark("next", [script("manage-tasks.py"), "next", "--json"], scale["tasks"], "tasks"))
+
+    move_list = work_dir / "move.txt"
+    moved = []
+
+    def prepare_move():
+        names = sorted(entry.name for entry in os.scandir(tasks_dir / "backlog") if entry.name.endswith(".md"))
+        moved[:] = names[:batch]
+        move_list.write_text("\n".join(moved) + "\n", encoding='utf-8')
+
+    def undo_move():
+        for name in moved:
+            source = tasks_dir / "active" / name
+            if source.exists():
+                os.replace(source, tasks_dir / "backlog" / name)
+
+    benchmarks.append(Benchmark("move", [script("manage-tasks.py"), "move", "--to", "active", "--from", str(move_list)],
+                                batch, "tasks", setup=prepare_move, teardown=undo_move))
+
+    records = work_dir / "create.jsonl"
+    records.write_text("".join(
+        json.dumps({"title": f"Bulk task {n}", "priority": "Low", "state": "backlog", "module": "bulk"}) + "\n"
+        for n in range(batch)
+    ), encoding='utf-8')
+    before_create = set()
+
+    def remember_backlog():
+        before_create.clear()
+        before_create.update(entry.name for entry in os.scandir(tasks_dir / "backlog"))
+
+    def remove_created():
+        for entry in os.scandir(tasks_dir / "backlog"):
+            if entry.name not in before_create:
+                os.unlink(entry.path)
+
+    benchmarks.append(Benchmark("create", [script("manage-tasks.py"), "create", "--from", str(records)],
+                                batch, "tasks", setup=remember_backlog, teardown=remove_created))
+
+    manifest = work_dir / "modules.json"
+    manifest.write_text(json.dumps({"modules": [
+        {"name": f"bench-module-{n}", "type": "web-backend"} for n in range(scale["modules"])
+    ]}), encoding='utf-8')
+    active_context = project_dir / "core" / "activeContext.md"
+    saved = {}
+
+    def snapshot_scaffold():
+        saved["context"] = active_context.read_bytes() if active_context.exists() else None
+        saved["logs"] = {entry.name for entry in os.scandir(project_dir / "task-logs")}
+
+    def remove_scaffold():
+        shutil.rmtree(Path(root) / "modules", ignore_errors=True)
+        for n in range(scale["modules"]):
+            (project_dir / "plans" / f"bench-module-{n}-implementation-plan.md").unlink(missing_ok=True)
+        for entry in os.scandir(project_dir / "task-logs"):
+            if entry.name not in saved["logs"]:
+                os.unlink(entry.path)
+        if saved["context"] is not None:
+            active_context.write_bytes(saved["context"])
+
+    benchmarks.append(Benchmark("scaffold modules", [script("create-module.py"), "--manifest", str(manifest)],
+                                scale["modules"], "modules", setup=snapshot_scaffold, teardown=remove_scaffold))
+
+    files = sum(len(filenames) for _, _, filenames in os.walk(project_dir))
+    # Validation exits 1 when the synthetic tree fails a check; that still counts as a run
+    benchmarks.append(Benchmark("validate (no cache)", [script("validate-system.py"), "--no-daemon", "--no-cache"],
+                                files, "files", allowed=(0, 1)))
+    benchmarks.append(Benchmark("validate (cached)", [script("validate-system.py"), "--no-daemon"],
+                                files, "files", allowed=(0, 1)))
+    searched = scale["tasks"] + scale["logs"]
+    benchmarks.append(Benchmark("search", [script("project_search.py"), "--no-daemon", SEARCH_NEEDLE],
+                                searched, "files", allowed=(0, 1)))
+    return benchmarks
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return baseline if baseline.get("version") == BASELINE_VERSION else None
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Annotate results with their change against the baseline; returns the regressions"""
+    previous = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(result["name"])
+        if not before:
+            continue
+        result["baseline_median"] = before["median"]
+        result["change"] = round(100 * (result["median"] - before["median"]) / before["median"], 1)
+        if before.get("max_rss_kb") and result.get("max_rss_kb"):
+            result["rss_change"] = round(100 * (result["max_rss_kb"] - before["max_rss_kb"]) / before["max_rss_kb"], 1)
+        if result["change"] > threshold:
+            regressions.append(result["name"])
+    return regressions
+
+def print_results(results, scale, baseline):
+    print(f"\nScale: {scale['tasks']} tasks, {scale['logs']} task logs, {scale['core_kb']} KiB core files, "
+          f"{scale['modules']} modules, batches of {scale['batch']}")
+    if baseline is not None:
+        print(f"Baseline: {baseline.get('created_at')} (Python {baseline.get('python')})")
+    width = max([22] + [len(result["name"]) for result in results])
+    print(f"\n{'Benchmark':<{width}} {'Median':>9} {'Min':>9} {'Throughput':>18} {'Peak RSS':>10} {'vs baseline':>12}")
+    for result in results:
+        throughput = f"{result['throughput']:,.0f} {result['unit']}/s" if result["throughput"] else "-"
+        rss = f"{result['max_rss_kb'] / 1024:.1f} MiB" if result["max_rss_kb"] else "-"
+        change = f"{result['change']:+.1f}%" if "change" in result else "-"
+        print(f"{result['name']:<{width}} {result['median'] * 1000:>7.1f}ms {result['min'] * 1000:>7.1f}ms "
+              f"{throughput:>18} {rss:>10} {change:>12}")
+
+    replayed = [result for result in results if "traced_ms" in result]
+    if replayed:
+        print(f"\n{'Replayed request':<{width}} {'Traced':>9} {'Replayed':>9}  Outcome")
+        for result in replayed:
+            traced = f"{result['traced_ms']:.1f}ms" if result["traced_ms"] is not None else "-"
+            outcome = result["outcome"]
+            if outcome != result["traced_outcome"]:
+                outcome += f" (traced: {result['traced_outcome']})"
+            print(f"{result['name']:<{width}} {traced:>9} {result['median'] * 1000:>7.1f}ms  {outcome}")
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the .project scripts on a synthetic tree")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="Preset sizes (default: small)")
+    parser.add_argument("--tasks", type=int, help="Number of tasks (overrides the preset)")
+    parser.add_argument("--logs", type=int, help="Number of task logs (overrides the preset)")
+    parser.add_argument("--core-kb", type=int, help="Size of each core memory file in KiB (overrides the preset)")
+    parser.add_argument("--modules", type=int, help="Modules scaffolded per run (overrides the preset)")
+    parser.add_argument("--batch", type=int, help="Tasks moved or created per run (overrides the preset)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (median reported)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs before the timed ones")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="Run only benchmarks whose name starts with NAME")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic content")
+    parser.add_argument("--workdir", help="Generate the tree here instead of a temporary directory")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated tree")
+    parser.add_argument("--json", metavar="FILE", help="Also write the results as JSON")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline file to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Percent slowdown reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any benchmark regressed")
+    parser.add_argument("--replay", metavar="TRACE",
+                        help="Also replay an MCP flight recorder trace (.project/.mcp-trace.jsonl)")
+    parser.add_argument("--mcp-server", default=str(MCP_SERVER_PATH), help="MCP server script used by --replay")
+    parser.add_argument("--mcp-config", default=str(MCP_CONFIG_PATH), help="BMAD config the replayed server loads")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.warmup < 0:
+        parser.error("--warmup cannot be negative")
+    if args.replay and args.save_baseline:
+        parser.error("--replay results are not part of the baseline; run --save-baseline without it")
+
+    trace = []
+    if args.replay:
+        try:
+            trace = load_trace(args.replay)
+        except OSError as e:
+            print(f"Cannot read trace: {e}", file=sys.stderr)
+            return 1
+        if not trace:
+            print(f"No replayable requests in {args.replay}", file=sys.stderr)
+            return 1
+
+    scale = dict(SCALES[args.scale])
+    for key in scale:
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+
+    root = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="project-benchmark-"))
+    if (root / ".project").exists():
+        print(f"{root / '.project'} already exists; choose an empty --workdir", file=sys.stderr)
+        return 1
+    root.mkdir(parents=True, exist_ok=True)
+
+    try:
+        print(f"Generating synthetic tree in {root} ...")
+        started = time.perf_counter()
+        generate_tree(root, scale["tasks"], scale["logs"], scale["core_kb"], args.seed)
+        print(f"Generated in {time.perf_counter() - started:.1f}s")
+
+        results = []
+        for benchmark in define_benchmarks(root, scale):
+            if args.only and not any(benchmark.name.startswith(prefix) for prefix in args.only):
+                continue
+            print(f"Running {benchmark.name} ...", flush=True)
+            results.append(benchmark.run(root, args.repeat, args.warmup))
+        if trace:
+            print(f"Replaying {len(trace)} MCP requests from {args.replay} ...", flush=True)
+            try:
+                results.extend(McpReplay(trace, args.mcp_server, args.mcp_config).run(root, args.repeat, args.warmup))
+            except RuntimeError as e:
+                print(e, file=sys.stderr)
+                return 1
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "version": BASELINE_VERSION,
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "scale": scale,
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    regressions = []
+    if baseline is not None:
+        if baseline.get("scale") != scale:
+            print(f"Baseline was recorded at another scale ({baseline.get('scale')}); not comparing",
+                  file=sys.stderr)
+            baseline = None
+        else:
+            regressions = compare(results, baseline, args.threshold)
+
+    print_results(results, scale, baseline)
+    if args.json:
+        atomic_write(args.json, json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        Path(args.baseline).parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(args.baseline, json.dumps(report, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+    if regressions:
+        print(f"\nSlower than the baseline by more than {args.threshold:g}%: {', '.join(regressions)}")
+        return 1 if args.fail_on_regression else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
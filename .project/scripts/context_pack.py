@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Context Pack Builder for Project Management System
+Assembles memory-index.md and the .project/core/*.md memory bank into one
+compact, deduplicated document within a token budget, so an agent starts a
+session by reading a single cached file. Sources are cached by hash and only
+changed files are re-parsed; the pack is rewritten only when its sources or
+the budget change.
+
+Usage:
+    python .project/scripts/context_pack.py [--budget 4000] [--stdout]
+"""
+
+import re
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+
+from file_ops import atomic_write
+
+PROJECT_DIR = Path(".project")
+PACK_PATH = PROJECT_DIR / ".context-pack.md"
+MANIFEST_PATH = PROJECT_DIR / ".context-pack.json"
+MANIFEST_VERSION = 1
+DEFAULT_BUDGET = 4000
+# Rough size of a token in characters, for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+
+HEADING_PATTERN = re.compile(r'^(#{1,2}) ', re.MULTILINE)
+INDEXED_FILE_PATTERN = re.compile(r'`(\.project/[^`]+\.md)`')
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def split_sections(content):
+    """Split Markdown into (heading, text) sections at # and ## headings"""
+    starts = [match.start() for match in HEADING_PATTERN.finditer(content)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    sections = []
+    for start, end in zip(starts, starts[1:] + [len(content)]):
+        text = content[start:end].strip()
+        if text:
+            heading = text.splitlines()[0].lstrip("#").strip() if text.startswith("#") else ""
+            sections.append({"heading": heading, "text": text})
+    return sections
+
+def normalize(paragraph):
+    return " ".join(paragraph.split()).lower()
+
+def source_files(project_dir=PROJECT_DIR):
+    """Return the memory index followed by the core files"""
+    files = []
+    index_path = project_dir / "memory-index.md"
+    if index_path.exists():
+        files.append(index_path)
+    core_dir = project_dir / "core"
+    if core_dir.is_dir():
+        files.extend(sorted(core_dir.glob("*.md")))
+    return files
+
+def index_order(index_text):
+    """Return the .project paths listed in the memory index, in listed order"""
+    order = []
+    for path in INDEXED_FILE_PATTERN.findall(index_text):
+        if path not in order:
+            order.append(path)
+    return order
+
+class ContextPackBuilder:
+    """Builds the context pack, reusing parsed sources whose hash is unchanged"""
+
+    def __init__(self, project_dir=PROJECT_DIR, pack_path=PACK_PATH, manifest_path=MANIFEST_PATH):
+        self.project_dir = Path(project_dir)
+        self.pack_path = Path(pack_path)
+        self.manifest_path = Path(manifest_path)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {"version": MANIFEST_VERSION, "sources": {}}
+
+    def _source(self, path):
+        """Return the cached parse of a source, re-parsing it only if it changed"""
+        key = path.as_posix()
+        stat = path.stat()
+        cached = self.manifest["sources"].get(key)
+        if cached and (cached["mtime_ns"], cached["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return cached
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if cached and cached["sha256"] == digest:
+            cached.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            return cached
+        content = data.decode('utf-8')
+        return {
+            "path": key,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "sections": split_sections(content),
+            "index_order": index_order(content) if path.name == "memory-index.md" else None,
+        }
+
+    def _rank(self, sources):
+        """Order sources: memory index first, then by listing in it and by recency
+
+        A file's rank is the sum of its position in the memory index and its
+        position by modification time (newest first); ties keep index order.
+        """
+        listed = next((s["index_order"] for s in sources if s["index_order"] is not None), None) or []
+        position = {path: i for i, path in enumerate(listed)}
+        by_recency = sorted(sources, key=lambda s: -s["mtime_ns"])
+        recency = {s["path"]: i for i, s in enumerate(by_recency)}
+
+        def rank(source):
+            if source["index_order"] is not None:
+                return (-1, -1)
+            listed_at = position.get(source["path"], len(listed))
+            return (listed_at + recency[source["path"]], listed_at)
+
+        return sorted(sources, key=rank)
+
+    def select(self, sources, budget):
+        """Choose sections within the budget; return (selected, omitted)
+
+        Sections are considered breadth first (every file's first section,
+        then every file's second, ...) so each file keeps its headline.
+        Paragraphs already included elsewhere are dropped. When anything
+        has to be left out, room is kept for the list of omitted files.
+        """
+        ranked = self._rank(sources)
+        order = sorted(
+            ((position, rank, source, section)
+             for rank, source in enumerate(ranked)
+             for position, section in enumerate(source["sections"])),
+            key=lambda item: (item[0], item[1]),
+        )
+        available = budget - estimate_tokens(self.header(budget))
+        selected, omitted = self._fill(order, available)
+        if omitted:
+            reserve = estimate_tokens(self.omitted_list([(s["path"], 0) for s in sources] + [("", 0)]))
+            selected, omitted = self._fill(order, available - reserve)
+        return selected, omitted
+
+    @staticmethod
+    def _fill(order, available):
+        seen = set()
+        used = 0
+        selected = []
+        omitted = {}
+        sources_used = set()
+        for position, rank, source, section in order:
+            paragraphs = []
+            for paragraph in section["text"].split("\n\n"):
+                key = normalize(paragraph)
+                if key and key not in seen:
+                    paragraphs.append(paragraph)
+            if not paragraphs:
+                continue
+            text = "\n\n".join(paragraphs)
+            cost = estimate_tokens(text + "\n\n")
+            if source["path"] not in sources_used:
+                cost += estimate_tokens(ContextPackBuilder.source_marker(source["path"]))
+            if used + cost > available:
+                omitted[source["path"]] = omitted.get(source["path"], 0) + 1
+                continue
+            used += cost
+            sources_used.add(source["path"])
+            seen.update(normalize(paragraph) for paragraph in paragraphs)
+            selected.append((rank, position, source["path"], text))
+        selected.sort()
+        return selected, sorted(omitted.items())
+
+    @staticmethod
+    def header(budget):
+        return f"<!-- Generated by context_pack.py (budget {budget} tokens); do not edit -->\n"
+
+    @staticmethod
+    def source_marker(path):
+        return f"\n<!-- source: {path} -->\n"
+
+    @staticmethod
+    def omitted_list(omitted):
+        lines = ["\n## Omitted for size\n"]
+        lines.extend(f"- {path}: {count} section(s)\n" for path, count in omitted)
+        return "".join(lines)
+
+    def render(self, selected, omitted, budget):
+        parts = [self.header(budget)]
+        current = None
+        for _, _, path, text in selected:
+            if path != current:
+                parts.append(self.source_marker(path))
+                current = path
+            parts.append(text + "\n\n")
+        if omitted:
+            parts.append(self.omitted_list(omitted))
+        return "".join(parts)
+
+    def build(self, budget=DEFAULT_BUDGET, force=False):
+        """Return (pack text, rebuilt); the pack is only rewritten if inputs changed"""
+        sources = [self._source(path) for path in source_files(self.project_dir)]
+        key = hashlib.sha256(json.dumps(
+            [budget] + [(s["path"], s["sha256"]) for s in sources]
+        ).encode('utf-8')).hexdigest()
+
+        if not force and self.manifest.get("key") == key and self.pack_path.exists():
+            # Persist refreshed mtimes so the next run can skip hashing
+            self._save(sources, key)
+            return self.pack_path.read_text(encoding='utf-8'), False
+
+        selected, omitted = self.select(sources, budget)
+        pack = self.render(selected, omitted, budget)
+        atomic_write(self.pack_path, pack)
+        self._save(sources, key)
+        return pack, True
+
+    def _save(self, sources, key):
+        manifest = {"version": MANIFEST_VERSION, "key": key, "sources": {s["path"]: s for s in sources}}
+        if manifest != self.manifest:
+            self.manifest = manifest
+            atomic_write(self.manifest_path, json.dumps(manifest))
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Build a token-budgeted context pack from the memory bank")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="Approximate token budget")
+    parser.add_argument("--stdout", action="store_true", help="Print the pack instead of a status line")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if no source changed")
+    args = parser.parse_args()
+
+    if not PROJECT_DIR.exists():
+        print("No .project directory here; run from the project root.", file=sys.stderr)
+        return 1
+
+    pack, rebuilt = ContextPackBuilder().build(args.budget, args.force)
+    if args.stdout:
+        sys.stdout.write(pack)
+    else:
+        state = "Rebuilt" if rebuilt else "Up to date:"
+        print(f"{state} {PACK_PATH} (~{estimate_tokens(pack)} tokens)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
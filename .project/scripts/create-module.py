@@ -6,10 +6,22 @@ This script helps create new modules with proper documentation structure
 
 import os
 import sys
-import shutil
+import json
+import argparse
 import datetime
+import difflib
+import concurrent.futures
 from pathlib import Path
 
+import profiling
+from file_ops import atomic_write
+from template_engine import compile_template, render_template, render_templates, substitute_file
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
 class Colors:
     """ANSI color codes for terminal output"""
     RED = '\033[0;31m'
@@ -62,46 +74,51 @@ def prompt_yes_no(prompt, default="y"):
 def replace_in_file(file_path, replacements):
     """Replace text in a file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        for old, new in replacements.items():
-            content = content.replace(old, new)
-        
-        with open(file_path, 'w', encoding='utf-8') as file:
-            file.write(content)
-        
+        substitute_file(file_path, replacements)
         return True
     except Exception as e:
         print_error(f"Error updating {file_path}: {e}")
         return False
 
 def copy_and_customize_template(template_path, target_path, replacements):
-    """Copy template file and apply customizations"""
+    """Render template file to target with customizations applied"""
     try:
-        shutil.copy2(template_path, target_path)
-        replace_in_file(target_path, replacements)
+        render_template(template_path, target_path, replacements)
         return True
     except Exception as e:
         print_error(f"Error copying template {template_path}: {e}")
         return False
 
-def create_module_directory_structure(module_dir, module_type):
-    """Create module directory structure based on type"""
+def copy_and_customize_templates(jobs):
+    """Render (template, target, replacements) jobs concurrently; return the targets written"""
+    created = []
+    for target_path, error in render_templates(jobs):
+        if error:
+            print_error(f"Error creating {target_path}: {error}")
+        else:
+            created.append(target_path)
+    return created
+
+MODULE_TYPES = ["web-frontend", "web-backend", "mobile", "library", "generic"]
+
+def module_directories(module_type):
+    """Return the directory names created for a module type"""
     base_dirs = ["components", "services", "types", "utils"]
     
     if module_type == "web-frontend":
-        dirs = base_dirs + ["pages", "assets", "styles"]
+        return base_dirs + ["pages", "assets", "styles"]
     elif module_type == "web-backend":
-        dirs = base_dirs + ["routes", "models", "middleware"]
+        return base_dirs + ["routes", "models", "middleware"]
     elif module_type == "mobile":
-        dirs = base_dirs + ["screens", "navigation", "assets"]
+        return base_dirs + ["screens", "navigation", "assets"]
     elif module_type == "library":
-        dirs = base_dirs + ["lib", "examples", "tests"]
+        return base_dirs + ["lib", "examples", "tests"]
     else:  # generic
-        dirs = base_dirs
-    
-    for dir_name in dirs:
+        return base_dirs
+
+def create_module_directory_structure(module_dir, module_type):
+    """Create module directory structure based on type"""
+    for dir_name in module_directories(module_type):
         dir_path = module_dir / dir_name
         dir_path.mkdir(exist_ok=True)
         
@@ -109,8 +126,299 @@ def create_module_directory_structure(module_dir, module_type):
         gitkeep_path = dir_path / ".gitkeep"
         gitkeep_path.touch()
 
-def main():
-    """Main module creation function"""
+def module_replacements(module):
+    """Return the template replacements for a module"""
+    return {
+        "[Module Name]": module["name"],
+        "[Module Description]": module["description"],
+        "[Module Purpose]": module["purpose"],
+        "[Module Type]": module["type"],
+        "[Dependencies]": module["dependencies"],
+        "[Integration Points]": module["integrations"],
+        "[Date]": datetime.datetime.now().strftime("%Y-%m-%d"),
+    }
+
+def implementation_plan_content(module):
+    """Return the implementation plan document for a module"""
+    module_name = module["name"]
+    dependencies = module["dependencies"]
+    integrations = module["integrations"]
+    return f"""# {module_name} Module Implementation Plan
+
+## Overview
+Implementation plan for the {module_name} module.
+
+## Module Information
+- **Name**: {module_name}
+- **Description**: {module["description"]}
+- **Purpose**: {module["purpose"]}
+- **Type**: {module["type"]}
+- **Created**: {datetime.datetime.now().strftime("%Y-%m-%d")}
+
+## Dependencies
+{dependencies if dependencies else "None specified"}
+
+## Integration Points
+{integrations if integrations else "None specified"}
+
+## Implementation Phases
+
+### Phase 1: Foundation
+- [ ] Set up module structure
+- [ ] Create core interfaces
+- [ ] Implement basic functionality
+- [ ] Write initial tests
+
+### Phase 2: Core Features
+- [ ] Implement main features
+- [ ] Add error handling
+- [ ] Enhance test coverage
+- [ ] Create documentation
+
+### Phase 3: Integration
+- [ ] Integrate with core system
+- [ ] Test cross-module interactions
+- [ ] Performance optimization
+- [ ] Final documentation review
+
+## Success Criteria
+- [ ] All planned features implemented
+- [ ] Test coverage > 80%
+- [ ] Documentation complete
+- [ ] Integration tests passing
+- [ ] Performance requirements met
+
+## Timeline
+- **Phase 1**: [Estimated duration]
+- **Phase 2**: [Estimated duration]
+- **Phase 3**: [Estimated duration]
+- **Total**: [Total estimated duration]
+
+## Resources Required
+- [List required resources]
+
+## Risks and Mitigation
+- [Identify potential risks and mitigation strategies]
+
+## Notes
+[Additional notes and considerations]
+"""
+
+def active_context_with_activities(content, activities):
+    """Return activeContext.md content with activities added under Recent Activities"""
+    recent_activities_marker = "## Recent Activities"
+    if recent_activities_marker not in content:
+        return None
+    insertion_point = content.find(recent_activities_marker) + len(recent_activities_marker)
+    new_activities = "".join(f"\n- {activity}" for activity in activities)
+    return content[:insertion_point] + new_activities + content[insertion_point:]
+
+def _as_text(value):
+    """Normalise a manifest list or string field to the comma-separated form"""
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value)
+    return str(value)
+
+def load_manifest(manifest_path):
+    """Load a YAML or JSON module manifest and return normalised module specs
+
+    The manifest is either a list of modules or a mapping with a ``modules``
+    list and optional ``defaults`` applied to every module. A module is a
+    mapping, or a bare string naming a module with default settings.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    
+    if str(manifest_path).endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise ValueError("PyYAML is required for YAML manifests (pip install pyyaml); or use a JSON manifest")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    
+    if isinstance(data, list):
+        data = {"modules": data}
+    if not isinstance(data, dict):
+        raise ValueError("A manifest must be a list of modules or a mapping with a 'modules' list")
+    defaults = data.get("defaults") or {}
+    if not isinstance(defaults, dict):
+        raise ValueError("'defaults' must be a mapping")
+    entries = data.get("modules") or []
+    if not isinstance(entries, list):
+        raise ValueError("'modules' must be a list")
+    
+    modules = []
+    seen = set()
+    for index, entry in enumerate(entries):
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        elif not isinstance(entry, dict):
+            raise ValueError(f"Module entry {index} must be a mapping or a module name, not {type(entry).__name__}: {entry!r}")
+        spec = {**defaults, **entry}
+        name = str(spec.get("name") or "").strip()
+        if not name:
+            raise ValueError(f"Module entry without a name: {entry}")
+        # The name becomes a directory under modules/ and a plan file name
+        if "/" in name or "\\" in name or ".." in name or name == ".":
+            raise ValueError(f"Module entry {index} has an invalid name '{name}' (no path separators or '..')")
+        if name in seen:
+            raise ValueError(f"Module '{name}' is listed more than once")
+        seen.add(name)
+        
+        for option in ("create_structure", "create_plan"):
+            if not isinstance(spec.get(option, True), bool):
+                raise ValueError(f"Module '{name}' has invalid {option} {spec[option]!r} (expected true or false)")
+        
+        module_type = spec.get("type") or "generic"
+        if module_type not in MODULE_TYPES:
+            raise ValueError(f"Module '{name}' has unknown type '{module_type}' (expected one of {', '.join(MODULE_TYPES)})")
+        
+        modules.append({
+            "name": name,
+            "description": spec.get("description") or f"The {name} module",
+            "purpose": spec.get("purpose") or f"Provides {name} functionality",
+            "type": module_type,
+            "dependencies": _as_text(spec.get("dependencies")),
+            "integrations": _as_text(spec.get("integrations")),
+            "create_structure": spec.get("create_structure", True),
+            "create_plan": spec.get("create_plan", True),
+        })
+    return modules
+
+def plan_manifest(modules, module_template_dir, overwrite=False):
+    """Work out every directory and file a manifest run creates or changes
+
+    Returns (directories, files, skipped) where files is a list of
+    (path, content) pairs and skipped lists modules that already exist.
+    """
+    directories = []
+    files = []
+    skipped = []
+    created = []
+    template_files = sorted(module_template_dir.glob("*.md"))
+    
+    for module in modules:
+        module_dir = Path("modules") / module["name"]
+        if module_dir.exists() and not overwrite:
+            skipped.append(module["name"])
+            continue
+        created.append(module)
+        directories.append(module_dir)
+        
+        replacements = module_replacements(module)
+        for template_file in template_files:
+            content = compile_template(template_file, replacements.keys()).render(replacements)
+            files.append((module_dir / template_file.name, content))
+        
+        if module["create_structure"]:
+            for dir_name in module_directories(module["type"]):
+                directories.append(module_dir / dir_name)
+                gitkeep_path = module_dir / dir_name / ".gitkeep"
+                if not gitkeep_path.exists():
+                    files.append((gitkeep_path, ""))
+        
+        if module["create_plan"]:
+            plan_file = Path(f".project/plans/{module['name']}-implementation-plan.md")
+            files.append((plan_file, implementation_plan_content(module)))
+    
+    if created:
+        # One task log and one active context update for the whole batch
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d-%H-%M")
+        task_log_template = Path(".project/templates/task-log-template.md")
+        if task_log_template.exists():
+            task_log_replacements = {
+                "[Brief Description]": f"Create {len(created)} Modules from Manifest",
+                "YYYY-MM-DD": datetime.datetime.now().strftime("%Y-%m-%d"),
+                "HH:MM": datetime.datetime.now().strftime("%H:%M"),
+            }
+            task_log_file = Path(f".project/task-logs/task-log_{timestamp}_create-{len(created)}-modules.md")
+            content = compile_template(task_log_template, task_log_replacements.keys()).render(task_log_replacements)
+            files.append((task_log_file, content))
+        
+        active_context_path = Path(".project/core/activeContext.md")
+        if active_context_path.exists():
+            with open(active_context_path, 'r', encoding='utf-8') as f:
+                content = active_context_with_activities(f.read(), [
+                    f"Created {module['name']} module with documentation and structure" for module in created
+                ])
+            if content is not None:
+                files.append((active_context_path, content))
+    
+    return directories, files, skipped
+
+def print_manifest_diff(directories, files):
+    """Print what a manifest run would do as unified diffs"""
+    for directory in directories:
+        if not directory.exists():
+            print(f"mkdir {directory}")
+    
+    for path, content in files:
+        old_content = ""
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                old_content = f.read()
+        if old_content == content and path.exists():
+            continue
+        diff = difflib.unified_diff(
+            old_content.splitlines(True),
+            content.splitlines(True),
+            fromfile=str(path) if path.exists() else "/dev/null",
+            tofile=str(path),
+        )
+        sys.stdout.writelines(diff)
+        if content and not content.endswith("\n"):
+            print()
+
+def scaffold_from_manifest(manifest_path, dry_run=False, overwrite=False):
+    """Create every module listed in a manifest in a single run"""
+    print_header("Module Creation from Manifest")
+    
+    module_template_dir = Path(".project/templates/module-template")
+    if not module_template_dir.exists():
+        print_error("Module template directory not found.")
+        print_error("Please ensure .project/templates/module-template/ exists.")
+        return 1
+    
+    try:
+        with profiling.phase("load manifest"):
+            modules = load_manifest(manifest_path)
+    except (OSError, ValueError) as e:
+        print_error(f"Could not load manifest {manifest_path}: {e}")
+        return 1
+    
+    with profiling.phase("plan modules"):
+        directories, files, skipped = plan_manifest(modules, module_template_dir, overwrite)
+    for name in skipped:
+        print_warning(f"Module '{name}' already exists; skipping (use --overwrite to replace it)")
+    
+    if dry_run:
+        print_manifest_diff(directories, files)
+        print_status(f"Dry run: {len(modules) - len(skipped)} module(s), {len(files)} file(s) would be written")
+        return 0
+    
+    # Batch directory creation, then write every file concurrently
+    with profiling.phase("create directories"):
+        Path("modules").mkdir(exist_ok=True)
+        for directory in directories:
+            directory.mkdir(parents=True, exist_ok=True)
+    
+    failures = 0
+    with profiling.phase("write files"), concurrent.futures.ThreadPoolExecutor() as executor:
+        futures = {executor.submit(atomic_write, path, content): path for path, content in files}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print_error(f"Error writing {futures[future]}: {e}")
+                failures += 1
+    
+    print_status(f"Created {len(modules) - len(skipped)} module(s), wrote {len(files) - failures} file(s)")
+    return 1 if failures else 0
+
+def create_module_interactive():
+    """Create a single module through interactive prompts"""
     print_header("Module Creation Tool")
     
     print("This script will help you create a new module with proper documentation structure.")
@@ -189,28 +497,31 @@ def main():
     print_status(f"Created module directory: {module_dir}")
     
     # Prepare replacements
-    replacements = {
-        "[Module Name]": module_name,
-        "[Module Description]": module_description,
-        "[Module Purpose]": module_purpose,
-        "[Module Type]": module_type,
-        "[Dependencies]": dependencies,
-        "[Integration Points]": integrations,
-        "[Date]": datetime.datetime.now().strftime("%Y-%m-%d"),
+    module = {
+        "name": module_name,
+        "description": module_description,
+        "purpose": module_purpose,
+        "type": module_type,
+        "dependencies": dependencies,
+        "integrations": integrations,
     }
+    replacements = module_replacements(module)
     
     # Copy and customize template files
     print_status("Creating module documentation...")
     
-    for template_file in module_template_dir.glob("*.md"):
-        target_file = module_dir / template_file.name
-        copy_and_customize_template(template_file, target_file, replacements)
+    jobs = [
+        (template_file, module_dir / template_file.name, replacements)
+        for template_file in sorted(module_template_dir.glob("*.md"))
+    ]
+    for target_file in copy_and_customize_templates(jobs):
         print_status(f"Created {target_file.name}")
     
     # Create directory structure if requested
     if create_directory_structure:
         print_status("Creating module directory structure...")
-        create_module_directory_structure(module_dir, module_type)
+        with profiling.phase("create directories"):
+            create_module_directory_structure(module_dir, module_type)
         print_status(f"Created {module_type} directory structure")
     
     # Create implementation plan if requested
@@ -218,69 +529,11 @@ def main():
         print_status("Creating implementation plan...")
         plan_file = Path(f".project/plans/{module_name}-implementation-plan.md")
         
-        plan_content = f"""# {module_name} Module Implementation Plan
-
-## Overview
-Implementation plan for the {module_name} module.
-
-## Module Information
-- **Name**: {module_name}
-- **Description**: {module_description}
-- **Purpose**: {module_purpose}
-- **Type**: {module_type}
-- **Created**: {datetime.datetime.now().strftime("%Y-%m-%d")}
-
-## Dependencies
-{dependencies if dependencies else "None specified"}
-
-## Integration Points
-{integrations if integrations else "None specified"}
-
-## Implementation Phases
-
-### Phase 1: Foundation
-- [ ] Set up module structure
-- [ ] Create core interfaces
-- [ ] Implement basic functionality
-- [ ] Write initial tests
-
-### Phase 2: Core Features
-- [ ] Implement main features
-- [ ] Add error handling
-- [ ] Enhance test coverage
-- [ ] Create documentation
-
-### Phase 3: Integration
-- [ ] Integrate with core system
-- [ ] Test cross-module interactions
-- [ ] Performance optimization
-- [ ] Final documentation review
-
-## Success Criteria
-- [ ] All planned features implemented
-- [ ] Test coverage > 80%
-- [ ] Documentation complete
-- [ ] Integration tests passing
-- [ ] Performance requirements met
-
-## Timeline
-- **Phase 1**: [Estimated duration]
-- **Phase 2**: [Estimated duration]
-- **Phase 3**: [Estimated duration]
-- **Total**: [Total estimated duration]
-
-## Resources Required
-- [List required resources]
-
-## Risks and Mitigation
-- [Identify potential risks and mitigation strategies]
-
-## Notes
-[Additional notes and considerations]
-"""
-        
-        with open(plan_file, 'w', encoding='utf-8') as f:
-            f.write(plan_content)
+        with profiling.phase("create implementation plan"):
+            plan_content = implementation_plan_content(module)
+            
+            with open(plan_file, 'w', encoding='utf-8') as f:
+                f.write(plan_content)
         
         print_status(f"Created implementation plan: {plan_file}")
     
@@ -296,7 +549,8 @@ Implementation plan for the {module_name} module.
             "YYYY-MM-DD": datetime.datetime.now().strftime("%Y-%m-%d"),
             "HH:MM": datetime.datetime.now().strftime("%H:%M"),
         }
-        copy_and_customize_template(task_log_template, task_log_file, task_log_replacements)
+        with profiling.phase("create task log"):
+            copy_and_customize_template(task_log_template, task_log_file, task_log_replacements)
         print_status(f"Created task log: {task_log_file}")
     
     # Update active context
@@ -308,12 +562,10 @@ Implementation plan for the {module_name} module.
                 content = f.read()
             
             # Add module creation to recent activities
-            recent_activities_marker = "## Recent Activities"
-            if recent_activities_marker in content:
-                insertion_point = content.find(recent_activities_marker) + len(recent_activities_marker)
-                new_activity = f"\n- Created {module_name} module with documentation and structure"
-                content = content[:insertion_point] + new_activity + content[insertion_point:]
-                
+            content = active_context_with_activities(
+                content, [f"Created {module_name} module with documentation and structure"]
+            )
+            if content is not None:
                 with open(active_context_path, 'w', encoding='utf-8') as f:
                     f.write(content)
                 
@@ -340,5 +592,26 @@ Implementation plan for the {module_name} module.
     print()
     print_status("Happy coding!")
 
+def main():
+    """Main module creation function"""
+    parser = argparse.ArgumentParser(
+        description="Create modules. Run without options for interactive mode."
+    )
+    parser.add_argument("--manifest", help="YAML or JSON manifest listing modules to create")
+    parser.add_argument("--dry-run", action="store_true", help="With --manifest, print a diff instead of writing")
+    parser.add_argument("--overwrite", action="store_true", help="With --manifest, replace existing modules")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    
+    with profiling.from_args("create-module", args):
+        if args.manifest:
+            if not os.path.exists(".project/memory-index.md") or not os.path.exists(".project"):
+                print_error("This doesn't appear to be a project management system directory.")
+                print_error("Please run this script from the root of the project management system.")
+                sys.exit(1)
+            sys.exit(scaffold_from_manifest(args.manifest, args.dry_run, args.overwrite))
+        
+        create_module_interactive()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Safe File Operations for Project Management System
+Atomic writes, exclusive file creation and advisory locking shared by the
+.project scripts
+"""
+
+import contextlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+def _write_temp(directory, content, prefix, mode=0o644):
+    """Write content to a synced temp file in directory and return its path"""
+    fd, tmp_path = tempfile.mkstemp(dir=str(directory), prefix=prefix, suffix=".tmp")
+    try:
+        os.chmod(tmp_path, mode)
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+@contextlib.contextmanager
+def atomic_open(file_path):
+    """Open a text file for writing that replaces file_path only on success
+
+    Output goes to a temp file next to the target, which is renamed over the
+    target when the block exits cleanly and discarded otherwise.
+    """
+    file_path = Path(file_path)
+    try:
+        mode = file_path.stat().st_mode & 0o777
+    except OSError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=str(file_path.parent), prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        os.chmod(tmp_path, mode)
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def atomic_write(file_path, content):
+    """Replace a file's content so readers see either the old or the new version"""
+    with atomic_open(file_path) as file:
+        file.write(content)
+
+def create_exclusive(file_path, content):
+    """Create a new file atomically, raising FileExistsError if it already exists
+
+    The content is written to a temp file first and hard-linked to the
+    final name. The link fails if the name is taken, so concurrent creators
+    can never both win, and the name only ever appears with its full
+    content: readers and crashes never leave a partial or empty file.
+    Filesystems without hard links fall back to claiming the name with
+    O_EXCL and renaming the temp file over it, where the claimed file is
+    briefly empty.
+    """
+    file_path = Path(file_path)
+    tmp_path = _write_temp(file_path.parent, content, f".{file_path.name}.")
+    try:
+        try:
+            os.link(tmp_path, str(file_path))
+            return
+        except FileExistsError:
+            raise
+        except OSError:
+            pass
+        fd = os.open(str(file_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        os.close(fd)
+        try:
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.unlink(str(file_path))
+            raise
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+class FileLock:
+    """Advisory inter-process lock held on a lock file
+
+    Uses flock on Unix and msvcrt.locking on Windows. The lock is released
+    by the OS if the holder crashes, so a stale lock file never blocks.
+    """
+
+    def __init__(self, lock_path, timeout=30.0):
+        self.lock_path = Path(lock_path)
+        self.timeout = timeout
+        self.fd = None
+
+    def acquire(self):
+        self.fd = os.open(str(self.lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(self.fd, msvcrt.LK_NBLCK, 1)
+                return self
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(self.fd)
+                    self.fd = None
+                    raise TimeoutError(f"Timed out waiting for lock {self.lock_path}")
+                time.sleep(0.01)
+
+    def release(self):
+        if self.fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -6,10 +6,13 @@ This script helps set up the project management system for new projects
 
 import os
 import sys
-import shutil
+import argparse
 import datetime
 from pathlib import Path
 
+import profiling
+from template_engine import render_template, render_templates, substitute_file
+
 class Colors:
     """ANSI color codes for terminal output"""
     RED = '\033[0;31m'
@@ -62,32 +65,42 @@ def prompt_yes_no(prompt, default="y"):
 def replace_in_file(file_path, replacements):
     """Replace text in a file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        for old, new in replacements.items():
-            content = content.replace(old, new)
-        
-        with open(file_path, 'w', encoding='utf-8') as file:
-            file.write(content)
-        
+        substitute_file(file_path, replacements)
         return True
     except Exception as e:
         print_error(f"Error updating {file_path}: {e}")
         return False
 
 def copy_and_customize_template(template_path, target_path, replacements):
-    """Copy template file and apply customizations"""
+    """Render template file to target with customizations applied"""
     try:
-        shutil.copy2(template_path, target_path)
-        replace_in_file(target_path, replacements)
+        render_template(template_path, target_path, replacements)
         return True
     except Exception as e:
         print_error(f"Error copying template {template_path}: {e}")
         return False
 
+def copy_and_customize_templates(jobs):
+    """Render (template, target, replacements) jobs concurrently; return the targets written"""
+    created = []
+    for target_path, error in render_templates(jobs):
+        if error:
+            print_error(f"Error creating {target_path}: {error}")
+        else:
+            created.append(target_path)
+    return created
+
 def main():
     """Main initialization function"""
+    parser = argparse.ArgumentParser(description="Set up the project management system for a new project")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling.from_args("init-project", args):
+        initialize()
+
+def initialize():
+    """Gather project information interactively and customize the system"""
     print_header("Project Management System Initialization")
     
     print("This script will help you set up the project management system for your project.")
@@ -145,27 +158,28 @@ def main():
     # Update core memory files
     print_status("Updating core memory files...")
     
-    # Update project brief
-    project_brief_path = Path(".project/core/projectbrief.md")
-    if project_brief_path.exists():
-        replace_in_file(project_brief_path, replacements)
-        print_status("Updated project brief")
-    
-    # Update tech context
-    tech_context_path = Path(".project/core/techContext.md")
-    if tech_context_path.exists():
-        replace_in_file(tech_context_path, replacements)
-        print_status("Updated tech context")
-    
-    # Update active context
-    active_context_path = Path(".project/core/activeContext.md")
-    if active_context_path.exists():
-        active_replacements = {
-            **replacements,
-            "Setting up the project management system": f"Initializing {project_name} project"
-        }
-        replace_in_file(active_context_path, active_replacements)
-        print_status("Updated active context")
+    with profiling.phase("update core files"):
+        # Update project brief
+        project_brief_path = Path(".project/core/projectbrief.md")
+        if project_brief_path.exists():
+            replace_in_file(project_brief_path, replacements)
+            print_status("Updated project brief")
+        
+        # Update tech context
+        tech_context_path = Path(".project/core/techContext.md")
+        if tech_context_path.exists():
+            replace_in_file(tech_context_path, replacements)
+            print_status("Updated tech context")
+        
+        # Update active context
+        active_context_path = Path(".project/core/activeContext.md")
+        if active_context_path.exists():
+            active_replacements = {
+                **replacements,
+                "Setting up the project management system": f"Initializing {project_name} project"
+            }
+            replace_in_file(active_context_path, active_replacements)
+            print_status("Updated active context")
     
     # Create README if requested
     if create_readme:
@@ -175,7 +189,8 @@ def main():
                 **replacements,
                 "[Brief description of what this project does and its main purpose]": project_description
             }
-            copy_and_customize_template(readme_template, "README.md", readme_replacements)
+            with profiling.phase("create README"):
+                copy_and_customize_template(readme_template, "README.md", readme_replacements)
             print_status("Created README.md")
         else:
             print_warning("README template not found")
@@ -184,7 +199,8 @@ def main():
     if create_contributing:
         contributing_template = Path(".project/templates/CONTRIBUTING-template.md")
         if contributing_template.exists():
-            copy_and_customize_template(contributing_template, "CONTRIBUTING.md", replacements)
+            with profiling.phase("create CONTRIBUTING"):
+                copy_and_customize_template(contributing_template, "CONTRIBUTING.md", replacements)
             print_status("Created CONTRIBUTING.md")
         else:
             print_warning("CONTRIBUTING template not found")
@@ -202,17 +218,20 @@ def main():
 
             module_template_dir = Path(".project/templates/module-template")
             if module_template_dir.exists():
-                module_dir = modules_dir / module_name
-                module_dir.mkdir(exist_ok=True)
+                with profiling.phase("create module"):
+                    module_dir = modules_dir / module_name
+                    with profiling.phase("create directories"):
+                        module_dir.mkdir(exist_ok=True)
 
-                # Copy all template files
-                for template_file in module_template_dir.glob("*.md"):
-                    target_file = module_dir / template_file.name
+                    # Render all template files
                     module_replacements = {
                         **replacements,
                         "[Module Name]": module_name
                     }
-                    copy_and_customize_template(template_file, target_file, module_replacements)
+                    copy_and_customize_templates([
+                        (template_file, module_dir / template_file.name, module_replacements)
+                        for template_file in sorted(module_template_dir.glob("*.md"))
+                    ])
 
                 print_status(f"Created module: {module_name}")
             else:
@@ -230,7 +249,8 @@ def main():
             "YYYY-MM-DD": datetime.datetime.now().strftime("%Y-%m-%d"),
             "HH:MM": datetime.datetime.now().strftime("%H:%M"),
         }
-        copy_and_customize_template(task_log_template, task_log_file, task_log_replacements)
+        with profiling.phase("create task log"):
+            copy_and_customize_template(task_log_template, task_log_file, task_log_replacements)
         print_status(f"Created initial task log: {task_log_file}")
 
     # Update memory index
@@ -240,7 +260,8 @@ def main():
         memory_replacements = {
             "This is a reusable project management system": f"This is the {project_name} project"
         }
-        replace_in_file(memory_index_path, memory_replacements)
+        with profiling.phase("update memory index"):
+            replace_in_file(memory_index_path, memory_replacements)
     
     # Create .gitignore if it doesn't exist
     gitignore_path = Path(".gitignore")
@@ -255,6 +276,20 @@ def main():
 # Error logs (uncomment if you don't want to track error logs)
 # .project/errors/*.md
 
+# Task metadata index (rebuilt automatically by manage-tasks.py)
+.project/tasks/.task-index.json
+.project/tasks/.tasks.lock
+.project/tasks/.task-graph.json
+.project/status/.rollup.json
+.project/.validation-cache.json
+.project/.daemon.sock
+.project/.daemon.pid
+.project/task-logs/.archive.lock
+.project/.context-pack.md
+.project/.context-pack.json
+.project/.search-index.json
+.project/.mcp-trace.jsonl*
+
 # Temporary files
 *.tmp
 *.bak
@@ -271,7 +306,7 @@ Thumbs.db
 .DS_Store
 Thumbs.db
 """
-        with open(gitignore_path, 'w', encoding='utf-8') as f:
+        with profiling.phase("create .gitignore"), open(gitignore_path, 'w', encoding='utf-8') as f:
             f.write(gitignore_content)
     
     print_header("Initialization Complete!")
@@ -6,10 +6,19 @@ This script helps create, update, and manage tasks in the system
 
 import os
 import sys
-import datetime
-import shutil
+import csv
+import json
+import argparse
 from pathlib import Path
 
+import profiling
+import project_daemon
+import task_ops
+from task_graph import TaskGraph
+from task_index import TASK_STATES, TaskIndex
+from task_ops import TASK_TEMPLATE_PATH, create_task_file, load_task_template
+from task_rollup import TaskRollup
+
 class Colors:
     """ANSI color codes for terminal output"""
     RED = '\033[0;31m'
@@ -58,35 +67,15 @@ def prompt_choice(prompt, choices):
         except ValueError:
             print("Please enter a valid number.")
 
-def generate_task_id():
-    """Generate unique task ID"""
-    timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
-    return f"task-{timestamp}"
-
-def replace_in_file(file_path, replacements):
-    """Replace text in a file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        for old, new in replacements.items():
-            content = content.replace(old, new)
-        
-        with open(file_path, 'w', encoding='utf-8') as file:
-            file.write(content)
-        
-        return True
-    except Exception as e:
-        print_error(f"Error updating {file_path}: {e}")
-        return False
+TASKS_ROOT = Path(".project/tasks")
+PRIORITIES = ["High", "Medium", "Low"]
 
 def create_task():
     """Create a new task"""
     print_header("Create New Task")
     
     # Check if template exists
-    template_path = Path(".project/templates/task-template.md")
-    if not template_path.exists():
+    if not TASK_TEMPLATE_PATH.exists():
         print_error("Task template not found. Please ensure .project/templates/task-template.md exists.")
         return
     
@@ -97,65 +86,66 @@ def create_task():
         return
     
     task_description = prompt_input("Task description", "")
-    priority = prompt_choice("Priority", ["High", "Medium", "Low"])
+    priority = prompt_choice("Priority", PRIORITIES)
     estimated_time = prompt_input("Estimated time", "TBD")
     assigned_to = prompt_input("Assigned to", "Self")
     due_date = prompt_input("Due date (YYYY-MM-DD or N/A)", "N/A")
+    depends_on = prompt_input("Depends on (comma-separated task IDs or None)", "None")
+    module = prompt_input("Module (or N/A)", "N/A")
     
-    # Generate task ID and create file
-    task_id = generate_task_id()
-    task_filename = f"{task_id}_{task_title.lower().replace(' ', '-').replace('/', '-')}.md"
-    task_path = Path(f".project/tasks/active/{task_filename}")
-    
-    # Copy template and customize
-    shutil.copy2(template_path, task_path)
-    
-    replacements = {
-        "[Task Title]": task_title,
-        "[Unique task ID - auto-generated]": task_id,
-        "[YYYY-MM-DD]": datetime.datetime.now().strftime("%Y-%m-%d"),
-        "[High/Medium/Low]": priority,
-        "[Time estimate]": estimated_time,
-        "[Team member or self]": assigned_to,
-        "[Todo/In Progress/Completed]": "Todo",
-        "[YYYY-MM-DD or N/A]": due_date,
-        "[Detailed description of what needs to be done]": task_description or "Description to be added"
-    }
-    
-    replace_in_file(task_path, replacements)
+    index = TaskIndex()
+    rollup = TaskRollup().attach(index)
+    task_path = create_task_file(task_title, task_description, priority, estimated_time, assigned_to, due_date,
+                                 index=index, depends_on=depends_on, module=module)
+    rollup.publish()
     
-    print_status(f"Created task: {task_filename}")
-    print_status(f"Task ID: {task_id}")
+    print_status(f"Created task: {task_path.name}")
+    print_status(f"Task ID: {task_path.stem.split('_', 1)[0]}")
     print_status(f"Location: {task_path}")
 
-def list_tasks():
+def format_task(entry):
+    """Format an indexed task for display"""
+    details = [entry.get("priority") or "No priority", entry.get("status") or "No status"]
+    if entry.get("assigned_to"):
+        details.append(entry["assigned_to"])
+    if entry.get("due_date") and entry["due_date"] != "N/A":
+        details.append(f"due {entry['due_date']}")
+    return f"  - {entry['title']} [{', '.join(details)}] ({entry['filename']})"
+
+def list_tasks(index=None, sort_by="filename", **filters):
     """List all tasks"""
     print_header("Task Overview")
     
-    for status in ["active", "completed", "backlog"]:
+    index = index or TaskIndex()
+    index.refresh()
+    
+    for status in TASK_STATES:
         task_dir = Path(f".project/tasks/{status}")
         if task_dir.exists():
-            tasks = list(task_dir.glob("*.md"))
+            tasks = index.query(state=status, sort_by=sort_by, **filters)
             print(f"\n{Colors.BLUE}{status.upper()} ({len(tasks)} tasks):{Colors.NC}")
             
             if tasks:
-                for task_file in sorted(tasks):
-                    # Extract task title from filename
-                    filename = task_file.stem
-                    if "_" in filename:
-                        task_title = filename.split("_", 1)[1].replace("-", " ").title()
-                    else:
-                        task_title = filename.replace("-", " ").title()
-                    print(f"  - {task_title} ({task_file.name})")
+                for entry in tasks:
+                    print(format_task(entry))
             else:
                 print(f"  No {status} tasks")
 
+def move_task_file(task_file, new_status, index, lock=None):
+    """Move a task to another state directory and return (old state, new path)
+
+    The move is transactional (see task_ops.move_task); raises TaskMoveError
+    if the task is missing or the destination already has it.
+    """
+    return task_ops.move_indexed_task(TASKS_ROOT, task_file, new_status, index, lock)
+
 def move_task():
     """Move task between directories"""
     print_header("Move Task")
     
     # List current tasks
-    list_tasks()
+    index = TaskIndex()
+    list_tasks(index)
     
     # Get task to move
     task_file = prompt_input("Enter task filename (with .md extension)")
@@ -163,51 +153,325 @@ def move_task():
         task_file += ".md"
     
     # Find the task
-    task_path = None
-    current_status = None
-    
-    for status in ["active", "completed", "backlog"]:
-        potential_path = Path(f".project/tasks/{status}/{task_file}")
-        if potential_path.exists():
-            task_path = potential_path
-            current_status = status
-            break
-    
-    if not task_path:
+    entry = index.find(task_file)
+    if not entry:
         print_error(f"Task '{task_file}' not found in any directory.")
         return
     
     # Choose destination
-    statuses = ["active", "completed", "backlog"]
+    current_status = entry["state"]
+    statuses = list(TASK_STATES)
     statuses.remove(current_status)
     
     new_status = prompt_choice(f"Move from '{current_status}' to", statuses)
-    new_path = Path(f".project/tasks/{new_status}/{task_file}")
+    rollup = TaskRollup().attach(index)
+    try:
+        current_status, _ = move_task_file(task_file, new_status, index)
+    except task_ops.TaskMoveError as e:
+        print_error(str(e))
+        return
+    rollup.publish()
+    
+    print_status(f"Moved task from '{current_status}' to '{new_status}'")
+
+def read_records(source, plain_key):
+    """Read records from a JSONL or CSV file ('-' for stdin)
+
+    A file whose first line is neither JSON nor a CSV header naming
+    ``plain_key`` is read as one plain value per line (e.g. a list of task
+    filenames piped from ls).
     
-    # Move the file
-    shutil.move(task_path, new_path)
+    Returns (records, skipped). JSONL lines that are not valid JSON objects
+    are reported with their line number and skipped.
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as file:
+            lines = file.read().splitlines()
     
-    # Update task status in file if moving to completed
-    if new_status == "completed":
-        replacements = {
-            "**Status**: Todo": "**Status**: Completed",
-            "**Status**: In Progress": "**Status**: Completed",
-            "**Completed Date**: [YYYY-MM-DD]": f"**Completed Date**: {datetime.datetime.now().strftime('%Y-%m-%d')}"
-        }
-        replace_in_file(new_path, replacements)
+    numbered = [(number, line) for number, line in enumerate(lines, 1) if line.strip()]
+    if not numbered:
+        return [], 0
     
-    print_status(f"Moved task from '{current_status}' to '{new_status}'")
+    if numbered[0][1].lstrip().startswith("{"):
+        records = []
+        skipped = 0
+        for number, line in numbered:
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                print_error(f"Skipping line {number}: invalid JSON ({e})")
+                skipped += 1
+                continue
+            if not isinstance(record, dict):
+                print_error(f"Skipping line {number}: expected a JSON object, not {type(record).__name__}")
+                skipped += 1
+                continue
+            records.append(record)
+        return records, skipped
+    
+    lines = [line for _, line in numbered]
+    reader = csv.DictReader(lines)
+    if plain_key in (reader.fieldnames or []):
+        return list(reader), 0
+    return [{plain_key: line.strip()} for line in lines], 0
 
-def main():
-    """Main task management function"""
-    print_header("Task Management System")
+def run_create(args):
+    """Create one task from flags or many from a JSONL/CSV file"""
+    if not TASK_TEMPLATE_PATH.exists():
+        print_error("Task template not found. Please ensure .project/templates/task-template.md exists.")
+        return 1
     
-    # Check if we're in the right directory
-    if not os.path.exists(".project/tasks"):
-        print_error("Task management directories not found.")
-        print_error("Please run this script from the project root with .project/tasks/ structure.")
-        sys.exit(1)
+    skipped = 0
+    if args.from_file:
+        records, skipped = read_records(args.from_file, "title")
+    elif args.title:
+        records = [{
+            "title": args.title,
+            "description": args.description,
+            "priority": args.priority,
+            "estimated_time": args.estimated_time,
+            "assigned_to": args.assigned_to,
+            "due_date": args.due_date,
+            "state": args.state,
+            "depends_on": args.depends_on,
+            "module": args.module,
+        }]
+    else:
+        print_error("Either --title or --from is required.")
+        return 1
     
+    template = load_task_template()
+    index = TaskIndex()
+    index.autosave = False
+    rollup = TaskRollup().attach(index)
+    failures = skipped
+    created = 0
+    
+    with profiling.phase("create tasks"):
+        for record in records:
+            title = (record.get("title") or "").strip()
+            state = record.get("state") or args.state
+            if not title or state not in TASK_STATES:
+                print_error(f"Skipping invalid record: {record}")
+                failures += 1
+                continue
+            
+            task_path = create_task_file(
+                title,
+                record.get("description") or "",
+                record.get("priority") or args.priority,
+                record.get("estimated_time") or args.estimated_time,
+                record.get("assigned_to") or args.assigned_to,
+                record.get("due_date") or args.due_date,
+                state=state,
+                template=template,
+                index=index,
+                depends_on=record.get("depends_on") or args.depends_on,
+                module=record.get("module") or args.module,
+            )
+            print(task_path)
+            created += 1
+    
+    with profiling.phase("save index"):
+        index.save()
+    rollup.publish()
+    print_status(f"Created {created} task(s)")
+    return 1 if failures else 0
+
+def run_list(args):
+    """List tasks from the index, optionally filtered, sorted or as JSON
+
+    Served from the project daemon when it is running.
+    """
+    index = (not args.no_daemon and project_daemon.connect_task_index()) or TaskIndex().refresh()
+    filters = {
+        "priority": args.priority,
+        "status": args.status,
+        "assigned_to": args.assigned_to,
+    }
+    
+    if args.json:
+        states = [args.state] if args.state else TASK_STATES
+        tasks = [entry for state in states for entry in index.query(state=state, sort_by=args.sort, **filters)]
+        print(json.dumps(tasks, indent=2))
+        return 0
+    
+    if args.state:
+        print_header(f"{args.state.title()} Tasks")
+        for entry in index.query(state=args.state, sort_by=args.sort, **filters):
+            print(format_task(entry))
+    else:
+        list_tasks(index, sort_by=args.sort, **filters)
+    return 0
+
+def load_task_graph():
+    """Return the dependency graph, synced with the refreshed task index"""
+    graph = TaskGraph(TASKS_ROOT).sync(TaskIndex().refresh())
+    graph.save()
+    for dependency, task in graph.rejected:
+        print_warning(f"Ignoring dependency of {task} on {dependency}: it would create a cycle")
+    return graph
+
+def format_graph_task(task):
+    """Format a task from the dependency graph for display"""
+    hours = f", {task['hours']:g}h" if task["hours"] else ""
+    return f"  - {task['title']} [{task.get('priority') or '-'}{hours}] ({task['filename']})"
+
+def run_next(args):
+    """List tasks whose dependencies are all completed"""
+    tasks = load_task_graph().ready()[:args.limit]
+    if args.json:
+        print(json.dumps(tasks, indent=2))
+        return 0
+    print_header("Ready to Start")
+    for task in tasks:
+        print(format_graph_task(task))
+    if not tasks:
+        print("  No tasks are ready")
+    return 0
+
+def run_blocked(args):
+    """List unfinished tasks and what they are waiting on"""
+    tasks = load_task_graph().blocked()
+    if args.json:
+        print(json.dumps(tasks, indent=2))
+        return 0
+    print_header("Blocked Tasks")
+    for task in tasks:
+        print(format_graph_task(task))
+        print(f"      blocked by: {', '.join(task['blocked_by'])}")
+    if not tasks:
+        print("  No blocked tasks")
+    return 0
+
+def run_critical_path(args):
+    """Show the longest chain of unfinished work by estimated time"""
+    graph = load_task_graph()
+    hours, keys = graph.critical_path()
+    tasks = [graph.describe(key) for key in keys]
+    if args.json:
+        print(json.dumps({"hours": hours, "tasks": tasks}, indent=2))
+        return 0
+    print_header(f"Critical Path ({hours:g}h)")
+    for task in tasks:
+        print(format_graph_task(task))
+    if not tasks:
+        print("  No remaining tasks")
+    return 0
+
+def run_rollup(args):
+    """Bring the status file rollups up to date with the task directories"""
+    index = TaskIndex()
+    rollup = TaskRollup().attach(index)
+    index.refresh()
+    written = rollup.publish()
+    for path in written:
+        print_status(f"Updated {path}")
+    if not written:
+        print_status("Status files are up to date")
+    return 0
+
+def run_move(args, new_status=None):
+    """Move one or many tasks to a new state with a single directory scan"""
+    new_status = new_status or args.to
+    task_files = list(args.tasks)
+    skipped = 0
+    if args.from_file:
+        records, skipped = read_records(args.from_file, "filename")
+        task_files.extend(record.get("filename") or "" for record in records)
+    
+    if not task_files:
+        print_error("No tasks given.")
+        return 1
+    
+    index = TaskIndex()
+    rollup = TaskRollup().attach(index)
+    index.refresh()
+    index.autosave = False
+    failures = skipped
+    
+    # Hold the task lock for the whole batch rather than once per task
+    with profiling.phase("move tasks"), task_ops.tasks_lock(TASKS_ROOT) as lock:
+        for task_file in task_files:
+            task_file = task_file.strip()
+            if not task_file.endswith(".md"):
+                task_file += ".md"
+            
+            try:
+                current_status, _ = move_task_file(task_file, new_status, index, lock)
+            except task_ops.TaskMoveError as e:
+                print_error(str(e))
+                failures += 1
+                continue
+            print_status(f"Moved {task_file} from '{current_status}' to '{new_status}'")
+    
+    with profiling.phase("save index"):
+        index.save()
+    rollup.publish()
+    return 1 if failures else 0
+
+def build_parser():
+    """Build the non-interactive command line interface"""
+    parser = argparse.ArgumentParser(
+        description="Manage .project tasks. Run without a command for the interactive menu."
+    )
+    profiling.add_arguments(parser)
+    subparsers = parser.add_subparsers(dest="command")
+    
+    create = subparsers.add_parser("create", help="Create a task, or many with --from")
+    create.add_argument("--title", help="Task title")
+    create.add_argument("--description", default="", help="Task description")
+    create.add_argument("--priority", choices=PRIORITIES, default="Medium")
+    create.add_argument("--estimated-time", default="TBD")
+    create.add_argument("--assigned-to", default="Self")
+    create.add_argument("--due-date", default="N/A", help="YYYY-MM-DD or N/A")
+    create.add_argument("--state", choices=TASK_STATES, default="active")
+    create.add_argument("--depends-on", default="None", metavar="IDS",
+                        help="Comma-separated IDs (or filenames) of tasks this one is blocked by")
+    create.add_argument("--module", default="N/A", help="Module the task belongs to")
+    create.add_argument("--from", dest="from_file", metavar="FILE",
+                        help="JSONL or CSV file of tasks ('-' for stdin)")
+    
+    list_parser = subparsers.add_parser("list", help="List tasks from the task index")
+    list_parser.add_argument("--state", choices=TASK_STATES)
+    list_parser.add_argument("--priority", choices=PRIORITIES)
+    list_parser.add_argument("--status", help="e.g. Todo, In Progress, Completed")
+    list_parser.add_argument("--assigned-to")
+    list_parser.add_argument("--sort", default="filename",
+                             choices=["filename", "priority", "due_date", "created", "title"])
+    list_parser.add_argument("--json", action="store_true", help="Print tasks as JSON")
+    list_parser.add_argument("--no-daemon", action="store_true",
+                             help="Scan the task directories even if the project daemon is running")
+    
+    move = subparsers.add_parser("move", help="Move tasks to another state")
+    move.add_argument("tasks", nargs="*", help="Task filenames")
+    move.add_argument("--to", choices=TASK_STATES, required=True)
+    move.add_argument("--from", dest="from_file", metavar="FILE",
+                      help="JSONL/CSV with a 'filename' column or one filename per line ('-' for stdin)")
+    
+    complete = subparsers.add_parser("complete", help="Move tasks to completed")
+    complete.add_argument("tasks", nargs="*", help="Task filenames")
+    complete.add_argument("--from", dest="from_file", metavar="FILE",
+                          help="JSONL/CSV with a 'filename' column or one filename per line ('-' for stdin)")
+    
+    next_parser = subparsers.add_parser("next", help="Show tasks that can be started now")
+    next_parser.add_argument("--limit", type=int, default=10, help="Show at most this many tasks")
+    next_parser.add_argument("--json", action="store_true", help="Print tasks as JSON")
+    
+    blocked = subparsers.add_parser("blocked", help="Show tasks waiting on other tasks")
+    blocked.add_argument("--json", action="store_true", help="Print tasks as JSON")
+    
+    critical = subparsers.add_parser("critical-path", help="Show the longest chain of remaining work")
+    critical.add_argument("--json", action="store_true", help="Print the path as JSON")
+    
+    subparsers.add_parser("rollup", help="Update the task rollups in the status files")
+    
+    return parser
+
+def interactive_menu():
+    """Run the interactive task management menu"""
     while True:
         print("\nAvailable actions:")
         print("1. Create new task")
@@ -229,5 +493,36 @@ def main():
         else:
             print_warning("Invalid choice. Please try again.")
 
+def main():
+    """Main task management function"""
+    args = build_parser().parse_args()
+    
+    # Check if we're in the right directory
+    if not os.path.exists(".project/tasks"):
+        print_error("Task management directories not found.")
+        print_error("Please run this script from the project root with .project/tasks/ structure.")
+        sys.exit(1)
+    
+    with profiling.from_args("manage-tasks", args):
+        if args.command == "create":
+            sys.exit(run_create(args))
+        elif args.command == "list":
+            sys.exit(run_list(args))
+        elif args.command == "move":
+            sys.exit(run_move(args))
+        elif args.command == "complete":
+            sys.exit(run_move(args, "completed"))
+        elif args.command == "next":
+            sys.exit(run_next(args))
+        elif args.command == "blocked":
+            sys.exit(run_blocked(args))
+        elif args.command == "critical-path":
+            sys.exit(run_critical_path(args))
+        elif args.command == "rollup":
+            sys.exit(run_rollup(args))
+        
+        print_header("Task Management System")
+        interactive_menu()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Profiling for Project Management System
+Per-phase wall time and file operation counts for the .project scripts,
+switched on with --profile. Scripts and shared modules mark phases with
+profiling.phase(); file operations (opens, directory creation, renames,
+removals, directory scans, subprocesses) are counted through an audit hook
+and charged to every phase running at the time. Optionally dumps cProfile
+statistics and writes a JSON report for CI to archive.
+
+Usage:
+    python .project/scripts/validate-system.py --profile
+    python .project/scripts/validate-system.py --profile-json timings.json --profile-cprofile validate.prof
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import datetime
+import platform
+import threading
+import contextlib
+
+from file_ops import atomic_write
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_VERSION = 1
+
+# Audit events counted as file operations, by the name they are reported under
+AUDITED_EVENTS = {
+    "os.mkdir": "mkdir",
+    "os.rename": "rename",
+    "os.remove": "remove",
+    "os.rmdir": "rmdir",
+    "os.scandir": "scandir",
+    "os.listdir": "listdir",
+    "os.chmod": "chmod",
+    "os.utime": "utime",
+    "shutil.copyfile": "copyfile",
+    "subprocess.Popen": "subprocess",
+}
+WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_APPEND | os.O_CREAT
+
+_active = None
+_hook_installed = False
+
+def _audit(event, args):
+    profiler = _active
+    if profiler is None:
+        return
+    if event == "open":
+        _, mode, flags = args
+        writes = any(c in mode for c in "wax+") if isinstance(mode, str) else bool(flags & WRITE_FLAGS)
+        profiler.count_file_op("open_write" if writes else "open_read")
+        return
+    kind = AUDITED_EVENTS.get(event)
+    if kind is not None:
+        profiler.count_file_op(kind)
+
+class Profiler:
+    """Collects phase timings and file operation counts for one script run
+
+    Phases nest; a phase's time and counts include its sub-phases, and a
+    phase entered several times is reported once with its call count.
+    Phases are only recorded on the thread that started the profiler, but
+    file operations from worker threads are charged to its current phases.
+    """
+
+    def __init__(self, script, enabled=True, json_path=None, cprofile_path=None, stream=None):
+        self.script = script
+        self.enabled = enabled
+        self.json_path = json_path
+        self.cprofile_path = cprofile_path
+        self.stream = stream or sys.stderr
+        self.phases = {}
+        self.stack = []
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.thread = None
+        self.started = None
+        self.started_at = None
+        self.wall = 0.0
+        self.cprofile = None
+
+    def start(self):
+        global _active, _hook_installed
+        if not self.enabled:
+            return self
+        self.thread = threading.get_ident()
+        self.started_at = datetime.datetime.now().isoformat(timespec="seconds")
+        if not _hook_installed and hasattr(sys, "addaudithook"):
+            sys.addaudithook(_audit)
+            _hook_installed = True
+        _active = self
+        if self.cprofile_path:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        self.started = time.perf_counter()
+        return self
+
+    def finish(self):
+        """Stop profiling, print the summary and write the requested reports"""
+        global _active
+        if not self.enabled or self.started is None:
+            return
+        self.wall = time.perf_counter() - self.started
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        _active = None
+        self.started = None
+
+        self.print_summary()
+        if self.cprofile is not None:
+            self.cprofile.dump_stats(self.cprofile_path)
+            print(f"cProfile stats written to {self.cprofile_path} (python -m pstats {self.cprofile_path})",
+                  file=self.stream)
+        if self.json_path:
+            atomic_write(self.json_path, json.dumps(self.report(), indent=2) + "\n")
+            print(f"Timing report written to {self.json_path}", file=self.stream)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish()
+        return False
+
+    def _entry(self, path):
+        entry = self.phases.get(path)
+        if entry is None:
+            entry = self.phases[path] = {"calls": 0, "wall": 0.0, "files": {}}
+        return entry
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        if self.started is None or threading.get_ident() != self.thread:
+            yield
+            return
+        with self.lock:
+            self.stack.append(name)
+            path = tuple(self.stack)
+            self._entry(path)
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - began
+            with self.lock:
+                entry = self.phases[path]
+                entry["calls"] += 1
+                entry["wall"] += elapsed
+                self.stack.pop()
+
+    def record(self, name, seconds, calls=1):
+        """Add an externally measured duration as a sub-phase of the current phase"""
+        if self.started is None:
+            return
+        with self.lock:
+            entry = self._entry(tuple(self.stack) + (name,))
+            entry["calls"] += calls
+            entry["wall"] += seconds
+
+    def count(self, name, amount=1):
+        """Add to a named counter, such as the number of templates rendered"""
+        if self.started is None:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_file_op(self, kind):
+        with self.lock:
+            self.counters[kind] = self.counters.get(kind, 0) + 1
+            for depth in range(1, len(self.stack) + 1):
+                files = self.phases[tuple(self.stack[:depth])]["files"]
+                files[kind] = files.get(kind, 0) + 1
+
+    def report(self):
+        """Return the timing report as a JSON-compatible document"""
+        report = {
+            "version": REPORT_VERSION,
+            "script": self.script,
+            "argv": sys.argv[1:],
+            "started_at": self.started_at,
+            "python": platform.python_version(),
+            "platform": sys.platform,
+            "wall": round(self.wall, 6),
+            "counters": dict(sorted(self.counters.items())),
+            "phases": [
+                {
+                    "name": path[-1],
+                    "path": "/".join(path),
+                    "depth": len(path) - 1,
+                    "calls": entry["calls"],
+                    "wall": round(entry["wall"], 6),
+                    "files": dict(sorted(entry["files"].items())),
+                }
+                for path, entry in self.phases.items()
+            ],
+        }
+        if resource is not None:
+            # ru_maxrss is in KiB on Linux and bytes on macOS
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            report["max_rss_kb"] = max_rss // 1024 if sys.platform == "darwin" else max_rss
+        return report
+
+    def print_summary(self):
+        print(f"\nProfile: {self.script} ({self.wall * 1000:.1f} ms)", file=self.stream)
+        width = max([len("  " * (len(path) - 1) + path[-1]) for path in self.phases] + [5])
+        print(f"  {'Phase':<{width}}  {'Calls':>5}  {'ms':>9}  Files", file=self.stream)
+        for path, entry in self.phases.items():
+            name = "  " * (len(path) - 1) + path[-1]
+            files = ", ".join(f"{kind} {count}" for kind, count in sorted(entry["files"].items())) or "-"
+            print(f"  {name:<{width}}  {entry['calls']:>5}  {entry['wall'] * 1000:>9.2f}  {files}",
+                  file=self.stream)
+        if self.counters:
+            print("  Totals: " + ", ".join(f"{name} {count}" for name, count in sorted(self.counters.items())),
+                  file=self.stream)
+
+def phase(name):
+    """Time a block as a phase of the active profiler; does nothing when profiling is off"""
+    profiler = _active
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.phase(name)
+
+def record(name, seconds, calls=1):
+    profiler = _active
+    if profiler is not None:
+        profiler.record(name, seconds, calls)
+
+def count(name, amount=1):
+    profiler = _active
+    if profiler is not None:
+        profiler.count(name, amount)
+
+def add_arguments(parser):
+    """Add the --profile options to a script's argument parser"""
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--profile", action="store_true",
+                       help="Print per-phase wall time and file operation counts to stderr")
+    group.add_argument("--profile-json", metavar="FILE",
+                       help="Also write the timings as a JSON report (implies --profile)")
+    group.add_argument("--profile-cprofile", metavar="FILE",
+                       help="Also dump cProfile stats for pstats (implies --profile)")
+
+def from_args(script, args):
+    """Return a (not yet started) Profiler configured from parsed arguments"""
+    enabled = bool(args.profile or args.profile_json or args.profile_cprofile)
+    return Profiler(script, enabled, args.profile_json, args.profile_cprofile)
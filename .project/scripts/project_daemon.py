@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Project State Daemon for Project Management System
+Keeps an in-memory model of .project/ (tasks, task logs, core memory files,
+plans, status) warm in a background process and answers list, query, search
+and validate requests over a Unix socket. Scripts use it when it is running
+and scan .project/ directly when it is not.
+
+Usage:
+    python .project/scripts/project_daemon.py start
+    python .project/scripts/project_daemon.py status
+    python .project/scripts/project_daemon.py stop
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import socketserver
+from pathlib import Path
+
+from project_search import SearchIndex
+from task_index import TASK_STATES, TaskIndex, title_from_filename
+from validation_engine import ValidationCache, report_dict, run_validation, system_categories
+
+PROJECT_DIR = Path(".project")
+SOCKET_PATH = PROJECT_DIR / ".daemon.sock"
+PID_PATH = PROJECT_DIR / ".daemon.pid"
+POLL_INTERVAL = 1.0
+
+# Areas of .project/ mirrored in memory besides the tasks
+WATCHED_AREAS = ["core", "plans", "status", "task-logs", "knowledge"]
+
+def read_title(file_path):
+    """Return the first Markdown heading of a file, or a title from its name"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.startswith("# "):
+                    return line[2:].strip()
+    except (OSError, UnicodeDecodeError):
+        pass
+    return title_from_filename(file_path)
+
+class ProjectState:
+    """In-memory model of .project/, refreshed incrementally by mtime and size"""
+
+    def __init__(self, project_dir=PROJECT_DIR):
+        self.project_dir = Path(project_dir)
+        self.tasks = TaskIndex(self.project_dir / "tasks")
+        self.files = {area: {} for area in WATCHED_AREAS}
+        self.validation_cache = ValidationCache(str(self.project_dir / ".validation-cache.json"))
+        self.search_index = SearchIndex(self.project_dir, self.project_dir / ".search-index.json")
+        self.refreshed_at = None
+        self.lock = threading.RLock()
+
+    def _refresh_area(self, area):
+        area_dir = self.project_dir / area
+        previous = self.files[area]
+        current = {}
+        for directory, _, filenames in os.walk(area_dir):
+            for filename in filenames:
+                if not filename.endswith(".md"):
+                    continue
+                file_path = Path(directory) / filename
+                try:
+                    stat = file_path.stat()
+                except OSError:
+                    continue
+                relative = file_path.relative_to(area_dir).as_posix()
+                entry = previous.get(relative)
+                if not entry or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                    entry = {
+                        "path": relative,
+                        "title": read_title(file_path),
+                        "mtime_ns": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                    }
+                current[relative] = entry
+        self.files[area] = current
+
+    def refresh(self):
+        """Bring the model up to date; only changed files are re-read"""
+        with self.lock:
+            self.tasks.refresh()
+            for area in WATCHED_AREAS:
+                self._refresh_area(area)
+            self.refreshed_at = time.time()
+        return self
+
+    def list_tasks(self, state=None, sort_by="filename", **filters):
+        with self.lock:
+            self.tasks.refresh()
+            return self.tasks.query(state=state, sort_by=sort_by, **filters)
+
+    def list_files(self, area):
+        if area not in self.files:
+            raise ValueError(f"Unknown area '{area}'")
+        with self.lock:
+            self._refresh_area(area)
+            return sorted(self.files[area].values(), key=lambda entry: entry["path"])
+
+    def validate(self):
+        """Run the system validation, reusing cached content rule outcomes"""
+        with self.lock:
+            category_results = run_validation(system_categories(), cache=self.validation_cache)
+        return report_dict(category_results)
+
+    def search(self, query, regex=False, ignore_case=False, areas=None, limit=None):
+        """Search the indexed areas, re-indexing only files changed since the last query"""
+        with self.lock:
+            self.search_index.refresh()
+            self.search_index.save()
+            return self.search_index.search(query, regex, ignore_case, areas, limit)
+
+    def summary(self):
+        with self.lock:
+            return {
+                "tasks": {state: len(self.tasks.query(state=state)) for state in TASK_STATES},
+                "files": {area: len(entries) for area, entries in self.files.items()},
+                "refreshed_at": self.refreshed_at,
+                "pid": os.getpid(),
+            }
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Answers one JSON request per line with one JSON response per line"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                result = self.server.dispatch(request.get("command"), request.get("args") or {})
+                response = {"ok": True, "result": result}
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(response) + "\n").encode('utf-8'))
+            self.wfile.flush()
+
+class ProjectDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Socket server in front of a ProjectState kept fresh by a polling thread"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path=SOCKET_PATH, state=None, interval=POLL_INTERVAL):
+        self.state = (state or ProjectState()).refresh()
+        self.interval = interval
+        self.stopping = threading.Event()
+        self.socket_path = str(socket_path)
+        super().__init__(self.socket_path, RequestHandler)
+
+    def dispatch(self, command, args):
+        if command == "ping":
+            return "pong"
+        if command == "list":
+            return self.state.list_tasks(**args)
+        if command == "files":
+            return self.state.list_files(**args)
+        if command == "validate":
+            return self.state.validate()
+        if command == "search":
+            return self.state.search(**args)
+        if command == "summary":
+            return self.state.summary()
+        if command == "shutdown":
+            self.stopping.set()
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return "stopping"
+        raise ValueError(f"Unknown command '{command}'")
+
+    def _poll(self):
+        while not self.stopping.wait(self.interval):
+            try:
+                self.state.refresh()
+            except Exception as e:
+                print(f"Refresh failed: {e}", file=sys.stderr)
+
+    def serve(self):
+        """Serve until a shutdown request, then remove the socket and pid files"""
+        threading.Thread(target=self._poll, daemon=True).start()
+        try:
+            self.serve_forever()
+        finally:
+            self.stopping.set()
+            self.server_close()
+            for path in (self.socket_path, PID_PATH):
+                if os.path.exists(path):
+                    os.unlink(path)
+
+def request(command, socket_path=SOCKET_PATH, timeout=2.0, **args):
+    """Send a request to the daemon and return its result
+
+    Returns None when the daemon is not running (or the platform has no Unix
+    sockets), so callers can fall back to scanning .project/ themselves.
+    Raises RuntimeError if the daemon answered with an error.
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+            client.sendall((json.dumps({"command": command, "args": args}) + "\n").encode('utf-8'))
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        response = json.loads(data)
+    except (OSError, ValueError):
+        return None
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error"))
+    return response["result"]
+
+def is_running(socket_path=SOCKET_PATH):
+    return request("ping", socket_path, timeout=0.5) == "pong"
+
+class RemoteTaskIndex:
+    """Read-only stand-in for TaskIndex that queries the daemon
+
+    If the daemon stops answering (it exited, or its socket went stale after
+    the liveness check), queries fall back to a local TaskIndex.
+    """
+
+    def __init__(self, tasks_root=".project/tasks"):
+        self.tasks_root = tasks_root
+        self.local = None
+
+    def refresh(self):
+        return self
+
+    def query(self, state=None, priority=None, status=None, assigned_to=None, sort_by="filename"):
+        if self.local is None:
+            result = request("list", state=state, priority=priority, status=status,
+                             assigned_to=assigned_to, sort_by=sort_by)
+            if result is not None:
+                return result
+            self.local = TaskIndex(self.tasks_root).refresh()
+        return self.local.query(state=state, priority=priority, status=status,
+                                assigned_to=assigned_to, sort_by=sort_by)
+
+def connect_task_index():
+    """Return a RemoteTaskIndex if the daemon is running, otherwise None"""
+    return RemoteTaskIndex() if is_running() else None
+
+def start_daemon(interval):
+    """Launch the daemon as a detached background process"""
+    if is_running():
+        print("Daemon already running")
+        return 0
+    if os.path.exists(SOCKET_PATH):
+        # Left behind by a daemon that did not shut down cleanly
+        os.unlink(SOCKET_PATH)
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "run", "--interval", str(interval)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if is_running():
+            print(f"Daemon started (pid {process.pid})")
+            return 0
+        if process.poll() is not None:
+            break
+        time.sleep(0.05)
+    print("Daemon failed to start", file=sys.stderr)
+    return 1
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Keep .project state warm in a background daemon")
+    parser.add_argument("action", choices=["start", "stop", "status", "run"],
+                        help="'run' serves in the foreground")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help="Seconds between polls for changes")
+    args = parser.parse_args()
+
+    if not PROJECT_DIR.exists():
+        print("No .project directory here; run from the project root.", file=sys.stderr)
+        return 1
+    if not hasattr(socket, "AF_UNIX"):
+        print("The daemon needs Unix domain sockets, which this platform lacks.", file=sys.stderr)
+        return 1
+
+    if args.action == "start":
+        return start_daemon(args.interval)
+    if args.action == "stop":
+        if request("shutdown") is None:
+            print("Daemon not running")
+            return 0
+        deadline = time.monotonic() + 10
+        while os.path.exists(SOCKET_PATH) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        print("Daemon stopped")
+        return 0
+    if args.action == "status":
+        summary = request("summary")
+        if summary is None:
+            print("Daemon not running")
+            return 1
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    if os.path.exists(SOCKET_PATH) and not is_running():
+        os.unlink(SOCKET_PATH)
+    server = ProjectDaemon(interval=args.interval)
+    with open(PID_PATH, 'w', encoding='utf-8') as file:
+        file.write(f"{os.getpid()}\n")
+    server.serve()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Project Search for Project Management System
+Searches the Markdown files under .project/plans, knowledge, task-logs and
+tasks through a persistent trigram index. A query is narrowed to the files
+containing all of its trigrams before any file is opened, and the index is
+updated per file by mtime and size, so searches stay fast as the history grows.
+
+Usage:
+    python .project/scripts/project_search.py "cache invalidation"
+    python .project/scripts/project_search.py --regex "hit rate: \\d+%" -i
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from file_ops import atomic_write
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+PROJECT_DIR = Path(".project")
+INDEX_PATH = PROJECT_DIR / ".search-index.json"
+INDEX_VERSION = 2
+SEARCH_AREAS = ["plans", "knowledge", "task-logs", "tasks"]
+
+def trigrams(text):
+    """Return the set of lowercase character trigrams in text"""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _literal_runs(parsed, runs, current):
+    """Collect runs of literal characters every match of a parsed regex contains"""
+    for op, value in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(value))
+            continue
+        if op is sre_parse.SUBPATTERN:
+            # (group, add_flags, del_flags, pattern) on 3.6+
+            _literal_runs(value[-1], runs, current)
+            continue
+        if op is sre_parse.MAX_REPEAT or op is sre_parse.MIN_REPEAT:
+            low, _, item = value
+            runs.append("".join(current))
+            current.clear()
+            if low >= 1:
+                # The repeated item occurs at least once, but not adjacent to its neighbours
+                inner = []
+                _literal_runs(item, runs, inner)
+                runs.append("".join(inner))
+            continue
+        if op is sre_parse.AT:
+            continue
+        # Alternations, classes, wildcards and the like guarantee no literal
+        runs.append("".join(current))
+        current.clear()
+
+def required_literals(pattern, flags=0):
+    """Return literal strings that any match of the regex must contain"""
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return []
+    runs = []
+    current = []
+    _literal_runs(parsed, runs, current)
+    runs.append("".join(current))
+    return [run for run in runs if len(run) >= 3]
+
+class SearchIndex:
+    """Trigram -> file postings over the searchable .project areas
+
+    Each posting is a bitmap (an int with bit n set for file id n), so
+    common trigrams cost a bit per file rather than an int object, and
+    intersecting postings is a single AND. Ids of removed files are reused
+    to keep the bitmaps dense.
+    """
+
+    def __init__(self, project_dir=PROJECT_DIR, index_path=INDEX_PATH, areas=None):
+        self.project_dir = Path(project_dir)
+        self.index_path = Path(index_path)
+        self.areas = areas or SEARCH_AREAS
+        # Relative path -> [file id, mtime_ns, size]
+        self.files = {}
+        # Trigram -> bitmap of file ids
+        self.postings = {}
+        self.free_ids = []
+        self.next_id = 0
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self.files = data["files"]
+        self.postings = {trigram: int(bits, 16) for trigram, bits in data["postings"].items()}
+        self.next_id = data["next_id"]
+        used = {record[0] for record in self.files.values()}
+        self.free_ids = sorted(set(range(self.next_id)) - used, reverse=True)
+
+    def save(self):
+        if not self.dirty:
+            return
+        atomic_write(self.index_path, json.dumps({
+            "version": INDEX_VERSION,
+            "next_id": self.next_id,
+            "files": self.files,
+            "postings": {trigram: format(bits, "x") for trigram, bits in self.postings.items()},
+        }, separators=(",", ":")))
+        self.dirty = False
+
+    def _scan(self):
+        """Return {relative path: stat} for every searchable file"""
+        found = {}
+        for area in self.areas:
+            pending = [self.project_dir / area]
+            while pending:
+                directory = pending.pop()
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_dir():
+                                pending.append(Path(entry.path))
+                            elif entry.name.endswith(".md") and entry.is_file():
+                                path = Path(entry.path).relative_to(self.project_dir).as_posix()
+                                found[path] = entry.stat()
+                except OSError:
+                    continue
+        return found
+
+    def _drop(self, file_ids):
+        keep = ~sum(1 << file_id for file_id in file_ids)
+        for trigram, bits in list(self.postings.items()):
+            bits &= keep
+            if bits:
+                self.postings[trigram] = bits
+            else:
+                del self.postings[trigram]
+        # Lowest ids are reused first
+        self.free_ids = sorted(set(self.free_ids) | set(file_ids), reverse=True)
+
+    def refresh(self):
+        """Re-index files whose mtime or size changed; returns the number re-indexed"""
+        current = self._scan()
+        stale = {}
+        for path, record in self.files.items():
+            stat = current.get(path)
+            if stat is None or (record[1], record[2]) != (stat.st_mtime_ns, stat.st_size):
+                stale[path] = record[0]
+        if stale:
+            self._drop(set(stale.values()))
+            for path in stale:
+                if path not in current:
+                    del self.files[path]
+
+        reindexed = 0
+        for path, stat in current.items():
+            if path in self.files and path not in stale:
+                continue
+            try:
+                with open(self.project_dir / path, 'r', encoding='utf-8', errors='replace') as f:
+                    content = f.read()
+            except OSError:
+                continue
+            if self.free_ids:
+                file_id = self.free_ids.pop()
+            else:
+                file_id = self.next_id
+                self.next_id += 1
+            self.files[path] = [file_id, stat.st_mtime_ns, stat.st_size]
+            bit = 1 << file_id
+            postings = self.postings
+            for trigram in trigrams(content):
+                postings[trigram] = postings.get(trigram, 0) | bit
+            reindexed += 1
+
+        if stale or reindexed:
+            self.dirty = True
+        return reindexed
+
+    def candidates(self, literals):
+        """Return the paths that contain every trigram of every literal"""
+        by_id = {record[0]: path for path, record in self.files.items()}
+        required = set()
+        for literal in literals:
+            required |= trigrams(literal)
+        if not required:
+            return sorted(by_id.values())
+        bits = -1
+        for trigram in required:
+            bits &= self.postings.get(trigram, 0)
+            if not bits:
+                return []
+        paths = []
+        while bits:
+            lowest = bits & -bits
+            paths.append(by_id[lowest.bit_length() - 1])
+            bits ^= lowest
+        return sorted(paths)
+
+    def search(self, query, regex=False, ignore_case=False, areas=None, limit=None):
+        """Return (path, line number, line) matches, opening only candidate files"""
+        flags = re.IGNORECASE if ignore_case else 0
+        if regex:
+            pattern = re.compile(query, flags)
+            literals = required_literals(query, flags)
+        else:
+            pattern = re.compile(re.escape(query), flags)
+            literals = [query]
+
+        matches = []
+        for path in self.candidates(literals):
+            if areas and path.split("/", 1)[0] not in areas:
+                continue
+            try:
+                with open(self.project_dir / path, 'r', encoding='utf-8', errors='replace') as f:
+                    for number, line in enumerate(f, 1):
+                        if pattern.search(line):
+                            matches.append((path, number, line.rstrip("\n")))
+                            if limit and len(matches) >= limit:
+                                return matches
+            except OSError:
+                continue
+        return matches
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Search .project plans, knowledge, task logs and tasks")
+    parser.add_argument("query", help="Text to find (a regular expression with --regex)")
+    parser.add_argument("--regex", action="store_true", help="Treat the query as a regular expression")
+    parser.add_argument("-i", "--ignore-case", action="store_true", help="Case-insensitive match")
+    parser.add_argument("--area", action="append", choices=SEARCH_AREAS, help="Only search this area (repeatable)")
+    parser.add_argument("-l", "--files-only", action="store_true", help="Print matching file names only")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many matching lines")
+    parser.add_argument("--json", action="store_true", help="Print matches as JSON")
+    parser.add_argument("--no-daemon", action="store_true", help="Search directly even if the daemon is running")
+    args = parser.parse_args()
+
+    if not PROJECT_DIR.exists():
+        print("No .project directory here; run from the project root.", file=sys.stderr)
+        return 1
+
+    try:
+        re.compile(args.query if args.regex else re.escape(args.query))
+    except re.error as e:
+        print(f"Invalid regular expression: {e}", file=sys.stderr)
+        return 2
+
+    matches = None
+    if not args.no_daemon:
+        # Imported here: the daemon itself imports this module
+        import project_daemon
+        try:
+            matches = project_daemon.request("search", query=args.query, regex=args.regex,
+                                             ignore_case=args.ignore_case, areas=args.area, limit=args.limit)
+        except RuntimeError:
+            matches = None
+    if matches is None:
+        index = SearchIndex()
+        index.refresh()
+        index.save()
+        matches = index.search(args.query, args.regex, args.ignore_case, args.area, args.limit)
+
+    if args.json:
+        print(json.dumps([{"path": f".project/{path}", "line": number, "text": text}
+                          for path, number, text in matches], indent=2))
+    elif args.files_only:
+        for path in dict.fromkeys(path for path, _, _ in matches):
+            print(f".project/{path}")
+    else:
+        for path, number, text in matches:
+            print(f".project/{path}:{number}: {text}")
+    return 0 if matches else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
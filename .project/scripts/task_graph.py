@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Task Dependency Graph for Project Management System
+Tasks declare the tasks they are blocked by in a "Depends On" field. The
+graph is built from the task index (so files are only re-read when they
+change), persisted next to the task files, and kept in topological order
+incrementally: adding an edge only reorders the tasks between its two ends.
+Edges that would close a cycle are rejected and reported.
+"""
+
+import json
+import re
+from pathlib import Path
+
+import profiling
+from file_ops import atomic_write
+from task_index import PRIORITY_ORDER
+
+GRAPH_FILENAME = ".task-graph.json"
+GRAPH_VERSION = 1
+
+DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(weeks?|w|days?|d|hours?|hrs?|h|minutes?|mins?|m)?\b', re.IGNORECASE)
+HOURS_PER_UNIT = {"w": 40.0, "d": 8.0, "h": 1.0, "m": 1 / 60}
+
+def parse_hours(estimated_time):
+    """Convert an estimate such as '3h', '2 days' or '90 min' to hours (0 if unknown)"""
+    if not estimated_time:
+        return 0.0
+    total = 0.0
+    for amount, unit in DURATION_PATTERN.findall(estimated_time):
+        total += float(amount) * HOURS_PER_UNIT[(unit or "h")[0].lower()]
+    return total
+
+def parse_refs(depends_on):
+    """Split a Depends On value into task references"""
+    if not depends_on or depends_on.strip().lower() in ("none", "n/a", "-"):
+        return []
+    return [ref.strip() for ref in re.split(r'[,\s]+', depends_on) if ref.strip()]
+
+class TaskGraph:
+    """Dependency DAG over indexed tasks with an incrementally maintained order
+
+    Edges point from a dependency to the task it blocks. Each node carries
+    an integer position; positions always respect every edge, and are
+    repaired locally when an edge is added against the order.
+    """
+
+    def __init__(self, tasks_root=".project/tasks"):
+        self.tasks_root = Path(tasks_root)
+        self.graph_path = self.tasks_root / GRAPH_FILENAME
+        self.nodes = {}
+        self.succ = {}
+        self.pred = {}
+        self.rejected = []
+        self.dirty = False
+        self._topo = None
+        self._chain = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.graph_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != GRAPH_VERSION:
+            return
+        self.nodes = data["nodes"]
+        self.rejected = [tuple(edge) for edge in data.get("rejected", [])]
+        self.succ = {key: set() for key in self.nodes}
+        self.pred = {key: set() for key in self.nodes}
+        for key, node in self.nodes.items():
+            for dep in node["deps"]:
+                self.pred[key].add(dep)
+                self.succ[dep].add(key)
+
+    def save(self):
+        if not self.dirty or not self.tasks_root.exists():
+            return
+        for key, node in self.nodes.items():
+            node["deps"] = sorted(self.pred[key])
+        atomic_write(self.graph_path, json.dumps({
+            "version": GRAPH_VERSION,
+            "nodes": self.nodes,
+            "rejected": [list(edge) for edge in self.rejected],
+        }, indent=1, sort_keys=True))
+        self.dirty = False
+
+    @staticmethod
+    def node_key(entry):
+        return entry.get("id") or Path(entry["filename"]).stem
+
+    def sync(self, index):
+        """Update the graph from a refreshed TaskIndex; returns self
+
+        Only tasks whose index entry changed are rewritten, and edges are
+        added or removed one by one so the stored order is repaired rather
+        than recomputed.
+        """
+        with profiling.phase("sync task graph"):
+            return self._sync(index)
+
+    def _sync(self, index):
+        entries = {self.node_key(entry): entry for entry in index.entries.values()}
+        removed = set(self.nodes) - set(entries)
+        updated = set()
+
+        for key in removed:
+            # Tasks that depended on a removed task must re-resolve their references
+            updated |= self.succ[key] - removed
+            self._remove_node(key)
+
+        next_position = max((node["ord"] for node in self.nodes.values()), default=-1) + 1
+        for key, entry in entries.items():
+            node = self.nodes.get(key)
+            signature = (entry["state"], entry["filename"], entry["mtime_ns"], entry["size"])
+            if node and (node["state"], node["filename"], node["mtime_ns"], node["size"]) == signature:
+                continue
+            if node is None:
+                node = self.nodes[key] = {"ord": next_position, "deps": []}
+                self.succ[key] = set()
+                self.pred[key] = set()
+                next_position += 1
+            node.update({
+                "filename": entry["filename"],
+                "state": entry["state"],
+                "title": entry.get("title"),
+                "priority": entry.get("priority"),
+                "hours": parse_hours(entry.get("estimated_time")),
+                "refs": parse_refs(entry.get("depends_on")),
+                "mtime_ns": entry["mtime_ns"],
+                "size": entry["size"],
+            })
+            updated.add(key)
+
+        if removed or updated:
+            self._resolve_edges(updated, bool(removed))
+            self._topo = None
+            self._chain = None
+            self.dirty = True
+        return self
+
+    def _resolve_edges(self, updated, removed_any):
+        """Bring edges in line with the references of the tasks that may have changed
+
+        Besides the updated tasks, that is tasks with references that did
+        not resolve before (the task may exist now) and, once an edge or
+        task is gone, the tasks whose edges were rejected as cycles.
+        """
+        lookup = {}
+        for key, node in self.nodes.items():
+            lookup[key] = key
+            lookup[node["filename"]] = key
+            lookup[Path(node["filename"]).stem] = key
+
+        wanted = {}
+
+        def refresh(key):
+            node = self.nodes[key]
+            node["missing"] = [ref for ref in node["refs"] if ref not in lookup]
+            wanted[key] = {lookup[ref] for ref in node["refs"] if ref in lookup}
+            # Drop stale edges first so they cannot cause false cycles below
+            stale = self.pred[key] - wanted[key]
+            for dep in stale:
+                self.pred[key].discard(dep)
+                self.succ[dep].discard(key)
+            return bool(stale)
+
+        dropped = False
+        for key in updated | {key for key, node in self.nodes.items() if node.get("missing")}:
+            dropped |= refresh(key)
+        if removed_any or dropped:
+            for _, key in self.rejected:
+                if key in self.nodes and key not in wanted:
+                    refresh(key)
+
+        rejected = [(dep, key) for dep, key in self.rejected if key in self.nodes and key not in wanted]
+        for key, deps in wanted.items():
+            for dep in sorted(deps - self.pred[key]):
+                if not self._add_edge(dep, key):
+                    rejected.append((dep, key))
+        self.rejected = rejected
+
+    def _remove_node(self, key):
+        for dep in self.pred.pop(key):
+            self.succ[dep].discard(key)
+        for task in self.succ.pop(key):
+            self.pred[task].discard(key)
+        del self.nodes[key]
+
+    def _add_edge(self, source, target):
+        """Add source -> target, repairing the order; False if it would close a cycle
+
+        Pearce-Kelly: when target is ordered before source, only the tasks
+        reachable from target and reaching source, positioned between the
+        two, are reordered, reusing their own positions.
+        """
+        if source == target:
+            return False
+
+        def position(key):
+            return self.nodes[key]["ord"]
+
+        lower, upper = position(target), position(source)
+        if lower < upper:
+            forward = self._collect(target, self.succ, lambda key: position(key) <= upper)
+            if source in forward:
+                return False
+            backward = self._collect(source, self.pred, lambda key: position(key) >= lower)
+            affected = sorted(backward, key=position) + sorted(forward, key=position)
+            slots = sorted(position(key) for key in affected)
+            for key, slot in zip(affected, slots):
+                self.nodes[key]["ord"] = slot
+        self.succ[source].add(target)
+        self.pred[target].add(source)
+        return True
+
+    @staticmethod
+    def _collect(start, edges, within):
+        seen = {start}
+        stack = [start]
+        while stack:
+            for key in edges[stack.pop()]:
+                if key not in seen and within(key):
+                    seen.add(key)
+                    stack.append(key)
+        return seen
+
+    def topological_order(self):
+        if self._topo is None:
+            self._topo = sorted(self.nodes, key=lambda key: self.nodes[key]["ord"])
+        return self._topo
+
+    def is_done(self, key):
+        return self.nodes[key]["state"] == "completed"
+
+    def blockers(self, key):
+        """Return unfinished dependencies and unresolved references of a task"""
+        node = self.nodes[key]
+        return sorted(dep for dep in self.pred[key] if not self.is_done(dep)) + node.get("missing", [])
+
+    def _remaining_chain(self):
+        """Hours of the longest chain of unfinished work starting at each task"""
+        if self._chain is None:
+            chain = {}
+            for key in reversed(self.topological_order()):
+                node = self.nodes[key]
+                if node["state"] == "completed":
+                    continue
+                downstream = [chain[task] for task in self.succ[key] if task in chain]
+                chain[key] = node["hours"] + (max(downstream) if downstream else 0.0)
+            self._chain = chain
+        return self._chain
+
+    def ready(self):
+        """Unfinished, unblocked tasks: highest priority, then longest chain, first"""
+        chain = self._remaining_chain()
+        # Tasks in the chain map are exactly the unfinished ones
+        keys = [
+            key for key in chain
+            if not self.nodes[key].get("missing") and not any(dep in chain for dep in self.pred[key])
+        ]
+        keys.sort(key=lambda key: (
+            PRIORITY_ORDER.get(self.nodes[key].get("priority"), len(PRIORITY_ORDER)),
+            -chain[key],
+            self.nodes[key]["ord"],
+        ))
+        return [self.describe(key, chain=chain[key]) for key in keys]
+
+    def blocked(self):
+        """Unfinished tasks waiting on other tasks, in dependency order"""
+        return [
+            self.describe(key, blocked_by=self.blockers(key))
+            for key in self.topological_order()
+            if not self.is_done(key) and self.blockers(key)
+        ]
+
+    def critical_path(self):
+        """Return (hours, keys) of the longest chain of unfinished work"""
+        chain = self._remaining_chain()
+        if not chain:
+            return 0.0, []
+        key = max(chain, key=lambda k: (chain[k], -self.nodes[k]["ord"]))
+        total = chain[key]
+        path = [key]
+        while True:
+            following = [task for task in self.succ[key] if task in chain]
+            if not following:
+                break
+            key = max(following, key=lambda k: (chain[k], -self.nodes[k]["ord"]))
+            path.append(key)
+        return total, path
+
+    def describe(self, key, **extra):
+        node = self.nodes[key]
+        description = {
+            "key": key,
+            "filename": node["filename"],
+            "state": node["state"],
+            "title": node.get("title"),
+            "priority": node.get("priority"),
+            "hours": node["hours"],
+        }
+        description.update(extra)
+        return description
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Task Metadata Index for Project Management System
+Keeps the fields written by manage-tasks.py (priority, estimate, assignee,
+due date, status) in an on-disk index so listing and filtering tasks does not
+have to open every task file
+"""
+
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+import profiling
+
+TASK_STATES = ["active", "completed", "backlog"]
+INDEX_FILENAME = ".task-index.json"
+INDEX_VERSION = 4
+
+FIELD_PATTERN = re.compile(r'^- \*\*(.+?)\*\*: (.*)$', re.MULTILINE)
+TITLE_PATTERN = re.compile(r'^# Task: (.+)$', re.MULTILINE)
+
+# Task file labels mapped to index keys
+FIELD_KEYS = {
+    "ID": "id",
+    "Created": "created",
+    "Priority": "priority",
+    "Estimated Time": "estimated_time",
+    "Assigned To": "assigned_to",
+    "Status": "status",
+    "Due Date": "due_date",
+    "Depends On": "depends_on",
+    "Module": "module",
+}
+
+PRIORITY_ORDER = {"High": 0, "Medium": 1, "Low": 2}
+
+def title_from_filename(filename):
+    """Derive a readable title from a task filename"""
+    stem = Path(filename).stem
+    if "_" in stem:
+        return stem.split("_", 1)[1].replace("-", " ").title()
+    return stem.replace("-", " ").title()
+
+def parse_task_file(file_path):
+    """Extract task metadata from a task Markdown file"""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        content = file.read()
+
+    metadata = {}
+    title_match = TITLE_PATTERN.search(content)
+    metadata["title"] = title_match.group(1).strip() if title_match else title_from_filename(file_path)
+
+    for label, value in FIELD_PATTERN.findall(content):
+        key = FIELD_KEYS.get(label.strip())
+        if key and key not in metadata:
+            value = value.strip()
+            # Unfilled template placeholders carry no information
+            metadata[key] = None if value.startswith("[") and value.endswith("]") else value
+
+    return metadata
+
+class TaskIndex:
+    """On-disk index of task metadata, refreshed incrementally by mtime and size"""
+
+    def __init__(self, tasks_root=".project/tasks"):
+        self.tasks_root = Path(tasks_root)
+        self.index_path = self.tasks_root / INDEX_FILENAME
+        self.entries = {}
+        # (epoch, generation) identifies a state of the index: the generation
+        # is incremented on every change and the epoch is renewed on rebuilds,
+        # so derived data can tell whether it is behind
+        self.epoch = os.urandom(8).hex()
+        self.generation = 0
+        # Called with (key, entry) on every change; entry is None for removals
+        self.listeners = []
+        self.dirty = False
+        # Batch callers switch this off and call save() once at the end
+        self.autosave = True
+        self.load()
+
+    def load(self):
+        """Load the persisted index, starting empty if it is missing or stale"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get("version") == INDEX_VERSION:
+                self.entries = data.get("tasks", {})
+                self.epoch = data.get("epoch", self.epoch)
+                self.generation = data.get("generation", 0)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """Persist the index atomically if it changed"""
+        if not self.dirty or not self.tasks_root.exists():
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.tasks_root), prefix=".task-index.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump({
+                    "version": INDEX_VERSION,
+                    "epoch": self.epoch,
+                    "generation": self.generation,
+                    "tasks": self.entries,
+                }, file, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.dirty = False
+
+    @staticmethod
+    def key(state, filename):
+        return f"{state}/{filename}"
+
+    def _changed(self, key, entry):
+        self.generation += 1
+        self.dirty = True
+        for listener in self.listeners:
+            listener(key, entry)
+
+    def _index_file(self, state, filename, stat, file_path):
+        entry = parse_task_file(file_path)
+        profiling.count("task files parsed")
+        entry.update({
+            "state": state,
+            "filename": filename,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        })
+        key = self.key(state, filename)
+        self.entries[key] = entry
+        self._changed(key, entry)
+        return entry
+
+    def refresh(self):
+        """Bring the index up to date, re-parsing only files whose mtime or size changed"""
+        with profiling.phase("refresh task index"):
+            self._refresh()
+        return self
+
+    def _refresh(self):
+        seen = set()
+        for state in TASK_STATES:
+            state_dir = self.tasks_root / state
+            if not state_dir.is_dir():
+                continue
+            with os.scandir(state_dir) as entries:
+                for dir_entry in entries:
+                    if not dir_entry.name.endswith(".md") or not dir_entry.is_file():
+                        continue
+                    key = self.key(state, dir_entry.name)
+                    seen.add(key)
+                    stat = dir_entry.stat()
+                    cached = self.entries.get(key)
+                    if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                        continue
+                    self._index_file(state, dir_entry.name, stat, dir_entry.path)
+
+        for key in set(self.entries) - seen:
+            del self.entries[key]
+            self._changed(key, None)
+
+        self.save()
+
+    def update(self, file_path):
+        """Index (or re-index) a single task file after it was written"""
+        file_path = Path(file_path)
+        state = file_path.parent.name
+        if state not in TASK_STATES:
+            return None
+        entry = self._index_file(state, file_path.name, file_path.stat(), file_path)
+        if self.autosave:
+            self.save()
+        return entry
+
+    def remove(self, state, filename):
+        """Drop a task from the index after it was moved or deleted"""
+        key = self.key(state, filename)
+        if self.entries.pop(key, None) is not None:
+            self._changed(key, None)
+            if self.autosave:
+                self.save()
+
+    def find(self, filename):
+        """Return the indexed entry for a task filename in any state"""
+        for state in TASK_STATES:
+            entry = self.entries.get(self.key(state, filename))
+            if entry:
+                return entry
+        return None
+
+    def query(self, state=None, priority=None, status=None, assigned_to=None, sort_by="filename"):
+        """Filter and sort indexed tasks"""
+        results = []
+        for entry in self.entries.values():
+            if state and entry["state"] != state:
+                continue
+            if priority and (entry.get("priority") or "").lower() != priority.lower():
+                continue
+            if status and (entry.get("status") or "").lower() != status.lower():
+                continue
+            if assigned_to and (entry.get("assigned_to") or "").lower() != assigned_to.lower():
+                continue
+            results.append(entry)
+
+        if sort_by == "priority":
+            results.sort(key=lambda e: (PRIORITY_ORDER.get(e.get("priority"), len(PRIORITY_ORDER)), e["filename"]))
+        elif sort_by == "due_date":
+            # Tasks without a due date sort last
+            results.sort(key=lambda e: (not is_date(e.get("due_date")), e.get("due_date") or "", e["filename"]))
+        else:
+            results.sort(key=lambda e: (e.get(sort_by) or "", e["filename"]))
+        return results
+
+def is_date(value):
+    return bool(value) and re.match(r'^\d{4}-\d{2}-\d{2}$', value) is not None
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Task Log Archive for Project Management System
+Rolls old .project/task-logs/*.md files into compressed monthly archives.
+Each log is stored as its own gzip member, so a month's archive is a valid
+gzip file and any single log is read back with one seek; a sidecar index
+records the timestamp, title, offset and length of every archived log.
+Recent logs stay as plain files.
+
+Usage:
+    python .project/scripts/task_log_archive.py compact [--keep-days 30] [--dry-run]
+    python .project/scripts/task_log_archive.py list [--month YYYY-MM]
+    python .project/scripts/task_log_archive.py show <filename>
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+import datetime
+from pathlib import Path
+
+from file_ops import FileLock, atomic_write
+
+TASK_LOGS_ROOT = Path(".project/task-logs")
+ARCHIVE_DIRNAME = "archive"
+LOCK_FILENAME = ".archive.lock"
+KEEP_DAYS = 30
+
+# task-log_<YYYY-MM-DD-HH-MM>_<slug>.md, as written by init-project.py and create-module.py
+TIMESTAMP_PATTERN = re.compile(r'^task-log_(\d{4}-\d{2}-\d{2}-\d{2}-\d{2})_')
+TITLE_PATTERN = re.compile(r'^# (.+)$', re.MULTILINE)
+
+def log_timestamp(file_path):
+    """Return when a task log was written: from its filename, else its mtime"""
+    match = TIMESTAMP_PATTERN.match(file_path.name)
+    if match:
+        return datetime.datetime.strptime(match.group(1), "%Y-%m-%d-%H-%M")
+    return datetime.datetime.fromtimestamp(file_path.stat().st_mtime).replace(second=0, microsecond=0)
+
+def log_title(content, file_path):
+    match = TITLE_PATTERN.search(content)
+    return match.group(1).strip() if match else Path(file_path).stem
+
+class TaskLogArchive:
+    """Monthly archives of task logs under <task-logs>/archive/"""
+
+    def __init__(self, logs_root=TASK_LOGS_ROOT):
+        self.logs_root = Path(logs_root)
+        self.archive_dir = self.logs_root / ARCHIVE_DIRNAME
+
+    def archive_path(self, month):
+        return self.archive_dir / f"{month}.md.gz"
+
+    def index_path(self, month):
+        return self.archive_dir / f"{month}.index.json"
+
+    def months(self):
+        """Return the archived months, oldest first"""
+        if not self.archive_dir.is_dir():
+            return []
+        return sorted(path.name[:-len(".index.json")] for path in self.archive_dir.glob("*.index.json"))
+
+    def load_index(self, month):
+        try:
+            with open(self.index_path(month), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def candidates(self, keep_days=KEEP_DAYS, now=None):
+        """Return (month, path, timestamp) for plain logs older than keep_days"""
+        cutoff = (now or datetime.datetime.now()) - datetime.timedelta(days=keep_days)
+        results = []
+        if not self.logs_root.is_dir():
+            return results
+        with os.scandir(self.logs_root) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".md") or not entry.is_file():
+                    continue
+                path = Path(entry.path)
+                try:
+                    timestamp = log_timestamp(path)
+                except FileNotFoundError:
+                    continue
+                if timestamp < cutoff:
+                    results.append((timestamp.strftime("%Y-%m"), path, timestamp))
+        results.sort(key=lambda item: (item[2], item[1].name))
+        return results
+
+    def _by_month(self, keep_days, now):
+        by_month = {}
+        for month, path, timestamp in self.candidates(keep_days, now):
+            by_month.setdefault(month, []).append((path, timestamp))
+        return by_month
+
+    def compact(self, keep_days=KEEP_DAYS, dry_run=False, now=None):
+        """Move old logs into their month's archive and return what was archived
+
+        Members are appended and synced before the index is replaced, and
+        plain files are only deleted once the index lists them, so a crash
+        at any point loses nothing; a log already in the index (from an
+        interrupted run) is not archived twice.
+        """
+        by_month = self._by_month(keep_days, now)
+        if dry_run or not by_month:
+            return {month: [path.name for path, _ in logs] for month, logs in by_month.items()}
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        archived = {}
+        with FileLock(self.logs_root / LOCK_FILENAME):
+            # Collect again under the lock: an overlapping run may have archived some already
+            by_month = self._by_month(keep_days, now)
+            for month, logs in sorted(by_month.items()):
+                index = self.load_index(month)
+                known = {entry["filename"]: entry for entry in index}
+                appended = []
+                with open(self.archive_path(month), 'ab') as archive:
+                    for path, timestamp in logs:
+                        try:
+                            with open(path, 'rb') as f:
+                                data = f.read()
+                        except FileNotFoundError:
+                            # Deleted since it was listed
+                            continue
+                        digest = hashlib.sha256(data).hexdigest()
+                        if known.get(path.name, {}).get("sha256") == digest:
+                            appended.append(path)
+                            continue
+                        member = gzip.compress(data, mtime=0)
+                        offset = archive.seek(0, os.SEEK_END)
+                        archive.write(member)
+                        entry = {
+                            "filename": path.name,
+                            "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M"),
+                            "title": log_title(data.decode('utf-8', errors='replace'), path),
+                            "offset": offset,
+                            "length": len(member),
+                            "size": len(data),
+                            "sha256": digest,
+                        }
+                        if path.name in known:
+                            # Same filename archived earlier with other content: latest wins
+                            index.remove(known[path.name])
+                        index.append(entry)
+                        known[path.name] = entry
+                        appended.append(path)
+                    archive.flush()
+                    os.fsync(archive.fileno())
+                index.sort(key=lambda entry: (entry["timestamp"], entry["filename"]))
+                atomic_write(self.index_path(month), json.dumps(index, indent=1))
+                for path in appended:
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                archived[month] = [path.name for path in appended]
+        return archived
+
+    def entries(self, month=None):
+        """Return index entries for one month or for every archived month"""
+        months = [month] if month else self.months()
+        return [dict(entry, month=m) for m in months for entry in self.load_index(m)]
+
+    def find(self, filename):
+        """Return the index entry of an archived log, newest month first"""
+        for month in reversed(self.months()):
+            for entry in self.load_index(month):
+                if entry["filename"] == filename:
+                    return dict(entry, month=month)
+        return None
+
+    def read(self, entry):
+        """Return an archived log's text with a single seek into its archive"""
+        with open(self.archive_path(entry["month"]), 'rb') as archive:
+            archive.seek(entry["offset"])
+            member = archive.read(entry["length"])
+        return gzip.decompress(member).decode('utf-8')
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Archive old task logs into compressed monthly files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compact = subparsers.add_parser("compact", help="Archive logs older than --keep-days")
+    compact.add_argument("--keep-days", type=int, default=KEEP_DAYS,
+                         help="Logs newer than this many days stay as plain files")
+    compact.add_argument("--dry-run", action="store_true", help="Show what would be archived")
+
+    list_parser = subparsers.add_parser("list", help="List archived logs")
+    list_parser.add_argument("--month", help="YYYY-MM")
+
+    show = subparsers.add_parser("show", help="Print an archived log")
+    show.add_argument("filename")
+
+    args = parser.parse_args()
+    archive = TaskLogArchive()
+
+    if args.command == "compact":
+        archived = archive.compact(args.keep_days, args.dry_run)
+        verb = "Would archive" if args.dry_run else "Archived"
+        for month, filenames in sorted(archived.items()):
+            print(f"{verb} {len(filenames)} log(s) into {archive.archive_path(month)}")
+        if not archived:
+            print("No task logs to archive")
+        return 0
+
+    if args.command == "list":
+        for entry in archive.entries(args.month):
+            print(f"{entry['timestamp']}  {entry['filename']}  {entry['title']}")
+        return 0
+
+    entry = archive.find(args.filename)
+    if entry is None:
+        print(f"'{args.filename}' is not archived", file=sys.stderr)
+        return 1
+    sys.stdout.write(archive.read(entry))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Transactional Task Operations for Project Management System
+Creates task files from the template and moves tasks between state
+directories under an advisory lock, with the status rewrite committed by
+rename and a journal for crash recovery
+"""
+
+import datetime
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+from file_ops import FileLock, atomic_write, create_exclusive
+from task_index import TASK_STATES, TaskIndex
+from template_engine import substitute
+
+LOCK_FILENAME = ".tasks.lock"
+JOURNAL_FILENAME = ".move-journal.json"
+TASK_TEMPLATE_PATH = Path(".project/templates/task-template.md")
+COMPLETED_DATE_PATTERN = re.compile(r'^(- \*\*Completed Date\*\*: ).*$', re.MULTILINE)
+
+# Crockford base32, as used by ULIDs: sortable and free of ambiguous letters
+ID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ID_RANDOM_BITS = 80
+_id_lock = threading.Lock()
+_last_id_time = 0
+_last_id_random = 0
+
+class TaskMoveError(Exception):
+    """Raised when a task cannot be moved"""
+
+def encode_base32(value, length):
+    """Encode an integer as fixed-width Crockford base32"""
+    chars = []
+    for _ in range(length):
+        chars.append(ID_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+def generate_task_id():
+    """Generate a unique, time-sortable task ID (ULID)
+
+    48 bits of millisecond timestamp followed by 80 random bits. IDs created
+    within the same millisecond reuse the timestamp and increment the random
+    part, so IDs from one process are strictly increasing and IDs from
+    parallel processes collide only with negligible probability.
+    """
+    global _last_id_time, _last_id_random
+    with _id_lock:
+        now = int(time.time() * 1000)
+        if now <= _last_id_time:
+            now = _last_id_time
+            random_part = _last_id_random + 1
+            if random_part >= 1 << ID_RANDOM_BITS:
+                now += 1
+                random_part = int.from_bytes(os.urandom(10), "big") >> 1
+        else:
+            # Clear the top bit so same-millisecond increments cannot overflow
+            random_part = int.from_bytes(os.urandom(10), "big") >> 1
+        _last_id_time, _last_id_random = now, random_part
+    return f"task-{encode_base32(now, 10)}{encode_base32(random_part, 16)}"
+
+def load_task_template(template_path=TASK_TEMPLATE_PATH):
+    """Read the task template once so bulk creation does not re-read it per task"""
+    with open(template_path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+def render_task(template, task_id, title, description, priority, estimated_time, assigned_to, due_date,
+                depends_on="None", module="N/A"):
+    """Fill in the task template"""
+    replacements = {
+        "[Task Title]": title,
+        "[Unique task ID - auto-generated]": task_id,
+        # Created and Completed Date share a placeholder: fill them separately
+        "**Created**: [YYYY-MM-DD]": f"**Created**: {datetime.datetime.now().strftime('%Y-%m-%d')}",
+        "**Completed Date**: [YYYY-MM-DD]": "**Completed Date**: N/A",
+        "[High/Medium/Low]": priority,
+        "[Time estimate]": estimated_time,
+        "[Team member or self]": assigned_to,
+        "[Todo/In Progress/Completed]": "Todo",
+        "[YYYY-MM-DD or N/A]": due_date,
+        "[Task IDs this task is blocked by, or None]": depends_on or "None",
+        "[Module name or N/A]": module or "N/A",
+        "[Detailed description of what needs to be done]": description or "Description to be added"
+    }
+
+    return substitute(template, replacements)
+
+def create_task_file(title, description="", priority="Medium", estimated_time="TBD",
+                     assigned_to="Self", due_date="N/A", state="active", template=None, index=None,
+                     depends_on="None", module="N/A", tasks_root=".project/tasks"):
+    """Create a task file from the template and return its path"""
+    if template is None:
+        template = load_task_template()
+
+    slug = title.lower().replace(' ', '-').replace('/', '-')
+
+    while True:
+        # Generate task ID and create file; retry on the (unlikely) collision
+        task_id = generate_task_id()
+        task_path = Path(tasks_root) / state / f"{task_id}_{slug}.md"
+        try:
+            create_exclusive(task_path, render_task(template, task_id, title, description, priority,
+                                                    estimated_time, assigned_to, due_date, depends_on, module))
+            break
+        except FileExistsError:
+            continue
+
+    (index or TaskIndex(tasks_root)).update(task_path)
+    return task_path
+
+def complete_task_content(content):
+    """Mark task content as completed, stamping today's date on its Completed Date line"""
+    replacements = {
+        "**Status**: Todo": "**Status**: Completed",
+        "**Status**: In Progress": "**Status**: Completed",
+    }
+    today = datetime.datetime.now().strftime('%Y-%m-%d')
+    return COMPLETED_DATE_PATTERN.sub(lambda match: match.group(1) + today, substitute(content, replacements))
+
+def tasks_lock(tasks_root=".project/tasks", timeout=30.0):
+    """Return the lock that serialises changes to the task directories"""
+    return FileLock(Path(tasks_root) / LOCK_FILENAME, timeout)
+
+def locate_task(tasks_root, task_file):
+    """Return the state directory a task file currently lives in, or None"""
+    for state in TASK_STATES:
+        if (Path(tasks_root) / state / task_file).exists():
+            return state
+    return None
+
+def recover_pending_move(tasks_root=".project/tasks"):
+    """Finish or roll back a move interrupted by a crash; call with the lock held
+
+    Once the destination file exists the move has committed and only the
+    source needs removing; otherwise the move is rolled back by discarding
+    the temp file. Returns the journal record that was recovered, if any.
+    """
+    tasks_root = Path(tasks_root)
+    journal_path = tasks_root / JOURNAL_FILENAME
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as file:
+            record = json.load(file)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        # A torn journal write means the move never started
+        os.unlink(journal_path)
+        return None
+
+    source = tasks_root / record["from"] / record["task"]
+    destination = tasks_root / record["to"] / record["task"]
+    temp = tasks_root / record["to"] / record["temp"]
+
+    if destination.exists():
+        if source.exists():
+            os.unlink(source)
+    elif temp.exists():
+        os.unlink(temp)
+
+    os.unlink(journal_path)
+    return record
+
+def move_task(tasks_root, task_file, new_state, rewrite=None, lock=None):
+    """Move a task to another state directory as a single transaction
+
+    ``rewrite`` is an optional function applied to the task's content before
+    it is committed in the destination. Returns (previous state, new path).
+    Raises TaskMoveError if the task does not exist or the destination
+    already holds a task with the same filename.
+    """
+    tasks_root = Path(tasks_root)
+    if new_state not in TASK_STATES:
+        raise TaskMoveError(f"Unknown task state '{new_state}'")
+
+    lock = lock or tasks_lock(tasks_root)
+    owns_lock = lock.fd is None
+    if owns_lock:
+        lock.acquire()
+    try:
+        recover_pending_move(tasks_root)
+
+        # Re-check on disk: another agent may have moved it since we last looked
+        current_state = locate_task(tasks_root, task_file)
+        if current_state is None:
+            raise TaskMoveError(f"Task '{task_file}' not found in any directory.")
+
+        destination = tasks_root / new_state / task_file
+        if current_state == new_state:
+            return current_state, destination
+        if destination.exists():
+            raise TaskMoveError(f"Task '{task_file}' already exists in '{new_state}'.")
+
+        source = tasks_root / current_state / task_file
+        with open(source, 'r', encoding='utf-8') as file:
+            content = file.read()
+        if rewrite:
+            content = rewrite(content)
+
+        temp_name = f".{task_file}.move.tmp"
+        journal_path = tasks_root / JOURNAL_FILENAME
+        atomic_write(journal_path, json.dumps({
+            "task": task_file,
+            "from": current_state,
+            "to": new_state,
+            "temp": temp_name,
+        }))
+
+        temp = tasks_root / new_state / temp_name
+        with open(temp, 'w', encoding='utf-8', newline='') as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        # Commit point: the renamed file is the new state of the task
+        os.replace(temp, destination)
+        os.unlink(source)
+        os.unlink(journal_path)
+
+        return current_state, destination
+    finally:
+        if owns_lock:
+            lock.release()
+
+def move_indexed_task(tasks_root, task_file, new_state, index, lock=None):
+    """Move a task (marking it completed when moved there) and update the index
+
+    Returns (previous state, new path); raises TaskMoveError like move_task.
+    """
+    rewrite = complete_task_content if new_state == "completed" else None
+    current_state, new_path = move_task(tasks_root, task_file, new_state, rewrite, lock)
+
+    if current_state != new_state:
+        index.remove(current_state, task_file)
+        index.update(new_path)
+    return current_state, new_path
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Task Rollups for Project Management System
+Keeps running aggregates of the task board (counts per state, status and
+module, completion rates, due dates) and publishes them into generated
+blocks of .project/status/progress-tracker.md and roadmap.md. Aggregates are
+updated by deltas as the task index changes, never by walking the task files.
+"""
+
+import datetime
+import json
+from pathlib import Path
+
+import profiling
+from file_ops import atomic_write
+from task_index import is_date
+
+ROLLUP_FILENAME = ".rollup.json"
+ROLLUP_VERSION = 1
+UNASSIGNED = "Unassigned"
+
+START_MARKER = "<!-- task-rollup:start -->"
+END_MARKER = "<!-- task-rollup:end -->"
+GENERATED_NOTE = "_Generated by manage-tasks.py from the task index; edits inside this block are overwritten._"
+# Longest lists rendered into the status files
+MAX_LISTED = 10
+
+def contribution(entry):
+    """Return the part of an index entry that the rollup aggregates"""
+    module = (entry.get("module") or "").strip()
+    if not module or module.upper() == "N/A":
+        module = UNASSIGNED
+    return {
+        "state": entry["state"],
+        "status": entry.get("status") or "Unknown",
+        "module": module,
+        "due_date": entry.get("due_date") if is_date(entry.get("due_date")) else None,
+        "title": entry.get("title") or entry["filename"],
+    }
+
+def _bump(counter, key, amount):
+    counter[key] = counter.get(key, 0) + amount
+    if not counter[key]:
+        del counter[key]
+
+def _percent(part, whole):
+    return f"{round(100 * part / whole)}%" if whole else "-"
+
+def _counts(counter):
+    return ", ".join(f"{key} {count}" for key, count in sorted(counter.items())) or "none"
+
+def replace_block(content, block):
+    """Replace the generated block in a document, appending it if there is none"""
+    start = content.find(START_MARKER)
+    end = content.find(END_MARKER, start)
+    if start == -1 or end == -1:
+        return content.rstrip("\n") + "\n\n" + block + "\n"
+    return content[:start] + block + content[end + len(END_MARKER):]
+
+class TaskRollup:
+    """Running task aggregates, persisted in .project/status/.rollup.json"""
+
+    def __init__(self, status_dir=".project/status", plans_dir=".project/plans"):
+        self.status_dir = Path(status_dir)
+        self.plans_dir = Path(plans_dir)
+        self.path = self.status_dir / ROLLUP_FILENAME
+        # Index key -> contribution, so a change can subtract what was added
+        self.tasks = {}
+        self.states = {}
+        self.statuses = {}
+        self.modules = {}
+        # Open tasks with a due date: index key -> [due date, title, module]
+        self.due = {}
+        self.synced_with = None
+        self.index = None
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != ROLLUP_VERSION:
+            return
+        self.synced_with = data.get("synced_with")
+        for key, contrib in data.get("tasks", {}).items():
+            self._add(key, contrib)
+        self.dirty = False
+
+    def save(self):
+        if not self.dirty or not self.status_dir.is_dir():
+            return
+        atomic_write(self.path, json.dumps({
+            "version": ROLLUP_VERSION,
+            "synced_with": self.synced_with,
+            "tasks": self.tasks,
+        }, sort_keys=True))
+        self.dirty = False
+
+    def _add(self, key, contrib):
+        self.tasks[key] = contrib
+        self._count(contrib, 1)
+        if contrib["due_date"] and contrib["state"] != "completed":
+            self.due[key] = [contrib["due_date"], contrib["title"], contrib["module"]]
+
+    def _remove(self, key):
+        contrib = self.tasks.pop(key, None)
+        if contrib is not None:
+            self._count(contrib, -1)
+            self.due.pop(key, None)
+
+    def _count(self, contrib, sign):
+        _bump(self.states, contrib["state"], sign)
+        _bump(self.statuses, contrib["status"], sign)
+        module = self.modules.setdefault(contrib["module"], {"total": 0, "completed": 0})
+        module["total"] += sign
+        if contrib["state"] == "completed":
+            module["completed"] += sign
+        if not module["total"]:
+            del self.modules[contrib["module"]]
+
+    def apply(self, key, entry):
+        """Apply one index change: entry is the new index entry, or None if removed"""
+        new = contribution(entry) if entry is not None else None
+        if new == self.tasks.get(key):
+            return
+        self._remove(key)
+        if new is not None:
+            self._add(key, new)
+        self.dirty = True
+
+    def attach(self, index):
+        """Follow a TaskIndex: catch up with it once, then apply its changes as deltas
+
+        Catching up compares the stored contributions with the index entries
+        in memory and is skipped when the index has not changed since the
+        rollup was last published.
+        """
+        if self.synced_with != [index.epoch, index.generation]:
+            for key in set(self.tasks) - set(index.entries):
+                self.apply(key, None)
+            for key, entry in index.entries.items():
+                self.apply(key, entry)
+        index.listeners.append(self.apply)
+        self.index = index
+        return self
+
+    def overdue(self, today=None):
+        today = (today or datetime.date.today()).isoformat()
+        return sorted(item for item in self.due.values() if item[0] < today)
+
+    def progress_block(self, today=None):
+        total = len(self.tasks)
+        completed = self.states.get("completed", 0)
+        overdue = self.overdue(today)
+        lines = [
+            START_MARKER,
+            "## Task Rollup",
+            GENERATED_NOTE,
+            "",
+            f"- **Tasks**: {total} total, {completed} completed ({_percent(completed, total)})",
+            f"- **By state**: {_counts(self.states)}",
+            f"- **By status**: {_counts(self.statuses)}",
+            f"- **Overdue**: {len(overdue)}",
+        ]
+        if self.modules:
+            lines += ["", "### By Module", "| Module | Tasks | Completed | Completion |",
+                      "|--------|-------|-----------|------------|"]
+            for name, module in sorted(self.modules.items()):
+                lines.append(f"| {name} | {module['total']} | {module['completed']} | "
+                             f"{_percent(module['completed'], module['total'])} |")
+        if overdue:
+            lines += ["", "### Overdue Tasks"]
+            lines += [f"- {due} - {title} ({module})" for due, title, module in overdue[:MAX_LISTED]]
+            if len(overdue) > MAX_LISTED:
+                lines.append(f"- ... and {len(overdue) - MAX_LISTED} more")
+        lines.append(END_MARKER)
+        return "\n".join(lines)
+
+    def roadmap_block(self):
+        by_month = {}
+        for due, title, module in sorted(self.due.values()):
+            by_month.setdefault(due[:7], []).append((due, title, module))
+        lines = [START_MARKER, "## Scheduled Tasks", GENERATED_NOTE, ""]
+        if not by_month:
+            lines.append("No open tasks have a due date.")
+        for month, items in sorted(by_month.items()):
+            lines.append(f"### {month} ({len(items)} open)")
+            lines += [f"- {due} - {title} ({module})" for due, title, module in items[:MAX_LISTED]]
+            if len(items) > MAX_LISTED:
+                lines.append(f"- ... and {len(items) - MAX_LISTED} more")
+            lines.append("")
+        plans = [name for name in sorted(self.modules)
+                 if name != UNASSIGNED and (self.plans_dir / f"{name}-implementation-plan.md").exists()]
+        if plans:
+            lines.append("### Module Plans")
+            for name in plans:
+                module = self.modules[name]
+                lines.append(f"- [{name}](../plans/{name}-implementation-plan.md): "
+                             f"{module['completed']}/{module['total']} tasks completed")
+        while lines[-1] == "":
+            lines.pop()
+        lines.append(END_MARKER)
+        return "\n".join(lines)
+
+    def publish(self, today=None):
+        """Save the aggregates and rewrite the status files whose block changed
+
+        Returns the status files that were rewritten.
+        """
+        with profiling.phase("publish rollups"):
+            return self._publish(today)
+
+    def _publish(self, today):
+        if self.index is not None and self.synced_with != [self.index.epoch, self.index.generation]:
+            self.synced_with = [self.index.epoch, self.index.generation]
+            self.dirty = True
+        self.save()
+        if not self.status_dir.is_dir():
+            return []
+
+        written = []
+        for filename, block in (("progress-tracker.md", self.progress_block(today)),
+                                ("roadmap.md", self.roadmap_block())):
+            path = self.status_dir / filename
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    content = file.read()
+            except FileNotFoundError:
+                continue
+            updated = replace_block(content, block)
+            if updated != content:
+                atomic_write(path, updated)
+                written.append(path)
+        return written
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Template Substitution Engine for Project Management System
+Single-pass, multi-placeholder replacement shared by the .project scripts
+"""
+
+import concurrent.futures
+import os
+import re
+import threading
+
+import profiling
+from file_ops import atomic_open
+
+CHUNK_SIZE = 64 * 1024
+
+CACHE_SIZE = 128
+
+_compiled_cache = {}
+
+class Replacements:
+    """A replacement map compiled into one regular expression
+
+    All keys are matched in a single left-to-right pass, longest key first,
+    so the cost is linear in the text size and replaced text is never
+    matched again by a later key.
+    """
+
+    def __init__(self, replacements):
+        self.mapping = {old: new for old, new in replacements.items() if old}
+        keys = sorted(self.mapping, key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(key) for key in keys)) if keys else None
+        self.max_key_length = len(keys[0]) if keys else 0
+
+    def _replace(self, match):
+        return self.mapping[match.group(0)]
+
+    def apply(self, text):
+        """Return text with every placeholder replaced"""
+        if self.pattern is None:
+            return text
+        return self.pattern.sub(self._replace, text)
+
+    def stream(self, source, target, chunk_size=CHUNK_SIZE):
+        """Copy source to target in chunks, replacing placeholders on the way
+
+        A tail shorter than the longest key is carried between chunks so
+        placeholders split across a chunk boundary are still found.
+        """
+        keep = max(self.max_key_length - 1, 0)
+        buffer = ""
+        while True:
+            chunk = source.read(chunk_size)
+            final = not chunk
+            buffer += chunk
+            limit = len(buffer) if final else len(buffer) - keep
+            if limit <= 0 and not final:
+                continue
+
+            position = 0
+            if self.pattern is not None:
+                for match in self.pattern.finditer(buffer):
+                    if match.start() >= limit:
+                        break
+                    target.write(buffer[position:match.start()])
+                    target.write(self.mapping[match.group(0)])
+                    position = match.end()
+
+            cut = max(position, limit)
+            target.write(buffer[position:cut])
+            buffer = buffer[cut:]
+            if final:
+                return
+
+def compile_replacements(replacements):
+    """Return a compiled (and cached) form of a replacement map"""
+    key = tuple(sorted(replacements.items()))
+    compiled = _compiled_cache.get(key)
+    if compiled is None:
+        compiled = Replacements(replacements)
+        if len(_compiled_cache) >= CACHE_SIZE:
+            _compiled_cache.clear()
+        _compiled_cache[key] = compiled
+    return compiled
+
+def substitute(text, replacements):
+    """Replace placeholders in a string in a single pass"""
+    return compile_replacements(replacements).apply(text)
+
+def substitute_file(source_path, replacements, target_path=None):
+    """Stream source_path through the replacements into target_path atomically
+
+    target_path defaults to source_path, i.e. an in-place rewrite.
+    """
+    with profiling.phase("replace placeholders"):
+        compiled = compile_replacements(replacements)
+        with open(source_path, 'r', encoding='utf-8', newline='') as source:
+            with atomic_open(target_path or source_path) as target:
+                compiled.stream(source, target)
+    profiling.count("files substituted")
+
+class CompiledTemplate:
+    """A template pre-split into literal text and placeholder slots
+
+    Rendering joins the pieces with the current values, so instantiating
+    the same template many times never rescans its text.
+    """
+
+    def __init__(self, text, keys):
+        self.pieces = []
+        self.slots = []
+        pattern = Replacements({key: key for key in keys}).pattern
+        position = 0
+        if pattern is not None:
+            for match in pattern.finditer(text):
+                self.pieces.append(text[position:match.start()])
+                self.slots.append(match.group(0))
+                position = match.end()
+        self.pieces.append(text[position:])
+
+    def render(self, replacements):
+        """Return the template text with the slots filled in"""
+        parts = [self.pieces[0]]
+        for slot, piece in zip(self.slots, self.pieces[1:]):
+            parts.append(replacements[slot])
+            parts.append(piece)
+        return "".join(parts)
+
+_template_cache = {}
+_template_lock = threading.Lock()
+
+def compile_template(template_path, keys):
+    """Return the cached compiled form of a template file for a set of placeholders
+
+    The cache is keyed on the file's mtime and size, so edited templates are
+    picked up on the next call.
+    """
+    stat = os.stat(template_path)
+    cache_key = (str(template_path), stat.st_mtime_ns, stat.st_size, tuple(sorted(keys)))
+    with _template_lock:
+        compiled = _template_cache.get(cache_key)
+    if compiled is None:
+        with open(template_path, 'r', encoding='utf-8', newline='') as file:
+            compiled = CompiledTemplate(file.read(), keys)
+        with _template_lock:
+            if len(_template_cache) >= CACHE_SIZE:
+                _template_cache.clear()
+            _template_cache[cache_key] = compiled
+    return compiled
+
+def render_template(template_path, target_path, replacements):
+    """Render a template straight to its target in a single atomic write"""
+    with profiling.phase("render template"):
+        content = compile_template(template_path, replacements.keys()).render(replacements)
+        with atomic_open(target_path) as target:
+            target.write(content)
+    profiling.count("templates rendered")
+
+def render_templates(jobs, max_workers=None):
+    """Render (template_path, target_path, replacements) jobs concurrently
+
+    Returns a list of (target_path, error) pairs in job order; error is None
+    for targets that were written successfully.
+    """
+    jobs = list(jobs)
+    if len(jobs) <= 1:
+        max_workers = 1
+    results = []
+    with profiling.phase("render templates"), \
+            concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(render_template, *job) for job in jobs]
+        for job, future in zip(jobs, futures):
+            try:
+                future.result()
+                results.append((job[1], None))
+            except Exception as e:
+                results.append((job[1], e))
+    return results
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for benchmark.py
+"""
+
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import benchmark
+from task_graph import TaskGraph
+from task_index import TaskIndex
+
+def test_generated_tree_is_a_valid_project(tmp_path):
+    counts = benchmark.generate_tree(tmp_path, tasks=50, logs=20, core_kb=4, seed=1)
+    assert counts == {"tasks": 50, "logs": 20, "core_kb": 4}
+    project = tmp_path / ".project"
+
+    index = TaskIndex(project / "tasks").refresh()
+    assert len(index.entries) == 50
+    assert {state: len(index.query(state=state)) for state in ("active", "completed", "backlog")} == {
+        "active": 15, "completed": 25, "backlog": 10}
+    for entry in index.entries.values():
+        assert (entry["status"] == "Completed") == (entry["state"] == "completed")
+        content = (project / "tasks" / entry["state"] / entry["filename"]).read_text(encoding='utf-8')
+        completed_date = "2025-01-01" if entry["state"] == "completed" else "N/A"
+        assert f"- **Completed Date**: {completed_date}" in content
+    assert TaskGraph(project / "tasks").sync(index).rejected == []
+
+    assert len(list((project / "task-logs").glob("task-log_*.md"))) == 20
+    assert all(path.stat().st_size >= 4 * 1024 for path in (project / "core").glob("*.md"))
+    assert not list(project.glob(".*.json"))
+
+def test_compare_flags_regressions_over_the_threshold():
+    baseline = {"results": [{"name": "list", "median": 1.0}, {"name": "move", "median": 2.0, "max_rss_kb": 100}]}
+    results = [
+        {"name": "list", "median": 1.05},
+        {"name": "move", "median": 2.5, "max_rss_kb": 150},
+        {"name": "new", "median": 9.0},
+    ]
+    assert benchmark.compare(results, baseline, threshold=10) == ["move"]
+    assert results[0]["change"] == 5.0
+    assert results[1]["rss_change"] == 50.0
+    assert "change" not in results[2]
+
+def test_load_trace_keeps_replayable_requests(tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    trace.write_text("\n".join([
+        json.dumps({"v": 1, "method": "tools/call", "params": {"name": "list_tasks"}}),
+        "not json",
+        json.dumps({"v": 99, "method": "tools/call"}),
+        json.dumps({"v": 1}),
+        json.dumps({"v": 1, "method": "tools/list"}),
+    ]) + "\n", encoding='utf-8')
+    assert [entry["method"] for entry in benchmark.load_trace(trace)] == ["tools/call", "tools/list"]
+
+@pytest.mark.parametrize("arguments, message", [
+    (["--repeat", "0"], "--repeat must be at least 1"),
+    (["--warmup", "-1"], "--warmup cannot be negative"),
+])
+def test_invalid_run_counts_are_rejected(arguments, message):
+    completed = subprocess.run([sys.executable, str(SCRIPTS_DIR / "benchmark.py")] + arguments,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    assert completed.returncode == 2
+    assert message in completed.stderr
+
+def test_small_run_reports_results(tmp_path):
+    output = tmp_path / "results.json"
+    completed = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / "benchmark.py"), "--tasks", "30", "--logs", "10", "--core-kb", "1",
+         "--modules", "1", "--batch", "2", "--repeat", "1", "--warmup", "0", "--only", "list", "validate",
+         "--workdir", str(tmp_path / "work"), "--json", str(output), "--baseline", str(tmp_path / "none.json")],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr
+    results = json.loads(output.read_text(encoding='utf-8'))
+    names = [result["name"] for result in results["results"]]
+    assert names and all(name.startswith(("list", "validate")) for name in names)
+    assert not (tmp_path / "work" / ".project").exists()
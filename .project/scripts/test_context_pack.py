@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for context_pack.py
+"""
+
+import sys
+import shutil
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from context_pack import ContextPackBuilder, estimate_tokens
+
+SHARED = "All services log through the shared structured logger."
+
+def make_project(tmp_path, monkeypatch):
+    # Sources are named by their .project/ path, as the memory index lists them
+    monkeypatch.chdir(tmp_path)
+    project = Path(".project")
+    (project / "core").mkdir(parents=True)
+    (project / "memory-index.md").write_text(
+        "# Memory Index\n\n- `.project/core/techContext.md`\n- `.project/core/projectbrief.md`\n", encoding='utf-8')
+    (project / "core" / "projectbrief.md").write_text(
+        f"# Project Brief\n\nA task tracker.\n\n{SHARED}\n\n## Goals\n\nShip by June.\n", encoding='utf-8')
+    (project / "core" / "techContext.md").write_text(
+        f"# Tech Context\n\nPython 3.11.\n\n{SHARED}\n\n## Details\n\n" + "Long detail. " * 200 + "\n",
+        encoding='utf-8')
+    return project
+
+def builder(project):
+    return ContextPackBuilder(project, project / ".context-pack.md", project / ".context-pack.json")
+
+def test_shared_paragraphs_appear_once(tmp_path, monkeypatch):
+    project = make_project(tmp_path, monkeypatch)
+    pack, rebuilt = builder(project).build(budget=4000)
+    assert rebuilt
+    assert pack.count(SHARED) == 1
+    # The memory index comes first, then files in the order it lists them
+    assert pack.index("# Memory Index") < pack.index("# Tech Context") < pack.index("# Project Brief")
+    assert "Omitted for size" not in pack
+
+@pytest.mark.parametrize("budget", [150, 300, 600])
+def test_pack_stays_within_budget_and_keeps_headlines(tmp_path, monkeypatch, budget):
+    project = make_project(tmp_path, monkeypatch)
+    pack, _ = builder(project).build(budget=budget)
+    assert estimate_tokens(pack) <= budget
+    for heading in ("# Memory Index", "# Project Brief", "# Tech Context"):
+        assert heading in pack
+    assert "## Omitted for size" in pack
+    assert "- .project/core/techContext.md: 1 section(s)" in pack
+
+def test_pack_is_rebuilt_only_when_inputs_change(tmp_path, monkeypatch):
+    project = make_project(tmp_path, monkeypatch)
+    first, rebuilt = builder(project).build(budget=600)
+    assert rebuilt
+    assert builder(project).build(budget=600) == (first, False)
+    assert builder(project).build(budget=700)[1]
+
+    (project / "core" / "projectbrief.md").write_text("# Project Brief\n\nA new brief.\n", encoding='utf-8')
+    pack, rebuilt = builder(project).build(budget=700)
+    assert rebuilt
+    assert "A new brief." in pack
+
+def test_repository_memory_bank_fits_the_default_budget(tmp_path, monkeypatch):
+    shutil.copytree(SCRIPTS_DIR.parent / "core", tmp_path / ".project" / "core")
+    shutil.copy(SCRIPTS_DIR.parent / "memory-index.md", tmp_path / ".project" / "memory-index.md")
+    monkeypatch.chdir(tmp_path)
+    pack, _ = builder(Path(".project")).build()
+    assert estimate_tokens(pack) <= 4000
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for create-module.py manifest loading
+"""
+
+import json
+import sys
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+spec = importlib.util.spec_from_file_location("create_module", SCRIPTS_DIR / "create-module.py")
+create_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(create_module)
+
+def write_manifest(tmp_path, data):
+    path = tmp_path / "modules.json"
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return path
+
+def test_bare_module_names_use_defaults(tmp_path):
+    path = write_manifest(tmp_path, {"defaults": {"type": "web-backend"}, "modules": ["auth", {"name": "billing"}]})
+    modules = create_module.load_manifest(path)
+    assert [module["name"] for module in modules] == ["auth", "billing"]
+    assert modules[0]["type"] == "web-backend"
+
+def test_non_mapping_entry_names_its_index(tmp_path):
+    path = write_manifest(tmp_path, {"modules": [{"name": "auth"}, 42]})
+    with pytest.raises(ValueError, match="entry 1"):
+        create_module.load_manifest(path)
+
+def test_bad_manifest_is_reported_without_traceback(tmp_path, monkeypatch, capsys):
+    (tmp_path / ".project" / "templates" / "module-template").mkdir(parents=True)
+    path = write_manifest(tmp_path, {"modules": [["auth"]]})
+    monkeypatch.chdir(tmp_path)
+    assert create_module.scaffold_from_manifest(path) == 1
+    assert "Module entry 0" in capsys.readouterr().out
+
+@pytest.mark.parametrize("name", ["../outside", "nested/auth", "nested\\auth", "..", "."])
+def test_names_that_leave_modules_dir_are_rejected(tmp_path, name):
+    path = write_manifest(tmp_path, {"modules": [{"name": name}]})
+    with pytest.raises(ValueError, match="invalid name"):
+        create_module.load_manifest(path)
+
+def test_create_structure_must_be_a_boolean(tmp_path):
+    path = write_manifest(tmp_path, {"modules": [{"name": "auth", "create_structure": "false"}]})
+    with pytest.raises(ValueError, match="create_structure"):
+        create_module.load_manifest(path)
+    path = write_manifest(tmp_path, {"defaults": {"create_structure": False}, "modules": ["auth"]})
+    assert create_module.load_manifest(path)[0]["create_structure"] is False
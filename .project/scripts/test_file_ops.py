@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for file_ops.py
+"""
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import file_ops
+from file_ops import create_exclusive
+
+def test_create_exclusive_refuses_an_existing_name(tmp_path):
+    path = tmp_path / "task.md"
+    create_exclusive(path, "first\n")
+    with pytest.raises(FileExistsError):
+        create_exclusive(path, "second\n")
+    assert path.read_text(encoding='utf-8') == "first\n"
+    assert sorted(os.listdir(tmp_path)) == ["task.md"]
+
+def test_parallel_creators_have_one_winner(tmp_path):
+    path = tmp_path / "task.md"
+    barrier = threading.Barrier(8)
+    winners = []
+
+    def create(number):
+        barrier.wait()
+        try:
+            create_exclusive(path, f"writer {number}\n")
+            winners.append(number)
+        except FileExistsError:
+            pass
+
+    threads = [threading.Thread(target=create, args=(number,)) for number in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(winners) == 1
+    assert path.read_text(encoding='utf-8') == f"writer {winners[0]}\n"
+    assert sorted(os.listdir(tmp_path)) == ["task.md"]
+
+def test_create_exclusive_without_hard_links(tmp_path, monkeypatch):
+    def no_links(source, target):
+        raise PermissionError("hard links not supported")
+
+    monkeypatch.setattr(file_ops.os, "link", no_links)
+    path = tmp_path / "task.md"
+    create_exclusive(path, "content\n")
+    with pytest.raises(FileExistsError):
+        create_exclusive(path, "other\n")
+    assert path.read_text(encoding='utf-8') == "content\n"
+    assert sorted(os.listdir(tmp_path)) == ["task.md"]
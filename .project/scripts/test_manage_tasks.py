@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for the manage-tasks.py batch commands
+"""
+
+import sys
+import shutil
+import importlib.util
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+spec = importlib.util.spec_from_file_location("manage_tasks", SCRIPTS_DIR / "manage-tasks.py")
+manage_tasks = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(manage_tasks)
+
+def copy_project(tmp_path):
+    shutil.copytree(SCRIPTS_DIR.parent, tmp_path / ".project",
+                    ignore=shutil.ignore_patterns("__pycache__", ".*.json", ".*.jsonl", ".*.lock"))
+    # The state directories are created by init-project.py
+    for state in manage_tasks.TASK_STATES:
+        (tmp_path / ".project" / "tasks" / state).mkdir(exist_ok=True)
+    return tmp_path / ".project"
+
+def test_malformed_jsonl_lines_are_reported_and_skipped(tmp_path, monkeypatch, capsys):
+    project = copy_project(tmp_path)
+    source = tmp_path / "tasks.jsonl"
+    source.write_text(
+        '{"title": "First task"}\n'
+        '{"title": "Broken\n'
+        '\n'
+        '["not", "an", "object"]\n'
+        '{"title": "Second task", "state": "backlog"}\n',
+        encoding='utf-8'
+    )
+    monkeypatch.chdir(tmp_path)
+
+    args = manage_tasks.build_parser().parse_args(["create", "--from", str(source)])
+    assert manage_tasks.run_create(args) == 1
+    output = capsys.readouterr().out
+    assert "Skipping line 2: invalid JSON" in output
+    assert "Skipping line 4: expected a JSON object, not list" in output
+    assert "Created 2 task(s)" in output
+    assert len(list((project / "tasks" / "active").glob("*.md"))) == 1
+    assert len(list((project / "tasks" / "backlog").glob("*.md"))) == 1
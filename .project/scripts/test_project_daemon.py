@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for project_daemon.py
+"""
+
+import sys
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import project_daemon
+from task_index import TASK_STATES
+from task_ops import create_task_file
+
+TEMPLATE = "# Task: [Task Title]\n\n- **ID**: [Unique task ID - auto-generated]\n- **Priority**: [High/Medium/Low]\n"
+
+pytestmark = pytest.mark.skipif(not hasattr(project_daemon.socket, "AF_UNIX"), reason="needs Unix sockets")
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    shutil.copytree(SCRIPTS_DIR.parent, tmp_path / ".project",
+                    ignore=shutil.ignore_patterns("__pycache__", ".*.json", ".*.jsonl", ".*.lock", ".daemon.*"))
+    for state in TASK_STATES:
+        (tmp_path / ".project" / "tasks" / state).mkdir(exist_ok=True)
+    monkeypatch.chdir(tmp_path)
+    for title in ("Write docs", "Fix login"):
+        create_task_file(title, priority="High", template=TEMPLATE)
+    create_task_file("Plan release", state="backlog", template=TEMPLATE)
+    return tmp_path / ".project"
+
+def start_daemon():
+    daemon = project_daemon.ProjectDaemon(interval=60)
+    thread = threading.Thread(target=daemon.serve, daemon=True)
+    thread.start()
+    return thread
+
+def test_remote_index_falls_back_when_the_daemon_exits(project):
+    thread = start_daemon()
+    remote = project_daemon.connect_task_index()
+    assert remote is not None
+    served = remote.query(state="active")
+    assert [entry["title"] for entry in served] == ["Write docs", "Fix login"]
+
+    assert project_daemon.request("shutdown") == "stopping"
+    thread.join(5)
+    assert not project_daemon.SOCKET_PATH.exists()
+    assert remote.query(state="active") == served
+    assert [entry["title"] for entry in remote.query(state="backlog")] == ["Plan release"]
+    assert project_daemon.connect_task_index() is None
+
+def test_stale_socket_is_not_mistaken_for_a_daemon(project):
+    project_daemon.SOCKET_PATH.write_text("", encoding='utf-8')
+    assert project_daemon.request("ping") is None
+    assert project_daemon.RemoteTaskIndex().query(state="backlog")[0]["title"] == "Plan release"
+
+def test_daemon_validates_a_tree_with_missing_files(project):
+    (project / "rules.md").unlink()
+    thread = start_daemon()
+    try:
+        report = project_daemon.request("validate")
+    finally:
+        project_daemon.request("shutdown")
+        thread.join(5)
+    assert not report["passed"]
+    core = next(category for category in report["categories"] if category["category"] == "Core System Validation")
+    assert not core["passed"]
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for project_search.py
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from project_search import SearchIndex, required_literals, trigrams
+
+FILES = {
+    "plans/cache-plan.md": "# Cache plan\n\nCache invalidation by mtime.\nHit rate: 93%\n",
+    "knowledge/decisions.md": "# Decisions\n\nUse a write-through cache.\n",
+    "task-logs/2025-01-auth.md": "# Auth\n\nToken refresh fixed.\nhit rate: 40%\n",
+    "tasks/active/task-1_docs.md": "# Task: Docs\n\nWrite the docs.\n",
+}
+
+def make_project(tmp_path):
+    project = tmp_path / ".project"
+    for path, content in FILES.items():
+        (project / path).parent.mkdir(parents=True, exist_ok=True)
+        (project / path).write_text(content, encoding='utf-8')
+    return project
+
+def brute_force(project, pattern):
+    matches = []
+    for path in sorted(FILES):
+        for number, line in enumerate((project / path).read_text(encoding='utf-8').splitlines(), 1):
+            if pattern.search(line):
+                matches.append((path, number, line))
+    return matches
+
+def test_trigrams_are_lowercase():
+    assert trigrams("Cache") == {"cac", "ach", "che"}
+    assert trigrams("ab") == set()
+
+@pytest.mark.parametrize("pattern, literals", [
+    (r"hit rate: \d+%", ["hit rate: "]),
+    (r"foo(bar|baz)qux", ["fooba", "qux"]),
+    (r"(abc)+def", ["abc", "def"]),
+    (r"x*abcd", ["abcd"]),
+    (r"^token (refresh)?", ["token "]),
+    (r"cache|token", []),
+    (r"[a-z]+ing", ["ing"]),
+    (r"unbalanced(", []),
+])
+def test_required_literals(pattern, literals):
+    assert required_literals(pattern) == literals
+
+def test_candidates_are_narrowed_by_trigrams(tmp_path):
+    project = make_project(tmp_path)
+    index = SearchIndex(project, project / ".search-index.json")
+    assert index.refresh() == len(FILES)
+    assert index.candidates(["cache"]) == ["knowledge/decisions.md", "plans/cache-plan.md"]
+    assert index.candidates(["cache", "mtime"]) == ["plans/cache-plan.md"]
+    assert index.candidates(["zebra"]) == []
+    assert index.candidates(["ok"]) == sorted(FILES)
+
+@pytest.mark.parametrize("query, regex, ignore_case", [
+    ("cache", False, False),
+    ("Cache", False, True),
+    (r"hit rate: \d+%", True, True),
+    (r"(token|write)", True, False),
+    ("docs.", False, False),
+])
+def test_search_matches_a_full_scan(tmp_path, query, regex, ignore_case):
+    project = make_project(tmp_path)
+    index = SearchIndex(project, project / ".search-index.json")
+    index.refresh()
+    flags = re.IGNORECASE if ignore_case else 0
+    pattern = re.compile(query if regex else re.escape(query), flags)
+    assert index.search(query, regex, ignore_case) == brute_force(project, pattern)
+
+def test_index_follows_edits_and_reuses_ids(tmp_path):
+    project = make_project(tmp_path)
+    index = SearchIndex(project, project / ".search-index.json")
+    index.refresh()
+    index.save()
+
+    (project / "knowledge/decisions.md").unlink()
+    (project / "plans/cache-plan.md").write_text("# Plan\n\nNothing about caching left.\n", encoding='utf-8')
+    reloaded = SearchIndex(project, project / ".search-index.json")
+    assert reloaded.refresh() == 1
+    assert reloaded.candidates(["invalidation"]) == []
+    assert reloaded.candidates(["caching"]) == ["plans/cache-plan.md"]
+
+    (project / "plans/new.md").write_text("Fresh invalidation notes\n", encoding='utf-8')
+    reloaded.refresh()
+    assert reloaded.next_id == len(FILES)
+    assert reloaded.search("invalidation") == [("plans/new.md", 1, "Fresh invalidation notes")]
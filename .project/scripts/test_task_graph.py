@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for task_graph.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from task_graph import TaskGraph, parse_hours, parse_refs
+from task_index import TASK_STATES, TaskIndex
+
+def write_task(tasks_root, key, hours=1, depends_on="None", state="active", priority="Medium"):
+    for other in TASK_STATES:
+        existing = tasks_root / other / f"{key}_task.md"
+        if other != state and existing.exists():
+            existing.unlink()
+    path = tasks_root / state / f"{key}_task.md"
+    mtime = path.stat().st_mtime_ns if path.exists() else None
+    path.write_text(
+        f"# Task: Task {key}\n\n- **ID**: {key}\n- **Priority**: {priority}\n"
+        f"- **Estimated Time**: {hours}h\n- **Depends On**: {depends_on}\n",
+        encoding='utf-8'
+    )
+    if mtime is not None:
+        # Same-size rewrites within one clock tick must still look changed
+        os.utime(path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+def make_tasks_root(tmp_path):
+    tasks_root = tmp_path / "tasks"
+    for state in TASK_STATES:
+        (tasks_root / state).mkdir(parents=True)
+    return tasks_root
+
+def sync(tasks_root):
+    return TaskGraph(tasks_root).sync(TaskIndex(tasks_root).refresh())
+
+def assert_ordered(graph):
+    for key, deps in graph.pred.items():
+        for dep in deps:
+            assert graph.nodes[dep]["ord"] < graph.nodes[key]["ord"], (dep, key)
+
+def test_parsing_helpers():
+    assert parse_hours("2 days") == 16
+    assert parse_hours("1w 90 min") == 41.5
+    assert parse_hours("TBD") == 0
+    assert parse_refs("None") == []
+    assert parse_refs("a, b c") == ["a", "b", "c"]
+
+def test_edges_added_against_the_order_are_repaired(tmp_path):
+    tasks_root = make_tasks_root(tmp_path)
+    for key in ("a", "b", "c", "d"):
+        write_task(tasks_root, key)
+    graph = sync(tasks_root)
+    graph.save()
+
+    # a now waits for d and c for a: both run against the creation order
+    write_task(tasks_root, "a", depends_on="d")
+    write_task(tasks_root, "c", depends_on="a")
+    graph = sync(tasks_root)
+    assert_ordered(graph)
+    assert graph.topological_order().index("d") < graph.topological_order().index("a")
+    assert graph.rejected == []
+
+def test_cycle_is_rejected_until_broken(tmp_path):
+    tasks_root = make_tasks_root(tmp_path)
+    write_task(tasks_root, "a", depends_on="c")
+    write_task(tasks_root, "b", depends_on="a")
+    write_task(tasks_root, "c", depends_on="b")
+    graph = sync(tasks_root)
+    assert len(graph.rejected) == 1
+    assert sum(len(deps) for deps in graph.pred.values()) == 2
+    assert_ordered(graph)
+    graph.save()
+
+    write_task(tasks_root, "c")
+    graph = sync(tasks_root)
+    assert graph.rejected == []
+    assert graph.pred == {"a": {"c"}, "b": {"a"}, "c": set()}
+    assert_ordered(graph)
+
+def test_critical_path_follows_the_longest_unfinished_chain(tmp_path):
+    tasks_root = make_tasks_root(tmp_path)
+    write_task(tasks_root, "a", hours=2)
+    write_task(tasks_root, "b", hours=3, depends_on="a")
+    write_task(tasks_root, "c", hours=10, depends_on="a")
+    write_task(tasks_root, "d", hours=1, depends_on="b")
+    write_task(tasks_root, "e", hours=3, depends_on="missing-task")
+    graph = sync(tasks_root)
+    assert graph.critical_path() == (12.0, ["a", "c"])
+    assert [task["key"] for task in graph.ready()] == ["a"]
+    assert {task["key"]: task["blocked_by"] for task in graph.blocked()}["e"] == ["missing-task"]
+    graph.save()
+
+    write_task(tasks_root, "a", hours=2, state="completed")
+    write_task(tasks_root, "c", hours=1, depends_on="a")
+    graph = sync(tasks_root)
+    assert graph.critical_path() == (4.0, ["b", "d"])
+    assert [task["key"] for task in graph.ready()] == ["b", "c"]
+    graph.save()
+    assert TaskGraph(tasks_root).critical_path() == (4.0, ["b", "d"])
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for task_index.py
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import task_index
+from task_index import TASK_STATES, TaskIndex
+from task_ops import complete_task_content, create_task_file, load_task_template
+
+TEMPLATE = load_task_template(SCRIPTS_DIR.parent / "templates" / "task-template.md")
+
+def make_tasks_root(tmp_path):
+    tasks_root = tmp_path / "tasks"
+    for state in TASK_STATES:
+        (tasks_root / state).mkdir(parents=True)
+    return tasks_root
+
+def test_created_task_is_indexed_with_its_fields(tmp_path):
+    tasks_root = make_tasks_root(tmp_path)
+    path = create_task_file("Write docs", priority="High", due_date="2025-05-01", module="docs",
+                            template=TEMPLATE, tasks_root=tasks_root)
+    entry = TaskIndex(tasks_root).refresh().find(path.name)
+    assert entry["title"] == "Write docs"
+    assert entry["id"] == path.name.split("_", 1)[0]
+    assert (entry["priority"], entry["due_date"], entry["module"], entry["status"]) == (
+        "High", "2025-05-01", "docs", "Todo")
+    assert "completed_date" not in entry
+
+def test_completed_date_is_only_set_on_completion(tmp_path):
+    tasks_root = make_tasks_root(tmp_path)
+    content = create_task_file("Write docs", template=TEMPLATE, tasks_root=tasks_root).read_text(encoding='utf-8')
+    assert "- **Completed Date**: N/A" in content
+    assert "- **Created**: N/A" not in content
+
+    completed = complete_task_content(content)
+    assert "- **Status**: Completed" in completed
+    assert "- **Completed Date**: N/A" not in completed
+    assert completed.count("- **Created**: ") == 1
+
+def test_refresh_only_parses_changed_files(tmp_path, monkeypatch):
+    tasks_root = make_tasks_root(tmp_path)
+    first = create_task_file("First", template=TEMPLATE, tasks_root=tasks_root)
+    create_task_file("Second", template=TEMPLATE, tasks_root=tasks_root)
+    TaskIndex(tasks_root).refresh()
+
+    parsed = []
+    original = task_index.parse_task_file
+    monkeypatch.setattr(task_index, "parse_task_file", lambda path: parsed.append(Path(path).name) or original(path))
+    index = TaskIndex(tasks_root)
+    generation = index.generation
+    index.refresh()
+    assert parsed == []
+    assert index.generation == generation
+
+    first.write_text(first.read_text(encoding='utf-8').replace("Medium", "High"), encoding='utf-8')
+    (tasks_root / "active" / "notes.txt").write_text("not a task", encoding='utf-8')
+    index.refresh()
+    assert parsed == [first.name]
+    assert index.find(first.name)["priority"] == "High"
+
+    first.unlink()
+    index.refresh()
+    assert index.find(first.name) is None
+    assert len(TaskIndex(tasks_root).entries) == 1
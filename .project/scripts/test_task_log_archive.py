@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for task_log_archive.py
+"""
+
+import sys
+import datetime
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from task_log_archive import TaskLogArchive
+
+NOW = datetime.datetime(2025, 6, 15, 12, 0)
+
+def write_logs(logs_root):
+    logs_root.mkdir(parents=True)
+    logs = {
+        "task-log_2025-03-02-09-30_setup.md": "# Setup\n\nInstalled everything.\n",
+        "task-log_2025-03-20-14-00_auth.md": "# Auth module\n\n" + "Token refresh details.\n" * 200,
+        "task-log_2025-04-01-08-15_cache.md": "# Cache layer\n\nAdded a cache.\n",
+        "task-log_2025-06-10-10-00_recent.md": "# Recent\n\nStill fresh.\n",
+    }
+    for name, content in logs.items():
+        (logs_root / name).write_text(content, encoding='utf-8')
+    return logs
+
+def test_compact_then_read_back(tmp_path):
+    logs_root = tmp_path / "task-logs"
+    logs = write_logs(logs_root)
+    archive = TaskLogArchive(logs_root)
+
+    archived = archive.compact(keep_days=30, now=NOW)
+    assert archived == {
+        "2025-03": ["task-log_2025-03-02-09-30_setup.md", "task-log_2025-03-20-14-00_auth.md"],
+        "2025-04": ["task-log_2025-04-01-08-15_cache.md"],
+    }
+    assert sorted(path.name for path in logs_root.glob("*.md")) == ["task-log_2025-06-10-10-00_recent.md"]
+    assert archive.months() == ["2025-03", "2025-04"]
+
+    for name in ("task-log_2025-03-20-14-00_auth.md", "task-log_2025-04-01-08-15_cache.md"):
+        entry = archive.find(name)
+        assert archive.read(entry) == logs[name]
+    assert archive.find("task-log_2025-03-20-14-00_auth.md")["title"] == "Auth module"
+    assert archive.compact(keep_days=30, now=NOW) == {}
+
+def test_compact_skips_logs_archived_by_an_overlapping_run(tmp_path, monkeypatch):
+    logs_root = tmp_path / "task-logs"
+    logs = write_logs(logs_root)
+    archive = TaskLogArchive(logs_root)
+    stale = archive.candidates(keep_days=30, now=NOW)
+
+    # Another run archives everything between this run listing and locking
+    TaskLogArchive(logs_root).compact(keep_days=30, now=NOW)
+    monkeypatch.setattr(archive, "candidates", lambda keep_days, now: stale)
+    archived = archive.compact(keep_days=30, now=NOW)
+
+    assert all(not names for names in archived.values())
+    assert len(archive.entries()) == 3
+    entry = archive.find("task-log_2025-03-02-09-30_setup.md")
+    assert archive.read(entry) == logs["task-log_2025-03-02-09-30_setup.md"]
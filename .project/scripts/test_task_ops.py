@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for task_ops.py
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import task_ops
+from task_index import TASK_STATES, TaskIndex
+from task_ops import ID_ALPHABET, create_task_file, generate_task_id
+
+TEMPLATE = "# Task: [Task Title]\n\n- **ID**: [Unique task ID - auto-generated]\n- **Status**: Todo\n"
+
+def make_tasks_root(tmp_path):
+    tasks_root = tmp_path / "tasks"
+    for state in TASK_STATES:
+        (tasks_root / state).mkdir(parents=True)
+    return tasks_root
+
+def test_task_ids_are_sortable_and_unique():
+    ids = [generate_task_id() for _ in range(5000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    for task_id in ids[:10]:
+        assert task_id.startswith("task-")
+        assert len(task_id) == len("task-") + 26
+        assert set(task_id[5:]) <= set(ID_ALPHABET)
+
+def test_task_ids_from_parallel_threads_are_unique():
+    ids = []
+    lock = threading.Lock()
+
+    def generate():
+        batch = [generate_task_id() for _ in range(1000)]
+        with lock:
+            ids.extend(batch)
+
+    threads = [threading.Thread(target=generate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(ids)) == 4000
+
+def test_create_task_file_retries_a_colliding_id(tmp_path, monkeypatch):
+    tasks_root = make_tasks_root(tmp_path)
+    ids = iter(["task-A", "task-A", "task-B"])
+    monkeypatch.setattr(task_ops, "generate_task_id", lambda: next(ids))
+
+    first = create_task_file("Write docs", template=TEMPLATE, tasks_root=tasks_root)
+    second = create_task_file("Write docs", template=TEMPLATE, tasks_root=tasks_root)
+    assert first.name == "task-A_write-docs.md"
+    assert second.name == "task-B_write-docs.md"
+    assert "- **ID**: task-B" in second.read_text(encoding='utf-8')
+    assert len(TaskIndex(tasks_root).refresh().query(state="active")) == 2
+
+def write_journal(tasks_root, task_file, source, destination):
+    temp_name = f".{task_file}.move.tmp"
+    (tasks_root / task_ops.JOURNAL_FILENAME).write_text(
+        f'{{"task": "{task_file}", "from": "{source}", "to": "{destination}", "temp": "{temp_name}"}}',
+        encoding='utf-8'
+    )
+    return tasks_root / destination / temp_name
+
+def test_move_committed_before_a_crash_is_finished(tmp_path):
+    tasks_root = make_tasks_root(tmp_path)
+    task = create_task_file("Ship it", template=TEMPLATE, tasks_root=tasks_root)
+    content = task.read_text(encoding='utf-8')
+    # Crashed after the rename into completed/ but before removing the source
+    write_journal(tasks_root, task.name, "active", "completed")
+    (tasks_root / "completed" / task.name).write_text(content, encoding='utf-8')
+
+    previous, path = task_ops.move_task(tasks_root, task.name, "backlog")
+    assert previous == "completed"
+    assert path == tasks_root / "backlog" / task.name
+    assert not (tasks_root / "active" / task.name).exists()
+    assert not (tasks_root / task_ops.JOURNAL_FILENAME).exists()
+
+def test_move_interrupted_before_commit_is_rolled_back(tmp_path):
+    tasks_root = make_tasks_root(tmp_path)
+    task = create_task_file("Ship it", template=TEMPLATE, tasks_root=tasks_root)
+    temp = write_journal(tasks_root, task.name, "active", "completed")
+    temp.write_text("half written", encoding='utf-8')
+
+    record = task_ops.recover_pending_move(tasks_root)
+    assert record["to"] == "completed"
+    assert not temp.exists()
+    assert task.exists()
+    assert task_ops.locate_task(tasks_root, task.name) == "active"
+    assert not (tasks_root / task_ops.JOURNAL_FILENAME).exists()
+
+def test_torn_journal_is_discarded(tmp_path):
+    tasks_root = make_tasks_root(tmp_path)
+    (tasks_root / task_ops.JOURNAL_FILENAME).write_text('{"task": "x', encoding='utf-8')
+    assert task_ops.recover_pending_move(tasks_root) is None
+    assert not (tasks_root / task_ops.JOURNAL_FILENAME).exists()
+
+def test_completing_a_task_updates_file_and_index(tmp_path):
+    tasks_root = make_tasks_root(tmp_path)
+    task = create_task_file("Ship it", template=TEMPLATE, tasks_root=tasks_root)
+    index = TaskIndex(tasks_root).refresh()
+
+    previous, path = task_ops.move_indexed_task(tasks_root, task.name, "completed", index)
+    assert previous == "active"
+    assert "- **Status**: Completed" in path.read_text(encoding='utf-8')
+    assert not task.exists()
+    assert [entry["filename"] for entry in index.query(state="completed")] == [task.name]
+    assert index.query(state="active") == []
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for task_rollup.py
+"""
+
+import sys
+import datetime
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from task_index import TASK_STATES, TaskIndex
+from task_ops import create_task_file, load_task_template, move_indexed_task
+from task_rollup import END_MARKER, START_MARKER, TaskRollup
+
+TEMPLATE = load_task_template(SCRIPTS_DIR.parent / "templates" / "task-template.md")
+TODAY = datetime.date(2025, 3, 1)
+
+def make_project(tmp_path):
+    tasks_root = tmp_path / "tasks"
+    for state in TASK_STATES:
+        (tasks_root / state).mkdir(parents=True)
+    status_dir = tmp_path / "status"
+    status_dir.mkdir()
+    (status_dir / "progress-tracker.md").write_text("# Progress Tracker\n", encoding='utf-8')
+    (status_dir / "roadmap.md").write_text(f"# Roadmap\n\n{START_MARKER}\nold\n{END_MARKER}\n", encoding='utf-8')
+    return tasks_root, status_dir
+
+def aggregates(rollup):
+    return rollup.states, rollup.statuses, rollup.modules, rollup.due, rollup.tasks
+
+def create(tasks_root, index, title, **fields):
+    return create_task_file(title, template=TEMPLATE, index=index, tasks_root=tasks_root, **fields)
+
+def test_deltas_match_a_full_recompute(tmp_path):
+    tasks_root, status_dir = make_project(tmp_path)
+    index = TaskIndex(tasks_root).refresh()
+    rollup = TaskRollup(status_dir, tmp_path / "plans").attach(index)
+
+    auth = create(tasks_root, index, "Login form", module="auth", due_date="2025-02-20")
+    create(tasks_root, index, "Token refresh", module="auth", due_date="2025-04-02")
+    create(tasks_root, index, "Invoices", module="billing", state="backlog")
+    chore = create(tasks_root, index, "Tidy up")
+    move_indexed_task(tasks_root, auth.name, "completed", index)
+    move_indexed_task(tasks_root, chore.name, "backlog", index)
+    index.save()
+    rollup.publish(TODAY)
+
+    assert rollup.states == {"active": 1, "backlog": 2, "completed": 1}
+    assert rollup.modules["auth"] == {"total": 2, "completed": 1}
+    assert list(rollup.due.values()) == [["2025-04-02", "Token refresh", "auth"]]
+    recomputed = TaskRollup(tmp_path / "elsewhere", tmp_path / "plans").attach(TaskIndex(tasks_root).refresh())
+    assert aggregates(recomputed) == aggregates(rollup)
+
+    # A task file deleted behind the index's back is subtracted on the next refresh
+    (tasks_root / "backlog" / chore.name).unlink()
+    index.refresh()
+    recomputed = TaskRollup(tmp_path / "elsewhere", tmp_path / "plans").attach(TaskIndex(tasks_root).refresh())
+    assert aggregates(recomputed) == aggregates(rollup)
+    assert rollup.states == {"active": 1, "backlog": 1, "completed": 1}
+
+def test_published_rollup_is_reloaded_and_blocks_are_written(tmp_path):
+    tasks_root, status_dir = make_project(tmp_path)
+    index = TaskIndex(tasks_root).refresh()
+    rollup = TaskRollup(status_dir, tmp_path / "plans").attach(index)
+    create(tasks_root, index, "Overdue task", module="auth", due_date="2025-02-01")
+    index.save()
+    written = rollup.publish(TODAY)
+    assert sorted(path.name for path in written) == ["progress-tracker.md", "roadmap.md"]
+
+    progress = (status_dir / "progress-tracker.md").read_text(encoding='utf-8')
+    assert progress.startswith("# Progress Tracker\n")
+    assert "- **Overdue**: 1" in progress
+    roadmap = (status_dir / "roadmap.md").read_text(encoding='utf-8')
+    assert "old" not in roadmap
+    assert "### 2025-02 (1 open)" in roadmap
+
+    reloaded = TaskRollup(status_dir, tmp_path / "plans")
+    assert aggregates(reloaded) == aggregates(rollup)
+    assert reloaded.attach(TaskIndex(tasks_root).refresh()).publish(TODAY) == []
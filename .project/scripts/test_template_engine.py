@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for template_engine.py
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from template_engine import Replacements, compile_template, render_templates, substitute, substitute_file
+
+REPLACEMENTS = {
+    "[Module Name]": "billing",
+    "[Module]": "MODULE",
+    "[YYYY-MM-DD]": "2025-01-31",
+    "billing": "never applied to replaced text",
+}
+TEXT = "# [Module Name] overview\nUpdated [YYYY-MM-DD] for [Module] ([Module Name]).\n" * 3
+
+def test_replacement_is_single_pass_and_longest_first():
+    assert substitute("[Module Name] / [Module]", REPLACEMENTS) == "billing / MODULE"
+
+@pytest.mark.parametrize("chunk_size", range(1, 40))
+def test_stream_finds_placeholders_split_across_chunks(chunk_size):
+    compiled = Replacements(REPLACEMENTS)
+    target = io.StringIO()
+    compiled.stream(io.StringIO(TEXT), target, chunk_size=chunk_size)
+    assert target.getvalue() == compiled.apply(TEXT)
+
+def test_stream_without_placeholders_copies_text():
+    target = io.StringIO()
+    Replacements({}).stream(io.StringIO(TEXT), target, chunk_size=7)
+    assert target.getvalue() == TEXT
+
+def test_substitute_file_rewrites_in_place(tmp_path):
+    path = tmp_path / "overview.md"
+    path.write_text(TEXT, encoding='utf-8')
+    substitute_file(path, REPLACEMENTS)
+    assert path.read_text(encoding='utf-8') == substitute(TEXT, REPLACEMENTS)
+
+def test_compiled_template_is_reloaded_when_edited(tmp_path):
+    path = tmp_path / "template.md"
+    path.write_text("Name: [Module Name]\n", encoding='utf-8')
+    keys = REPLACEMENTS.keys()
+    assert compile_template(path, keys).render(REPLACEMENTS) == "Name: billing\n"
+    path.write_text("Module [Module Name] on [YYYY-MM-DD]\n", encoding='utf-8')
+    assert compile_template(path, keys).render(REPLACEMENTS) == "Module billing on 2025-01-31\n"
+
+def test_render_templates_reports_each_job(tmp_path):
+    template = tmp_path / "README-template.md"
+    template.write_text("# [Module Name]\n\nDated [YYYY-MM-DD]\n", encoding='utf-8')
+    jobs = [(template, tmp_path / f"module-{number}.md", {**REPLACEMENTS, "[Module Name]": f"module {number}"})
+            for number in range(6)]
+    jobs.append((template, tmp_path / "missing-dir" / "out.md", REPLACEMENTS))
+
+    results = render_templates(jobs, max_workers=4)
+    assert [target for target, _ in results] == [job[1] for job in jobs]
+    assert all(error is None for _, error in results[:-1])
+    assert isinstance(results[-1][1], OSError)
+    assert (tmp_path / "module-3.md").read_text(encoding='utf-8') == "# module 3\n\nDated 2025-01-31\n"
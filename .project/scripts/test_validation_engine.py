@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Tests for validation_engine.py
+"""
+
+import hashlib
+import io
+import os
+import sys
+import json
+import shutil
+from pathlib import Path
+from xml.etree import ElementTree
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import profiling
+import validation_engine
+from validation_engine import FAIL, PASS, run_validation, system_categories
+
+def copy_project(tmp_path):
+    shutil.copytree(SCRIPTS_DIR.parent, tmp_path / ".project",
+                    ignore=shutil.ignore_patterns("__pycache__", ".*.json", ".*.jsonl", ".*.lock"))
+    return tmp_path / ".project"
+
+def test_missing_content_files_fail_without_crashing(tmp_path, monkeypatch):
+    project = copy_project(tmp_path)
+    (project / "rules.md").unlink()
+    (project / "scripts" / "init-project.sh").unlink()
+    monkeypatch.chdir(tmp_path)
+
+    results = run_validation(system_categories(check_executables=True))
+    failed = [result.category.name for result in results if not result.passed]
+    assert "Core System Validation" in failed
+    assert "Scripts Validation" in failed
+    core = next(result for result in results if result.category.name == "Core System Validation")
+    assert (FAIL, "System rules missing") in core.results[0].messages
+
+def test_missing_files_are_skipped_while_profiling(tmp_path, monkeypatch):
+    project = copy_project(tmp_path)
+    (project / "rules.md").unlink()
+    monkeypatch.chdir(tmp_path)
+
+    with profiling.Profiler("validate-system.py", stream=io.StringIO()) as profiler:
+        results = run_validation(system_categories(), cache=validation_engine.ValidationCache())
+    assert ("rules", "category: Core System Validation") in profiler.phases
+    documentation = next(result for result in results if result.category.name == "Documentation Validation")
+    assert documentation.results[-1].status == PASS
+
+def content_categories():
+    required = validation_engine.RequiredContentRule(".project/notes.md", ["Overview", "Usage"], "Notes")
+    forbidden = validation_engine.ForbiddenContentRule(".project/notes.md", ["Firebase"], "project-agnostic")
+    return required, forbidden, [validation_engine.Category("Notes", [required, forbidden])]
+
+def rewrite(path, text, mtime_offset=1):
+    """Write text and move the mtime on, as a later edit would"""
+    stat = path.stat()
+    path.write_text(text, encoding='utf-8')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset * 1_000_000_000))
+
+def validate_cached(categories):
+    cache = validation_engine.ValidationCache()
+    results = run_validation(categories, cache=cache)
+    return {result.rule.name: result for result in results[0].results}
+
+def test_cache_is_reused_until_mtime_or_size_change(tmp_path, monkeypatch):
+    notes = tmp_path / ".project" / "notes.md"
+    notes.parent.mkdir()
+    notes.write_text("Overview\nUsage\n", encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    required, forbidden, categories = content_categories()
+
+    first = validate_cached(categories)
+    assert not any(result.cached for result in first.values())
+    second = validate_cached(categories)
+    assert all(result.cached for result in second.values())
+    assert second[required.name].status == PASS
+
+    # Same size, new mtime: re-read
+    rewrite(notes, "Overview\nUsagX\n")
+    third = validate_cached(categories)
+    assert not third[required.name].cached
+    assert third[required.name].status == validation_engine.WARN
+
+    # New size with the mtime left alone: re-read
+    stat = notes.stat()
+    notes.write_text("Overview\nUsage\nFirebase\n", encoding='utf-8')
+    os.utime(notes, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    fourth = validate_cached(categories)
+    assert not fourth[forbidden.name].cached
+    assert fourth[forbidden.name].status == validation_engine.WARN
+
+def test_unchanged_hash_keeps_other_rule_outcomes(tmp_path, monkeypatch):
+    notes = tmp_path / ".project" / "notes.md"
+    notes.parent.mkdir()
+    notes.write_text("Overview\nUsage\n", encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    required, forbidden, categories = content_categories()
+    validate_cached(categories)
+
+    # Touched but not changed: the required rule re-reads it and finds the same hash
+    rewrite(notes, "Overview\nUsage\n")
+    validate_cached([validation_engine.Category("Notes", [required])])
+    assert validate_cached([validation_engine.Category("Notes", [forbidden])])[forbidden.name].cached
+
+    # Changed content: the other rule's outcome is dropped
+    rewrite(notes, "Overview\nUsage\nFirebase\n", mtime_offset=2)
+    validate_cached([validation_engine.Category("Notes", [required])])
+    result = validate_cached([validation_engine.Category("Notes", [forbidden])])[forbidden.name]
+    assert not result.cached
+    assert result.status == validation_engine.WARN
+
+def test_pattern_matcher_stops_once_every_pattern_is_found():
+    matcher = validation_engine.PatternMatcher(["alpha", "beta"])
+    consumed = []
+
+    def chunks():
+        for chunk in ["xx alpha ", "and beta", "never", "read"]:
+            consumed.append(chunk)
+            yield chunk
+
+    assert matcher.scan(chunks()) == {"alpha", "beta"}
+    assert consumed == ["xx alpha ", "and beta"]
+
+def test_pattern_matcher_sees_patterns_across_chunks_and_overlaps():
+    matcher = validation_engine.PatternMatcher(["Nuxt", "Nuxt.js", "xt.j", "Pinia"])
+    assert matcher.scan(iter(["use Nu", "xt.", "js here"])) == {"Nuxt", "Nuxt.js", "xt.j"}
+    assert matcher.scan(iter([])) == set()
+    assert validation_engine.PatternMatcher([]).scan(iter(["anything"])) == set()
+
+def test_early_exit_still_hashes_the_whole_file(tmp_path, monkeypatch):
+    notes = tmp_path / ".project" / "notes.md"
+    notes.parent.mkdir()
+    data = "Overview\nUsage\n" + "filler line\n" * 20000
+    notes.write_text(data, encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    required, _, _ = content_categories()
+
+    digest = hashlib.sha256()
+    assert required.scan(digest).status == PASS
+    assert digest.hexdigest() == hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+def test_reports_round_trip_through_json_and_junit(tmp_path, monkeypatch):
+    project = copy_project(tmp_path)
+    (project / "rules.md").unlink()
+    monkeypatch.chdir(tmp_path)
+    results = run_validation(system_categories(check_executables=False), snapshot=validation_engine.Snapshot())
+
+    stream = io.StringIO()
+    validation_engine.report_json(results, stream)
+    report = json.loads(stream.getvalue())
+    rebuilt = validation_engine.results_from_report(report)
+    assert validation_engine.report_dict(rebuilt) == report
+    assert not report["passed"]
+
+    stream = io.StringIO()
+    validation_engine.report_junit(rebuilt, stream)
+    suites = ElementTree.fromstring(stream.getvalue())
+    core = suites.find("testsuite[@name='Core System Validation']")
+    assert core.get("failures") == "1"
+    failure = core.find("testcase[@name='System rules']/failure")
+    assert failure.get("message") == "System rules missing"
+    assert failure.text == ".project/rules.md"
+
+def outcomes(report):
+    return [[(result["rule"], result["status"]) for result in category["results"]] for category in report["categories"]]
+
+def test_snapshot_of_paths_matches_a_full_walk(tmp_path, monkeypatch):
+    copy_project(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    categories = system_categories(check_executables=True)
+    walked = validation_engine.report_dict(run_validation(categories))
+    listed = validation_engine.report_dict(run_validation(categories, changed_paths=set()))
+    assert outcomes(listed) == outcomes(walked)
@@ -4,9 +4,16 @@ System Validation Script for Project Management System
 This script validates that all necessary components are present and functional
 """
 
-import os
 import sys
-from pathlib import Path
+import argparse
+import subprocess
+
+import profiling
+import project_daemon
+from validation_engine import (
+    FAIL, PASS, WARN, ValidationCache, changed_paths_from_git, report_json, report_junit,
+    results_from_report, run_validation, system_categories,
+)
 
 class Colors:
     """ANSI color codes for terminal output"""
@@ -32,321 +39,109 @@ def print_header(message):
     """Print header message in blue"""
     print(f"{Colors.BLUE}=== {message} ==={Colors.NC}")
 
-def check_file_exists(file_path, description=""):
-    """Check if a file exists and return result"""
-    path = Path(file_path)
-    if path.exists():
-        print_status(f"{description or file_path} exists")
-        return True
+def print_category_result(category_result):
+    """Print one category's results in the coloured report format"""
+    printers = {PASS: print_status, WARN: print_warning, FAIL: print_error}
+    print_header(category_result.category.name)
+    for result in category_result.results:
+        for status, message in result.messages:
+            printers[status](message)
+
+def write_report(destination, reporter, category_results):
+    """Write a machine-readable report to a file, or stdout for '-'"""
+    if destination == "-":
+        reporter(category_results, sys.stdout)
     else:
-        print_error(f"{description or file_path} missing")
-        return False
+        with open(destination, 'w', encoding='utf-8') as f:
+            reporter(category_results, f)
 
-def check_directory_exists(dir_path, description=""):
-    """Check if a directory exists and return result"""
-    path = Path(dir_path)
-    if path.exists() and path.is_dir():
-        print_status(f"{description or dir_path} directory exists")
-        return True
+def read_changed_paths(source):
+    """Read changed paths, one per line, from a file or stdin for '-'"""
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
     else:
-        print_error(f"{description or dir_path} directory missing")
-        return False
-
-def check_file_content(file_path, required_content, description=""):
-    """Check if a file contains required content"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        missing_content = []
-        for item in required_content:
-            if item not in content:
-                missing_content.append(item)
-        
-        if not missing_content:
-            print_status(f"{description or file_path} has required content")
-            return True
-        else:
-            print_warning(f"{description or file_path} missing content: {', '.join(missing_content)}")
-            return False
-    except Exception as e:
-        print_error(f"Error reading {file_path}: {e}")
-        return False
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    return {line.strip() for line in lines if line.strip()}
 
-def validate_memory_bank():
-    """Validate memory bank structure and files"""
-    print_header("Memory Bank Validation")
-    
-    results = []
+def main():
+    """Main validation function"""
+    parser = argparse.ArgumentParser(description="Validate the project management system")
+    parser.add_argument("--json", metavar="FILE", help="Also write a JSON report ('-' for stdout)")
+    parser.add_argument("--junit", metavar="FILE", help="Also write a JUnit XML report ('-' for stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="Threads used for content rules")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the results cache")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="Stat only the files the rules name, taking git's changed files as a hint")
+    parser.add_argument("--changed-from", metavar="FILE",
+                        help="Like --changed-only, reading the changed paths from FILE ('-' for stdin)")
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="Validate directly even if the project daemon is running")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling.from_args("validate-system", args):
+        return validate(args)
+
+def validate(args):
+    """Run the validation and print or write the requested reports"""
+    cache = None if args.no_cache else ValidationCache()
+    changed_paths = None
+    if cache is not None and args.changed_from:
+        changed_paths = read_changed_paths(args.changed_from)
+    elif cache is not None and args.changed_only:
+        try:
+            with profiling.phase("changed paths"):
+                changed_paths = changed_paths_from_git()
+        except (OSError, subprocess.CalledProcessError):
+            # Without git every file counts as changed: fall back to a full run
+            changed_paths = None
     
-    # Check .project directory structure
-    results.append(check_directory_exists(".project", "Memory bank root"))
-    results.append(check_directory_exists(".project/core", "Core memory"))
-    results.append(check_directory_exists(".project/plans", "Plans directory"))
-    results.append(check_directory_exists(".project/task-logs", "Task logs directory"))
-    results.append(check_directory_exists(".project/errors", "Errors directory"))
+    # A report on stdout replaces the coloured text report
+    show_text = "-" not in (args.json, args.junit)
     
-    # Check core memory files
-    core_files = [
-        ("projectbrief.md", "Project brief"),
-        ("productContext.md", "Product context"),
-        ("systemPatterns.md", "System patterns"),
-        ("techContext.md", "Tech context"),
-        ("activeContext.md", "Active context"),
-        ("userStories.md", "User stories"),
-        ("acceptanceCriteria.md", "Acceptance criteria"),
-        ("progress.md", "Progress tracking")
-    ]
+    if show_text:
+        print_header("Project Management System Validation")
+        print("Validating system completeness and functionality...")
+        print()
     
-    for filename, description in core_files:
-        results.append(check_file_exists(f".project/core/{filename}", description))
+    # Ask the project daemon for a plain cached run; otherwise validate one
+    # snapshot of .project/ here
+    report = None
+    if not (args.no_daemon or args.no_cache or args.changed_only or args.changed_from):
+        with profiling.phase("daemon request"):
+            try:
+                report = project_daemon.request("validate")
+            except RuntimeError:
+                report = None
+    if report is not None:
+        category_results = results_from_report(report)
+    else:
+        with profiling.phase("validation"):
+            category_results = run_validation(
+                system_categories(), max_workers=args.workers, cache=cache, changed_paths=changed_paths
+            )
+    validation_results = [result.passed for result in category_results]
     
-    # Check memory index
-    results.append(check_file_exists(".project/memory-index.md", "Memory index"))
+    with profiling.phase("reports"):
+        if args.json:
+            write_report(args.json, report_json, category_results)
+        if args.junit:
+            write_report(args.junit, report_junit, category_results)
     
-    return all(results)
-
-def validate_templates():
-    """Validate template system"""
-    print_header("Template System Validation")
-
-    results = []
-
-    # Check templates directory
-    results.append(check_directory_exists(".project/templates", "Templates directory"))
-
-    # Check core templates
-    core_templates = [
-        ("task-log-template.md", "Task log template"),
-        ("error-template.md", "Error template"),
-        ("README-template.md", "README template"),
-        ("CONTRIBUTING-template.md", "Contributing template"),
-        ("template-index.md", "Template index")
-    ]
-
-    for filename, description in core_templates:
-        results.append(check_file_exists(f".project/templates/{filename}", description))
-
-    # Check module template directory
-    results.append(check_directory_exists(".project/templates/module-template", "Module template directory"))
-
-    module_templates = [
-        ("overview.md", "Module overview template"),
-        ("architecture.md", "Module architecture template"),
-        ("implementation-status.md", "Module status template"),
-        ("integration-guide.md", "Module integration template")
-    ]
-
-    for filename, description in module_templates:
-        results.append(check_file_exists(f".project/templates/module-template/{filename}", description))
-
-    # Check project docs templates
-    results.append(check_directory_exists(".project/templates/project-docs", "Project docs template directory"))
-
-    project_templates = [
-        ("project-overview-template.md", "Project overview template"),
-        ("architecture-template.md", "Architecture template")
-    ]
-
-    for filename, description in project_templates:
-        results.append(check_file_exists(f".project/templates/project-docs/{filename}", description))
-
-    return all(results)
-
-def validate_scripts():
-    """Validate initialization and utility scripts"""
-    print_header("Scripts Validation")
-
-    results = []
-
-    # Check scripts directory
-    results.append(check_directory_exists(".project/scripts", "Scripts directory"))
-
-    # Check initialization scripts
-    scripts = [
-        ("init-project.sh", "Bash initialization script"),
-        ("init-project.bat", "Windows initialization script"),
-        ("init-project.py", "Python initialization script"),
-        ("create-module.py", "Module creation script"),
-        ("validate-system.py", "System validation script"),
-        ("README.md", "Scripts documentation")
-    ]
-
-    for filename, description in scripts:
-        results.append(check_file_exists(f".project/scripts/{filename}", description))
-
-    # Check script executability (Unix systems)
-    if os.name != 'nt':  # Not Windows
-        executable_scripts = ["init-project.sh", "init-project.py", "create-module.py", "validate-system.py"]
-        for script in executable_scripts:
-            script_path = Path(f".project/scripts/{script}")
-            if script_path.exists():
-                if os.access(script_path, os.X_OK):
-                    print_status(f"{script} is executable")
-                    results.append(True)
-                else:
-                    print_warning(f"{script} is not executable")
-                    results.append(False)
-
-    return all(results)
-
-def validate_knowledge_management():
-    """Validate knowledge management system"""
-    print_header("Knowledge Management Validation")
-
-    results = []
-
-    # Check knowledge directory
-    results.append(check_directory_exists(".project/knowledge", "Knowledge directory"))
-
-    # Check knowledge files
-    knowledge_files = [
-        ("best-practices.md", "Best practices"),
-        ("decisions.md", "Decisions template"),
-        ("lessons-learned.md", "Lessons learned template")
-    ]
-
-    for filename, description in knowledge_files:
-        results.append(check_file_exists(f".project/knowledge/{filename}", description))
-
-    return all(results)
-
-def validate_task_management():
-    """Validate task management system"""
-    print_header("Task Management Validation")
-
-    results = []
-
-    # Check task management directory structure
-    results.append(check_directory_exists(".project/tasks", "Tasks directory"))
-    results.append(check_directory_exists(".project/tasks/active", "Active tasks directory"))
-    results.append(check_directory_exists(".project/tasks/completed", "Completed tasks directory"))
-    results.append(check_directory_exists(".project/tasks/backlog", "Backlog tasks directory"))
-
-    # Check task management files
-    results.append(check_file_exists(".project/tasks/README.md", "Task management documentation"))
-    results.append(check_file_exists(".project/templates/task-template.md", "Task template"))
-    results.append(check_file_exists(".project/scripts/manage-tasks.py", "Task management script"))
-
-    return all(results)
-
-def validate_status_tracking():
-    """Validate status tracking system"""
-    print_header("Status Tracking Validation")
-
-    results = []
-
-    # Check status directory
-    results.append(check_directory_exists(".project/status", "Status directory"))
-
-    # Check status files
-    status_files = [
-        ("current-focus.md", "Current focus template"),
-        ("progress-tracker.md", "Progress tracker template"),
-        ("roadmap.md", "Roadmap template")
-    ]
-
-    for filename, description in status_files:
-        results.append(check_file_exists(f".project/status/{filename}", description))
-
-    return all(results)
-
-def validate_core_system():
-    """Validate core system files"""
-    print_header("Core System Validation")
-
-    results = []
-
-    # Check core system files
-    core_files = [
-        (".project/rules.md", "System rules"),
-        (".project/memory-index.md", "Memory index")
-    ]
-
-    for filename, description in core_files:
-        results.append(check_file_exists(filename, description))
-
-    # Check for project-specific content that should be removed
-    project_specific_indicators = [
-        "Partners In Biz",
-        "Firebase",
-        "Nuxt",
-        "Pinia"
-    ]
-
-    # Check rules.md for generic content
-    if Path(".project/rules.md").exists():
-        generic_content = True
-        try:
-            with open(".project/rules.md", 'r', encoding='utf-8') as f:
-                content = f.read()
-            for indicator in project_specific_indicators:
-                if indicator in content:
-                    print_warning(f".project/rules.md contains project-specific reference: {indicator}")
-                    generic_content = False
-        except Exception as e:
-            print_error(f"Error checking .project/rules.md: {e}")
-            generic_content = False
-
-        if generic_content:
-            print_status(".project/rules.md is project-agnostic")
-        results.append(generic_content)
-
-    return all(results)
-
-def validate_documentation():
-    """Validate documentation completeness"""
-    print_header("Documentation Validation")
-
-    results = []
-
-    # Check for comprehensive documentation
-    required_docs = [
-        (".project/templates/template-index.md", "Template index"),
-        (".project/scripts/README.md", "Scripts documentation"),
-        (".project/memory-index.md", "Memory index")
-    ]
-
-    for filename, description in required_docs:
-        results.append(check_file_exists(filename, description))
-
-    # Check template index content
-    if Path(".project/templates/template-index.md").exists():
-        required_sections = [
-            "Project Setup Templates",
-            "Module Development Templates",
-            "Task Management Templates",
-            "How to Use These Templates"
-        ]
-        results.append(check_file_content(".project/templates/template-index.md", required_sections, "Template index"))
-
-    return all(results)
-
-def main():
-    """Main validation function"""
-    print_header("Project Management System Validation")
-    print("Validating system completeness and functionality...")
-    print()
+    total_validations = len(validation_results)
+    passed_validations = sum(validation_results)
     
-    validation_results = []
+    if not show_text:
+        return 0 if all(validation_results) else 1
     
-    # Run all validations
-    validation_results.append(validate_memory_bank())
-    validation_results.append(validate_templates())
-    validation_results.append(validate_scripts())
-    validation_results.append(validate_knowledge_management())
-    validation_results.append(validate_task_management())
-    validation_results.append(validate_status_tracking())
-    validation_results.append(validate_core_system())
-    validation_results.append(validate_documentation())
+    for category_result in category_results:
+        print_category_result(category_result)
     
     # Summary
     print()
     print_header("Validation Summary")
     
-    total_validations = len(validation_results)
-    passed_validations = sum(validation_results)
-    
     if all(validation_results):
         print_status(f"All {total_validations} validation categories passed!")
         print_status("System is complete and ready for use.")
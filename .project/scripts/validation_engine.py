@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+"""
+Validation Engine for Project Management System
+Evaluates validation rules against a single scandir snapshot of .project/
+and reports the results as text, JSON or JUnit XML
+"""
+
+import codecs
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import stat
+import subprocess
+import threading
+import time
+from xml.etree import ElementTree
+
+import profiling
+from file_ops import atomic_write
+
+PASS = "pass"
+WARN = "warn"
+FAIL = "fail"
+
+# Bytes read per step when streaming file contents through a matcher
+CHUNK_SIZE = 64 * 1024
+
+class Snapshot:
+    """Every file and directory below a root, captured with one scandir walk"""
+
+    def __init__(self, root=".project"):
+        self.root = root
+        self.entries = {}
+        self.taken_at = time.time()
+        self._walk(root)
+
+    def _walk(self, root):
+        try:
+            root_stat = os.stat(root)
+        except OSError:
+            return
+        self.entries[root] = root_stat
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        path = f"{directory}/{entry.name}"
+                        try:
+                            self.entries[path] = entry.stat(follow_symlinks=True)
+                        except OSError:
+                            continue
+                        if entry.is_dir(follow_symlinks=True):
+                            pending.append(path)
+            except OSError:
+                continue
+
+    @classmethod
+    def of_paths(cls, paths):
+        """Build a snapshot by stat-ing only the given paths, without a walk"""
+        snapshot = cls.__new__(cls)
+        snapshot.root = None
+        snapshot.entries = {}
+        snapshot.taken_at = time.time()
+        for path in set(paths):
+            try:
+                snapshot.entries[path.rstrip("/")] = os.stat(path)
+            except OSError:
+                continue
+        return snapshot
+
+    def stat(self, path):
+        return self.entries.get(path.rstrip("/"))
+
+    def exists(self, path):
+        return self.stat(path) is not None
+
+    def is_dir(self, path):
+        entry = self.stat(path)
+        return entry is not None and stat.S_ISDIR(entry.st_mode)
+
+    def is_file(self, path):
+        entry = self.stat(path)
+        return entry is not None and stat.S_ISREG(entry.st_mode)
+
+    def is_executable(self, path):
+        entry = self.stat(path)
+        return entry is not None and bool(entry.st_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH))
+
+class RuleResult:
+    """Outcome of one rule: a status and the messages to report"""
+
+    def __init__(self, rule, status, messages, duration=0.0):
+        self.rule = rule
+        self.status = status
+        # (status, message) pairs, in report order
+        self.messages = messages
+        self.duration = duration
+        self.cached = False
+
+    @property
+    def passed(self):
+        return self.status == PASS
+
+    @classmethod
+    def from_dict(cls, rule, data):
+        result = cls(rule, data["status"], [(m["status"], m["message"]) for m in data["messages"]])
+        result.cached = True
+        return result
+
+    def to_dict(self):
+        return {
+            "rule": self.rule.name,
+            "path": self.rule.path,
+            "label": self.rule.label,
+            "status": self.status,
+            "messages": [{"status": status, "message": message} for status, message in self.messages],
+            "duration": round(self.duration, 6),
+            "cached": self.cached,
+        }
+
+class Rule:
+    """Base class for validation rules; content rules read file contents"""
+
+    reads_content = False
+
+    def __init__(self, path, description=""):
+        self.path = path
+        self.description = description
+
+    @property
+    def label(self):
+        return self.description or self.path
+
+    @property
+    def name(self):
+        return f"{type(self).__name__}:{self.path}"
+
+    def evaluate(self, snapshot):
+        raise NotImplementedError
+
+class RecordedRule(Rule):
+    """Stand-in for a rule evaluated elsewhere, rebuilt from a report"""
+
+    def __init__(self, name, path, label=None):
+        super().__init__(path, label or "")
+        self.recorded_name = name
+
+    @property
+    def name(self):
+        return self.recorded_name
+
+class FileExistsRule(Rule):
+    def evaluate(self, snapshot):
+        if snapshot.exists(self.path):
+            return RuleResult(self, PASS, [(PASS, f"{self.label} exists")])
+        return RuleResult(self, FAIL, [(FAIL, f"{self.label} missing")])
+
+class DirectoryExistsRule(Rule):
+    def evaluate(self, snapshot):
+        if snapshot.is_dir(self.path):
+            return RuleResult(self, PASS, [(PASS, f"{self.label} directory exists")])
+        return RuleResult(self, FAIL, [(FAIL, f"{self.label} directory missing")])
+
+class ExecutableRule(Rule):
+    """Warns when an existing script lacks the executable bit (skipped if absent)"""
+
+    def evaluate(self, snapshot):
+        name = self.path.rsplit("/", 1)[-1]
+        if not snapshot.exists(self.path):
+            return None
+        if snapshot.is_executable(self.path):
+            return RuleResult(self, PASS, [(PASS, f"{name} is executable")])
+        return RuleResult(self, WARN, [(WARN, f"{name} is not executable")])
+
+class PatternMatcher:
+    """Finds which of several literal patterns occur in a stream of text
+
+    All patterns are compiled into one regular expression, so each chunk is
+    searched once however many patterns there are. Every position is tried
+    (the alternation sits in a lookahead), so overlapping occurrences are
+    found; where several patterns start at the same position the longest
+    wins and the shorter ones, being prefixes of it, are credited with it.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(patterns))
+        ordered = sorted(self.patterns, key=len, reverse=True)
+        self.regex = re.compile("(?=(" + "|".join(re.escape(p) for p in ordered) + "))") if ordered else None
+        # Text kept from the previous chunk so matches spanning chunks are seen
+        self.overlap = max((len(p) for p in self.patterns), default=1) - 1
+        self.implied = {p: {q for q in self.patterns if q in p} for p in self.patterns}
+
+    def scan(self, chunks):
+        """Return the set of patterns found, stopping as soon as all have been"""
+        found = set()
+        if self.regex is None:
+            return found
+        tail = ""
+        for chunk in chunks:
+            buffer = tail + chunk
+            for match in self.regex.finditer(buffer):
+                found |= self.implied[match.group(1)]
+            if len(found) == len(self.patterns):
+                break
+            tail = buffer[-self.overlap:] if self.overlap else ""
+        return found
+
+def decode_chunks(file, digest=None):
+    """Yield the text of a binary file object in chunks of CHUNK_SIZE bytes
+
+    Raw bytes are fed to digest as they are read, so a consumer that stops
+    early can finish the hash by reading the rest of the file itself.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for data in iter(lambda: file.read(CHUNK_SIZE), b''):
+        if digest is not None:
+            digest.update(data)
+        yield decoder.decode(data)
+    yield decoder.decode(b'', final=True)
+
+class ContentRule(Rule):
+    """Base class for rules that search a file's text (skipped if the file is absent)
+
+    Rules only say which patterns they look for and how to judge the set
+    that was found; the engine streams the file through a PatternMatcher,
+    so a cached outcome can stand in for the whole evaluation.
+    """
+
+    reads_content = True
+    read_error_prefix = "Error reading"
+
+    def __init__(self, path, patterns, description=""):
+        super().__init__(path, description)
+        self.patterns = list(patterns)
+        self.matcher = PatternMatcher(self.patterns)
+
+    @property
+    def signature(self):
+        """Identify the rule and its parameters, so edited rules miss the cache"""
+        return json.dumps([type(self).__name__, self.path, self.description, self.patterns])
+
+    def check(self, found):
+        raise NotImplementedError
+
+    def read_error(self, error):
+        return RuleResult(self, FAIL, [(FAIL, f"{self.read_error_prefix} {self.path}: {error}")])
+
+    def scan(self, digest=None):
+        """Stream the file and judge the patterns found in it"""
+        with open(self.path, 'rb') as f:
+            found = self.matcher.scan(decode_chunks(f, digest))
+            if digest is not None:
+                # Hash the rest of the file without matching it
+                for data in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    digest.update(data)
+        return self.check(found)
+
+    def evaluate(self, snapshot):
+        if not snapshot.exists(self.path):
+            return None
+        try:
+            return self.scan()
+        except Exception as e:
+            return self.read_error(e)
+
+class RequiredContentRule(ContentRule):
+    """Warns when a file is missing any of the required strings"""
+
+    def check(self, found):
+        missing = [item for item in self.patterns if item not in found]
+        if not missing:
+            return RuleResult(self, PASS, [(PASS, f"{self.label} has required content")])
+        return RuleResult(self, WARN, [(WARN, f"{self.label} missing content: {', '.join(missing)}")])
+
+class ForbiddenContentRule(ContentRule):
+    """Warns for every forbidden string a file contains"""
+
+    read_error_prefix = "Error checking"
+
+    def check(self, found):
+        found = [item for item in self.patterns if item in found]
+        if not found:
+            return RuleResult(self, PASS, [(PASS, f"{self.path} is {self.description}")])
+        return RuleResult(self, WARN, [
+            (WARN, f"{self.path} contains project-specific reference: {item}") for item in found
+        ])
+
+class ValidationCache:
+    """Persisted mtime, size and hash of validated files plus their rule outcomes
+
+    A content rule is skipped when its file's mtime and size are unchanged.
+    The hash decides whether a re-read file really changed: if not, the
+    outcomes of the file's other rules are kept.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path=".project/.validation-cache.json"):
+        self.path = path
+        self.files = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.files = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    def _entry(self, path):
+        return self.files.get(path)
+
+    def cached_result(self, rule, file_stat):
+        """Return the cached outcome of a rule if the file's mtime and size are unchanged"""
+        with self._lock:
+            entry = self._entry(rule.path)
+            if entry is None or rule.signature not in entry["rules"]:
+                return None
+            if (entry["mtime_ns"], entry["size"]) != (file_stat.st_mtime_ns, file_stat.st_size):
+                return None
+            return RuleResult.from_dict(rule, entry["rules"][rule.signature])
+
+    def store(self, rule, file_stat, digest, result):
+        with self._lock:
+            entry = self._entry(rule.path)
+            if entry is None or entry["sha256"] != digest:
+                entry = {"rules": {}}
+                self.files[rule.path] = entry
+            entry.update({"mtime_ns": file_stat.st_mtime_ns, "size": file_stat.st_size, "sha256": digest})
+            entry["rules"][rule.signature] = result.to_dict()
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        with self._lock:
+            atomic_write(self.path, json.dumps({"version": self.VERSION, "files": self.files}, sort_keys=True))
+            self.dirty = False
+
+class Category:
+    """A named group of rules; it passes only if every rule passes"""
+
+    def __init__(self, name, rules):
+        self.name = name
+        self.rules = rules
+
+class CategoryResult:
+    def __init__(self, category, results):
+        self.category = category
+        self.results = [result for result in results if result is not None]
+
+    @property
+    def passed(self):
+        return all(result.passed for result in self.results)
+
+    def to_dict(self):
+        return {
+            "category": self.category.name,
+            "passed": self.passed,
+            "results": [result.to_dict() for result in self.results],
+        }
+
+def _timed(rule, snapshot):
+    start = time.perf_counter()
+    result = rule.evaluate(snapshot)
+    if result is not None:
+        result.duration = time.perf_counter() - start
+    return result
+
+def _evaluate_content(rule, snapshot, cache):
+    """Evaluate a content rule, reusing the cached outcome when the file is unchanged"""
+    start = time.perf_counter()
+    file_stat = snapshot.stat(rule.path)
+    if file_stat is None:
+        return None
+    result = cache.cached_result(rule, file_stat=file_stat)
+    if result is not None:
+        return result
+
+    try:
+        digest = hashlib.sha256()
+        result = rule.scan(digest)
+        digest = digest.hexdigest()
+    except Exception as e:
+        return rule.read_error(e)
+
+    result.duration = time.perf_counter() - start
+    cache.store(rule, file_stat, digest, result)
+    return result
+
+def changed_paths_from_git():
+    """Return paths changed relative to HEAD (staged, unstaged and untracked)"""
+    commands = [
+        ["git", "diff", "--name-only", "--relative", "HEAD"],
+        ["git", "ls-files", "--others", "--exclude-standard"],
+    ]
+    paths = set()
+    for command in commands:
+        output = subprocess.run(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True
+        ).stdout
+        paths.update(line.strip() for line in output.splitlines() if line.strip())
+    return paths
+
+def run_validation(categories, root=".project", max_workers=None, snapshot=None, cache=None, changed_paths=None):
+    """Evaluate every rule against one snapshot; content rules run concurrently
+
+    With a cache, content rules on unchanged files reuse their previous
+    outcome. changed_paths (a --changed-only run) is only a hint that few
+    files changed: the snapshot stats just the paths the rules name instead
+    of walking the whole tree. Every file is still checked against the cache
+    by mtime and size, so edits the list misses (a git pull, another tool)
+    are re-validated.
+    """
+    with profiling.phase("snapshot"):
+        if snapshot is None:
+            if changed_paths is not None:
+                snapshot = Snapshot.of_paths(rule.path for category in categories for rule in category.rules)
+            else:
+                snapshot = Snapshot(root)
+    results = {}
+
+    def evaluate_content(rule):
+        if cache is None:
+            return _timed(rule, snapshot)
+        return _evaluate_content(rule, snapshot, cache)
+
+    content_rules = [rule for category in categories for rule in category.rules if rule.reads_content]
+    with profiling.phase("rules"):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {id(rule): executor.submit(evaluate_content, rule) for rule in content_rules}
+
+            for category in categories:
+                for rule in category.rules:
+                    if not rule.reads_content:
+                        results[id(rule)] = _timed(rule, snapshot)
+            for key, future in futures.items():
+                results[key] = future.result()
+        # Rules run concurrently, so a category's time is the sum of its rule times;
+        # skipped rules (their file is absent) have no result
+        for category in categories:
+            category_results = [results[id(rule)] for rule in category.rules]
+            profiling.record(f"category: {category.name}",
+                             sum(result.duration for result in category_results if result is not None),
+                             len(category.rules))
+
+    if cache is not None:
+        with profiling.phase("save cache"):
+            cache.save()
+
+    return [
+        CategoryResult(category, [results[id(rule)] for rule in category.rules])
+        for category in categories
+    ]
+
+def report_dict(category_results):
+    """Return results as the JSON-compatible report document"""
+    return {
+        "passed": all(result.passed for result in category_results),
+        "categories": [result.to_dict() for result in category_results],
+    }
+
+def results_from_report(report):
+    """Rebuild category results from a report_dict() document
+
+    Used for results computed elsewhere (such as by the project daemon);
+    the rules are stand-ins carrying only their name, path and label.
+    """
+    category_results = []
+    for category_data in report["categories"]:
+        results = []
+        for data in category_data["results"]:
+            rule = RecordedRule(data["rule"], data["path"], data.get("label"))
+            result = RuleResult(rule, data["status"], [(m["status"], m["message"]) for m in data["messages"]],
+                                data.get("duration", 0.0))
+            result.cached = data.get("cached", False)
+            results.append(result)
+        category_results.append(CategoryResult(Category(category_data["category"], []), results))
+    return category_results
+
+def report_json(category_results, stream):
+    """Write results as a JSON document"""
+    json.dump(report_dict(category_results), stream, indent=2)
+    stream.write("\n")
+
+def report_junit(category_results, stream):
+    """Write results as JUnit XML, one testsuite per category"""
+    suites = ElementTree.Element("testsuites", name="project-validation")
+    for category_result in category_results:
+        failures = sum(1 for result in category_result.results if not result.passed)
+        suite = ElementTree.SubElement(
+            suites, "testsuite",
+            name=category_result.category.name,
+            tests=str(len(category_result.results)),
+            failures=str(failures),
+            time=f"{sum(result.duration for result in category_result.results):.6f}",
+        )
+        for result in category_result.results:
+            case = ElementTree.SubElement(
+                suite, "testcase",
+                classname=category_result.category.name,
+                name=result.rule.label,
+                time=f"{result.duration:.6f}",
+            )
+            if not result.passed:
+                failure = ElementTree.SubElement(
+                    case, "failure",
+                    type="warning" if result.status == WARN else "failure",
+                    message="; ".join(message for _, message in result.messages),
+                )
+                failure.text = result.rule.path
+    stream.write(ElementTree.tostring(suites, encoding="unicode"))
+    stream.write("\n")
+
+def system_categories(check_executables=None):
+    """Return the rule set validating the project management system layout"""
+    if check_executables is None:
+        check_executables = os.name != 'nt'
+
+    core_files = [
+        ("projectbrief.md", "Project brief"),
+        ("productContext.md", "Product context"),
+        ("systemPatterns.md", "System patterns"),
+        ("techContext.md", "Tech context"),
+        ("activeContext.md", "Active context"),
+        ("userStories.md", "User stories"),
+        ("acceptanceCriteria.md", "Acceptance criteria"),
+        ("progress.md", "Progress tracking")
+    ]
+    memory_bank = [
+        DirectoryExistsRule(".project", "Memory bank root"),
+        DirectoryExistsRule(".project/core", "Core memory"),
+        DirectoryExistsRule(".project/plans", "Plans directory"),
+        DirectoryExistsRule(".project/task-logs", "Task logs directory"),
+        DirectoryExistsRule(".project/errors", "Errors directory"),
+    ] + [
+        FileExistsRule(f".project/core/{filename}", description) for filename, description in core_files
+    ] + [
+        FileExistsRule(".project/memory-index.md", "Memory index"),
+    ]
+
+    core_templates = [
+        ("task-log-template.md", "Task log template"),
+        ("error-template.md", "Error template"),
+        ("README-template.md", "README template"),
+        ("CONTRIBUTING-template.md", "Contributing template"),
+        ("template-index.md", "Template index")
+    ]
+    module_templates = [
+        ("overview.md", "Module overview template"),
+        ("architecture.md", "Module architecture template"),
+        ("implementation-status.md", "Module status template"),
+        ("integration-guide.md", "Module integration template")
+    ]
+    project_templates = [
+        ("project-overview-template.md", "Project overview template"),
+        ("architecture-template.md", "Architecture template")
+    ]
+    templates = (
+        [DirectoryExistsRule(".project/templates", "Templates directory")]
+        + [FileExistsRule(f".project/templates/{f}", d) for f, d in core_templates]
+        + [DirectoryExistsRule(".project/templates/module-template", "Module template directory")]
+        + [FileExistsRule(f".project/templates/module-template/{f}", d) for f, d in module_templates]
+        + [DirectoryExistsRule(".project/templates/project-docs", "Project docs template directory")]
+        + [FileExistsRule(f".project/templates/project-docs/{f}", d) for f, d in project_templates]
+    )
+
+    scripts = [
+        ("init-project.sh", "Bash initialization script"),
+        ("init-project.bat", "Windows initialization script"),
+        ("init-project.py", "Python initialization script"),
+        ("create-module.py", "Module creation script"),
+        ("validate-system.py", "System validation script"),
+        ("README.md", "Scripts documentation")
+    ]
+    script_rules = (
+        [DirectoryExistsRule(".project/scripts", "Scripts directory")]
+        + [FileExistsRule(f".project/scripts/{f}", d) for f, d in scripts]
+    )
+    if check_executables:
+        script_rules += [
+            ExecutableRule(f".project/scripts/{script}")
+            for script in ["init-project.sh", "init-project.py", "create-module.py", "validate-system.py"]
+        ]
+
+    knowledge_files = [
+        ("best-practices.md", "Best practices"),
+        ("decisions.md", "Decisions template"),
+        ("lessons-learned.md", "Lessons learned template")
+    ]
+    knowledge = (
+        [DirectoryExistsRule(".project/knowledge", "Knowledge directory")]
+        + [FileExistsRule(f".project/knowledge/{f}", d) for f, d in knowledge_files]
+    )
+
+    task_management = [
+        DirectoryExistsRule(".project/tasks", "Tasks directory"),
+        DirectoryExistsRule(".project/tasks/active", "Active tasks directory"),
+        DirectoryExistsRule(".project/tasks/completed", "Completed tasks directory"),
+        DirectoryExistsRule(".project/tasks/backlog", "Backlog tasks directory"),
+        FileExistsRule(".project/tasks/README.md", "Task management documentation"),
+        FileExistsRule(".project/templates/task-template.md", "Task template"),
+        FileExistsRule(".project/scripts/manage-tasks.py", "Task management script"),
+    ]
+
+    status_files = [
+        ("current-focus.md", "Current focus template"),
+        ("progress-tracker.md", "Progress tracker template"),
+        ("roadmap.md", "Roadmap template")
+    ]
+    status_tracking = (
+        [DirectoryExistsRule(".project/status", "Status directory")]
+        + [FileExistsRule(f".project/status/{f}", d) for f, d in status_files]
+    )
+
+    core_system = [
+        FileExistsRule(".project/rules.md", "System rules"),
+        FileExistsRule(".project/memory-index.md", "Memory index"),
+        # Check for project-specific content that should be removed
+        ForbiddenContentRule(".project/rules.md", ["Partners In Biz", "Firebase", "Nuxt", "Pinia"], "project-agnostic"),
+    ]
+
+    documentation = [
+        FileExistsRule(".project/templates/template-index.md", "Template index"),
+        FileExistsRule(".project/scripts/README.md", "Scripts documentation"),
+        FileExistsRule(".project/memory-index.md", "Memory index"),
+        RequiredContentRule(".project/templates/template-index.md", [
+            "Project Setup Templates",
+            "Module Development Templates",
+            "Task Management Templates",
+            "How to Use These Templates"
+        ], "Template index"),
+    ]
+
+    return [
+        Category("Memory Bank Validation", memory_bank),
+        Category("Template System Validation", templates),
+        Category("Scripts Validation", script_rules),
+        Category("Knowledge Management Validation", knowledge),
+        Category("Task Management Validation", task_management),
+        Category("Status Tracking Validation", status_tracking),
+        Category("Core System Validation", core_system),
+        Category("Documentation Validation", documentation),
+    ]
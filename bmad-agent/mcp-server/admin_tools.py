@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Admin tools for the BMAD MCP server: on-demand profiling of the live process
+and the slow-request flight recorder
+
+start_server_profiling profiles the running server for a time window, so
+hot spots can be found in the real workload without restarting it under a
+profiler. Two modes:
+
+- sampling: a background thread snapshots the stacks of the request thread
+  (or all threads) every few milliseconds through sys._current_frames() and
+  writes collapsed stacks ("frame;frame;frame count", as read by
+  flamegraph.pl and speedscope). Low overhead; nothing is hooked.
+- cprofile: deterministic cProfile of the request thread, written as pstats
+  (python -m pstats FILE). Exact call counts, higher overhead.
+
+stop_server_profiling (or the end of the window) writes the output file and
+returns a summary of the hottest functions. get_flight_recorder returns the
+recent requests kept by flight_recorder.py with their stage timings. The
+tools are only offered when BMAD_MCP_ADMIN_TOOLS is set.
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ["sampling", "cprofile"]
+DEFAULT_INTERVAL_MS = 5.0
+DEFAULT_DURATION = 30.0
+MAX_DURATION = 3600.0
+SUMMARY_SIZE = 15
+
+def admin_tools_enabled() -> bool:
+    return os.getenv('BMAD_MCP_ADMIN_TOOLS', '').lower() in ('1', 'true', 'yes')
+
+def profile_dir() -> Path:
+    return Path(os.getenv('BMAD_PROFILE_DIR', str(Path(tempfile.gettempdir()) / "bmad-mcp-profiles")))
+
+# start_server_profiling arguments and the types they accept
+PROFILING_ARGS = {
+    "mode": (str,),
+    "duration": (int, float),
+    "interval_ms": (int, float),
+    "all_threads": (bool,),
+    "output": (str,),
+}
+
+def profiling_args_error(args: Dict[str, Any]) -> Optional[str]:
+    """Return why start_server_profiling arguments are invalid, or None"""
+    unknown = sorted(set(args) - set(PROFILING_ARGS))
+    if unknown:
+        return f"Unknown argument(s): {', '.join(unknown)} (expected {', '.join(PROFILING_ARGS)})"
+    for name, value in args.items():
+        types = PROFILING_ARGS[name]
+        # bool is an int subclass, but true is not a duration
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            expected = "a number" if float in types else f"a {'boolean' if bool in types else 'string'}"
+            return f"{name} must be {expected}, not {type(value).__name__}"
+    return None
+
+def frame_label(code) -> str:
+    """Label a code object as 'function (file:line)' for collapsed stacks"""
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})".replace(";", ",")
+
+class SamplingProfiler:
+    """Samples thread stacks on a background thread into collapsed-stack counts"""
+
+    def __init__(self, interval: float, thread_ids: Optional[List[int]] = None):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="bmad-sampling-profiler", daemon=True)
+        self.names: Dict[int, str] = {}
+
+    def start(self):
+        self.names = {thread.ident: thread.name for thread in threading.enumerate()}
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        # Label stacks by code object once; frames hold the same code objects for every sample
+        labels: Dict[Any, str] = {}
+        while not self.stopping.wait(self.interval):
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident == own or (self.thread_ids is not None and ident not in self.thread_ids):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(self.names.get(ident, f"thread-{ident}"))
+                stack.reverse()
+                self.stacks[";".join(stack)] += 1
+            self.samples += 1
+            del frames
+
+    def write(self, path: Path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the hottest functions by own (leaf) samples and by inclusive samples"""
+        leaf: Counter = Counter()
+        inclusive: Counter = Counter()
+        for stack, count in self.stacks.items():
+            # The first frame is the thread name
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            leaf[frames[-1]] += count
+            for label in set(frames):
+                inclusive[label] += count
+        total = sum(self.stacks.values()) or 1
+        return {
+            "samples": self.samples,
+            "stacks": len(self.stacks),
+            "top_self": [
+                {"function": label, "samples": count, "percent": round(100 * count / total, 1)}
+                for label, count in leaf.most_common(SUMMARY_SIZE)
+            ],
+            "top_inclusive": [
+                {"function": label, "samples": count, "percent": round(100 * count / total, 1)}
+                for label, count in inclusive.most_common(SUMMARY_SIZE)
+            ],
+        }
+
+class ProfilingSession:
+    """One profiling window over the live server"""
+
+    def __init__(self, mode: str, duration: float, interval: float, all_threads: bool, output: Path):
+        self.mode = mode
+        self.duration = duration
+        self.interval = interval
+        self.all_threads = all_threads
+        self.output = output
+        self.started = None
+        self.started_at = None
+        self.elapsed = 0.0
+        self.sampler: Optional[SamplingProfiler] = None
+        self.cprofile: Optional[cProfile.Profile] = None
+        self.result: Optional[Dict[str, Any]] = None
+
+    def start(self):
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.started = time.perf_counter()
+        if self.mode == "sampling":
+            thread_ids = None if self.all_threads else [threading.get_ident()]
+            self.sampler = SamplingProfiler(self.interval, thread_ids)
+            self.sampler.start()
+        else:
+            # Profiles the thread that handles requests: the one starting the session
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    @property
+    def expired(self) -> bool:
+        return self.started is not None and time.perf_counter() - self.started >= self.duration
+
+    def finish(self) -> Dict[str, Any]:
+        """Stop profiling, write the output file and return the summary
+
+        The session is finished even if the file cannot be written: the
+        result then carries the error alongside the in-memory summary.
+        """
+        if self.result is not None:
+            return self.result
+        self.elapsed = time.perf_counter() - self.started
+        if self.sampler is not None:
+            self.sampler.stop()
+            summary = self.sampler.summary()
+        else:
+            self.cprofile.disable()
+            summary = self.cprofile_summary()
+        result = {
+            "mode": self.mode,
+            "started_at": self.started_at,
+            "elapsed": round(self.elapsed, 3),
+            "output": str(self.output),
+            **summary,
+        }
+        try:
+            self.output.parent.mkdir(parents=True, exist_ok=True)
+            if self.sampler is not None:
+                self.sampler.write(self.output)
+            else:
+                self.cprofile.dump_stats(str(self.output))
+        except OSError as e:
+            logger.error(f"Failed to write profile: {e}")
+            result = {"error": f"Failed to write profile to {self.output}: {e}", **result}
+        else:
+            logger.info(f"Profile written to {self.output}")
+        self.result = result
+        return self.result
+
+    def cprofile_summary(self) -> Dict[str, Any]:
+        stats = pstats.Stats(self.cprofile)
+        rows = []
+        for (filename, line, name), (calls, primitive, own, cumulative, _) in stats.stats.items():
+            rows.append({
+                "function": f"{name} ({Path(filename).name}:{line})",
+                "calls": calls,
+                "own": round(own, 6),
+                "cumulative": round(cumulative, 6),
+            })
+        return {
+            "total_calls": stats.total_calls,
+            "total_time": round(stats.total_tt, 6),
+            "top_cumulative": sorted(rows, key=lambda row: row["cumulative"], reverse=True)[:SUMMARY_SIZE],
+            "top_own": sorted(rows, key=lambda row: row["own"], reverse=True)[:SUMMARY_SIZE],
+        }
+
+class AdminTools:
+    """MCP tools for inspecting the live server"""
+
+    def __init__(self, recorder=None):
+        self.recorder = recorder
+        self.session: Optional[ProfilingSession] = None
+        self.timer: Optional[threading.Timer] = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def create(cls, recorder=None) -> Optional["AdminTools"]:
+        """Return the admin tools, or None unless BMAD_MCP_ADMIN_TOOLS is set"""
+        return cls(recorder) if admin_tools_enabled() else None
+
+    def get_tools(self) -> List[Dict[str, Any]]:
+        """Return the MCP tool definitions"""
+        return [
+            {
+                "name": "start_server_profiling",
+                "description": "Admin: profile the running MCP server for a time window",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "mode": {
+                            "type": "string",
+                            "enum": PROFILE_MODES,
+                            "description": "sampling (low overhead, collapsed stacks) or cprofile (pstats)"
+                        },
+                        "duration": {
+                            "type": "number",
+                            "description": f"Seconds to profile before stopping (default {DEFAULT_DURATION:g})"
+                        },
+                        "interval_ms": {
+                            "type": "number",
+                            "description": f"Sampling interval (default {DEFAULT_INTERVAL_MS:g} ms)"
+                        },
+                        "all_threads": {
+                            "type": "boolean",
+                            "description": "Sample every thread, not just the request thread (sampling only)"
+                        },
+                        "output": {"type": "string", "description": "Output file (default under BMAD_PROFILE_DIR)"}
+                    },
+                    "required": []
+                }
+            },
+            {
+                "name": "stop_server_profiling",
+                "description": "Admin: stop profiling, or collect a finished window, and summarise the hot spots",
+                "inputSchema": {"type": "object", "properties": {}, "required": []}
+            },
+            {
+                "name": "get_flight_recorder",
+                "description": "Admin: recent requests with per-stage timings and outcome, plus latency percentiles",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "slow_only": {"type": "boolean", "description": "Only requests over the slow threshold"},
+                        "limit": {"type": "integer", "description": "Return at most this many of the newest entries"}
+                    },
+                    "required": []
+                }
+            },
+        ]
+
+    def handles(self, name: str) -> bool:
+        return name in ("start_server_profiling", "stop_server_profiling", "get_flight_recorder")
+
+    def execute_tool(self, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        if name == "start_server_profiling":
+            error = profiling_args_error(args)
+            if error:
+                return {"error": error}
+            return self.start_profiling(**args)
+        elif name == "stop_server_profiling":
+            return self.stop_profiling()
+        elif name == "get_flight_recorder":
+            if self.recorder is None:
+                return {"error": "The flight recorder is not running"}
+            return self.recorder.snapshot(args.get("slow_only", False), args.get("limit"))
+        return {"error": f"Unknown tool: {name}"}
+
+    def start_profiling(self, mode: str = "sampling", duration: float = DEFAULT_DURATION,
+                        interval_ms: float = DEFAULT_INTERVAL_MS, all_threads: bool = False,
+                        output: Optional[str] = None) -> Dict[str, Any]:
+        if mode not in PROFILE_MODES:
+            return {"error": f"Unknown profiling mode '{mode}'"}
+        if not 0 < duration <= MAX_DURATION:
+            return {"error": f"duration must be between 0 and {MAX_DURATION:g} seconds"}
+        if interval_ms < 0.5:
+            return {"error": "interval_ms must be at least 0.5"}
+        with self.lock:
+            if self.session is not None and self.session.result is None:
+                return {"error": f"A {self.session.mode} profile is already running"}
+            if output:
+                path = Path(output).expanduser()
+            else:
+                suffix = "collapsed" if mode == "sampling" else "prof"
+                path = profile_dir() / f"mcp-{time.strftime('%Y%m%d-%H%M%S')}-{mode}.{suffix}"
+            session = ProfilingSession(mode, duration, interval_ms / 1000, all_threads, path)
+            try:
+                session.start()
+            except ValueError as e:
+                # Python 3.12+ refuses a second profiler, e.g. when the server already runs under one
+                return {"error": f"Cannot start profiling: {e}"}
+            self.session = session
+            if mode == "sampling":
+                # The sampler can stop itself; cProfile must be stopped on the request thread (see check)
+                self.timer = threading.Timer(duration, self._expire, args=(self.session,))
+                self.timer.daemon = True
+                self.timer.start()
+        return {
+            "status": "profiling",
+            "mode": mode,
+            "duration": duration,
+            "output": str(path),
+        }
+
+    def _expire(self, session: ProfilingSession):
+        with self.lock:
+            if session is self.session:
+                session.finish()
+
+    def check(self):
+        """End an expired cProfile window; called by the server after each request"""
+        session = self.session
+        if session is not None and session.cprofile is not None and session.result is None and session.expired:
+            with self.lock:
+                session.finish()
+
+    def stop_profiling(self) -> Dict[str, Any]:
+        with self.lock:
+            session = self.session
+            if session is None:
+                return {"error": "No profile has been started"}
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            return session.finish()
@@ -11,6 +11,12 @@ from typing import Dict, List, Any, Optional
 from pathlib import Path
 import re
 
+from admin_tools import AdminTools
+from document_store import default_sources, shared_store
+from flight_recorder import FlightRecorder
+from mcp_connection import PARTIAL_RESULTS_CAPABILITY, Connection, Progress
+from project_tools import ProjectTools
+
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -19,8 +25,15 @@ class BMadMCPServer:
     def __init__(self, config_path: str, project_root: str):
         self.config_path = Path(config_path)
         self.project_root = Path(project_root)
+        self.bmad_root = self.config_path.parent
         self.agents = {}
+        self.documents = shared_store()
+        self.bundles = {}
+        self._documents_indexed = False
         self.load_agents()
+        self.project = ProjectTools.create(self.project_root, self.documents)
+        self.recorder = FlightRecorder.from_env(self.project_root)
+        self.admin = AdminTools.create(self.recorder)
     
     def load_agents(self):
         """Load BMAD agent configuration"""
@@ -151,29 +164,63 @@ class BMadMCPServer:
                 "properties": {
                     "knowledge_type": {
                         "type": "string",
-                        "description": "Type of knowledge (project-context, tech-stack, data-models, etc.)"
+                        "description": "Type of knowledge (project-context, tech-stack, data-models, etc.), or 'all' for every .ai file"
                     }
                 },
                 "required": ["knowledge_type"]
             }
         })
         
+        # Add document access tool
+        tools.append({
+            "name": "get_bmad_document",
+            "description": "Read a BMAD task, template, checklist or persona by path or bundle section",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "reference": {
+                        "type": "string",
+                        "description": "Path relative to bmad-agent/ or the project root (e.g., 'tasks/create-prd.md'), or a bundle section (e.g., 'tasks#create-prd')"
+                    }
+                },
+                "required": ["reference"]
+            }
+        })
+        
+        # Add .project task and memory bank tools
+        if self.project is not None:
+            tools.extend(self.project.get_tools())
+        
+        # Add admin tools (profiling) when enabled
+        if self.admin is not None:
+            tools.extend(self.admin.get_tools())
+        
         return tools
     
-    def execute_tool(self, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a tool and return results"""
+    def execute_tool(self, name: str, args: Dict[str, Any], progress: Optional[Progress] = None) -> Dict[str, Any]:
+        """Execute a tool and return results, reporting progress of long operations"""
+        progress = progress or Progress()
         try:
             if name == "list_bmad_agents":
                 return self.list_agents()
             elif name == "execute_bmad_task":
-                return self.execute_task(args["agent"], args["task"], args["input"])
+                return self.execute_task(args["agent"], args["task"], args["input"], progress)
             elif name == "get_bmad_knowledge":
-                return self.get_knowledge(args["knowledge_type"])
+                return self.get_knowledge(args["knowledge_type"], progress)
+            elif name == "get_bmad_document":
+                return self.get_document(args["reference"], progress)
+            elif self.project is not None and self.project.handles(name):
+                return self.project.execute_tool(name, args)
+            elif self.admin is not None and self.admin.handles(name):
+                return self.admin.execute_tool(name, args)
             else:
                 return {"error": f"Unknown tool: {name}"}
         except Exception as e:
             logger.error(f"Tool execution error: {e}")
             return {"error": str(e)}
+        finally:
+            if self.admin is not None:
+                self.admin.check()
     
     def list_agents(self) -> Dict[str, Any]:
         """List all available BMAD agents"""
@@ -194,8 +241,10 @@ class BMadMCPServer:
             "total_count": len(agent_list)
         }
     
-    def execute_task(self, agent: str, task: str, input_text: str) -> Dict[str, Any]:
+    def execute_task(self, agent: str, task: str, input_text: str,
+                     progress: Optional[Progress] = None) -> Dict[str, Any]:
         """Execute a task with specified agent"""
+        progress = progress or Progress()
         if agent not in self.agents:
             return {"error": f"Agent '{agent}' not found"}
         
@@ -210,15 +259,27 @@ class BMadMCPServer:
         
         if not task_file:
             return {"error": f"Task '{task}' not found for agent '{agent}'"}
+        progress.update(1, 3, f"Resolved task '{task}' for {agent_info['name']}")
+        
+        # Task files resolve against bmad-agent/tasks; some tasks live in the persona instead
+        instructions = None
+        task_path = self.bmad_root / "tasks" / task_file
+        if task_path.is_file():
+            digest = self.documents.load_file(task_path)
+            instructions = self.documents.get_blob(digest) if digest else None
+        progress.update(2, 3, "Loaded task instructions",
+                        partial={"instructions": instructions} if progress.wants_partial else None)
         
         # This would interface with your BMAD agent execution system
         # For now, return a placeholder response
+        progress.update(3, 3, "Task queued")
         return {
             "agent": agent_info["name"],
             "task": task,
             "input": input_text,
             "status": "Task queued for execution",
             "message": f"Task '{task}' has been queued for execution by {agent_info['name']} ({agent_info['title']})",
+            "instructions": instructions,
             "next_steps": [
                 "Review task requirements",
                 "Execute with BMAD agent system",
@@ -226,9 +287,11 @@ class BMadMCPServer:
             ]
         }
     
-    def get_knowledge(self, knowledge_type: str) -> Dict[str, Any]:
+    def get_knowledge(self, knowledge_type: str, progress: Optional[Progress] = None) -> Dict[str, Any]:
         """Get knowledge from .ai directory"""
         ai_dir = self.project_root / ".ai"
+        if knowledge_type == "all":
+            return self.get_all_knowledge(ai_dir, progress or Progress())
         knowledge_file = ai_dir / f"{knowledge_type}.md"
         
         if not knowledge_file.exists():
@@ -247,17 +310,155 @@ class BMadMCPServer:
                 return {"error": f"Knowledge file '{knowledge_type}.md' not found in .ai directory"}
         
         try:
-            with open(knowledge_file, 'r') as f:
-                content = f.read()
+            digest = self.documents.load_file(knowledge_file)
             
             return {
                 "knowledge_type": knowledge_type,
                 "file_path": str(knowledge_file),
-                "content": content,
+                "content": self.documents.get_blob(digest),
+                "content_hash": digest,
                 "last_modified": knowledge_file.stat().st_mtime
             }
         except Exception as e:
             return {"error": f"Failed to read knowledge file: {e}"}
+    
+    def get_all_knowledge(self, ai_dir: Path, progress: Progress) -> Dict[str, Any]:
+        """Assemble every .ai knowledge file, sending each one as a partial result"""
+        files = sorted(ai_dir.glob("*.md")) if ai_dir.is_dir() else []
+        if not files:
+            return {"error": "No knowledge files found in .ai directory"}
+        
+        knowledge = []
+        for number, knowledge_file in enumerate(files, 1):
+            try:
+                digest = self.documents.load_file(knowledge_file)
+            except OSError as e:
+                logger.warning(f"Skipping knowledge file {knowledge_file}: {e}")
+                continue
+            entry = {
+                "knowledge_type": knowledge_file.stem,
+                "file_path": str(knowledge_file),
+                "content": self.documents.get_blob(digest),
+                "content_hash": digest,
+                "last_modified": knowledge_file.stat().st_mtime
+            }
+            knowledge.append(entry)
+            progress.update(number, len(files), f"Loaded {knowledge_file.name}",
+                            partial={"knowledge": entry} if progress.wants_partial else None)
+        
+        return {
+            "knowledge": knowledge,
+            "total_count": len(knowledge)
+        }
+    
+    def index_documents(self, progress: Optional[Progress] = None):
+        """Load BMAD documents and web bundles into the shared document store"""
+        progress = progress or Progress()
+        sources = default_sources(self.bmad_root, self.project_root)
+        steps = len(sources["directories"]) + len(sources["bundles"])
+        total = 0
+        for number, directory in enumerate(sources["directories"], 1):
+            count = self.documents.load_directory(directory)
+            total += count
+            progress.update(number, steps, f"Indexed {directory}",
+                            partial={"source": str(directory), "documents": count})
+        for number, bundle in enumerate(sources["bundles"], len(sources["directories"]) + 1):
+            self.bundles[bundle.stem] = bundle
+            count = self.documents.load_bundle(bundle)
+            total += count
+            progress.update(number, steps, f"Indexed bundle {bundle.name}",
+                            partial={"source": str(bundle), "documents": count})
+        self._documents_indexed = True
+        
+        stats = self.documents.stats()
+        logger.info(
+            f"Indexed {total} document references "
+            f"({stats['unique_documents']} unique, {stats['unique_bytes']} of {stats['referenced_bytes']} bytes held)"
+        )
+    
+    def get_document(self, reference: str, progress: Optional[Progress] = None) -> Dict[str, Any]:
+        """Get a BMAD document by path or bundle section reference"""
+        if not self._documents_indexed:
+            self.index_documents(progress)
+        
+        if "#" in reference:
+            bundle_name, section = reference.split("#", 1)
+            bundle_path = self.bundles.get(bundle_name)
+            if bundle_path is None:
+                return {"error": f"Bundle '{bundle_name}' not found"}
+            self.documents.load_bundle(bundle_path)
+            resolved = f"{bundle_path.resolve()}#{section}"
+            digest = self.documents.digest_of(resolved)
+        else:
+            digest = None
+            for base in (self.bmad_root, self.project_root):
+                candidate = (base / reference).resolve()
+                if base.resolve() in candidate.parents and candidate.is_file():
+                    resolved = str(candidate)
+                    digest = self.documents.load_file(candidate)
+                    break
+        
+        if digest is None:
+            return {"error": f"Document '{reference}' not found"}
+        
+        return {
+            "reference": reference,
+            "resolved": resolved,
+            "content": self.documents.get_blob(digest),
+            "content_hash": digest,
+            "shared_with": len(self.documents.references(digest)) - 1
+        }
+
+def handle_request(server: BMadMCPServer, connection: Connection, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the response to one JSON-RPC message, or None for a notification"""
+    method = request.get("method")
+    
+    if method == "initialize":
+        return {
+            "jsonrpc": "2.0",
+            "id": request.get("id"),
+            "result": connection.initialize(request.get("params") or {}, {
+                "tools": {},
+                "experimental": {PARTIAL_RESULTS_CAPABILITY: {}}
+            })
+        }
+    elif method == "tools/list":
+        return {
+            "jsonrpc": "2.0",
+            "id": request.get("id"),
+            "result": {
+                "tools": server.get_tools()
+            }
+        }
+    elif method == "tools/call":
+        tool_name = request["params"]["name"]
+        tool_args = request["params"].get("arguments") or {}
+        result = server.execute_tool(tool_name, tool_args, connection.progress(request["params"]))
+        
+        return {
+            "jsonrpc": "2.0", 
+            "id": request.get("id"),
+            "result": connection.tool_result(result)
+        }
+    elif method == "ping":
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": {}}
+    elif "id" not in request:
+        # Notifications (e.g. notifications/initialized) get no response
+        return None
+    else:
+        return {
+            "jsonrpc": "2.0",
+            "id": request.get("id"),
+            "error": {
+                "code": -32601,
+                "message": "Method not found"
+            }
+        }
+
+def outcome_of(response: Dict[str, Any]) -> str:
+    if "error" in response:
+        return "rpc_error"
+    return "tool_error" if response["result"].get("isError") else "ok"
 
 def main():
     """Main MCP server loop"""
@@ -270,61 +471,71 @@ def main():
     
     server = BMadMCPServer(config_path, project_root)
     
+    connection = Connection()
+    recorder = server.recorder
+    
     # MCP protocol implementation
     for line in sys.stdin:
+        if not line.strip():
+            continue
+        trace = recorder.start(len(line))
+        request = None
         try:
-            request = json.loads(line.strip())
-            
-            if request.get("method") == "tools/list":
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "result": {
-                        "tools": server.get_tools()
-                    }
-                }
-            elif request.get("method") == "tools/call":
-                tool_name = request["params"]["name"]
-                tool_args = request["params"]["arguments"]
-                result = server.execute_tool(tool_name, tool_args)
-                
-                response = {
-                    "jsonrpc": "2.0", 
-                    "id": request.get("id"),
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json.dumps(result, indent=2)
-                            }
-                        ]
-                    }
-                }
-            else:
-                response = {
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                trace.mark("parse")
+                logger.error(f"Unparseable request ({len(line)} bytes): {e}")
+                written, io = connection.send({
                     "jsonrpc": "2.0",
-                    "id": request.get("id"),
+                    "id": None,
                     "error": {
-                        "code": -32601,
-                        "message": "Method not found"
+                        "code": -32700,
+                        "message": "Parse error"
                     }
-                }
+                })
+                trace.sent(io)
+                trace.finish("parse_error", written, str(e))
+                continue
+            trace.request = request
+            trace.mark("parse")
+            
+            response = handle_request(server, connection, request)
+            trace.mark("dispatch")
+            if response is None:
+                trace.finish("notification")
+                continue
             
-            print(json.dumps(response))
-            sys.stdout.flush()
+            written, io = connection.send(response)
+            trace.sent(io)
+            trace.finish(outcome_of(response), written)
             
         except Exception as e:
-            logger.error(f"Request handling error: {e}")
+            request = request if isinstance(request, dict) else {}
+            params = request.get("params") if isinstance(request.get("params"), dict) else {}
+            logger.error(
+                f"Request handling error: {' '.join(filter(None, [request.get('method'), params.get('name')]))} "
+                f"(id {request.get('id')!r}, {len(line)} bytes) failed in {trace.stage} after "
+                f"{trace.elapsed_ms:.1f} ms: {type(e).__name__}: {e}",
+                exc_info=True
+            )
+            error = f"{type(e).__name__}: {e}"
             error_response = {
                 "jsonrpc": "2.0",
-                "id": request.get("id") if 'request' in locals() else None,
+                "id": request.get("id"),
                 "error": {
                     "code": -32603,
                     "message": "Internal error"
                 }
             }
-            print(json.dumps(error_response))
-            sys.stdout.flush()
+            try:
+                written, _ = connection.send(error_response)
+            except OSError as send_error:
+                # The client has gone away
+                logger.error(f"Could not send error response: {send_error}")
+                trace.finish("internal_error", error=error)
+                break
+            trace.finish("internal_error", written, error)
 
 if __name__ == "__main__":
     main()
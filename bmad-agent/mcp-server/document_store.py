@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Content-addressed document store for the BMAD MCP server
+
+Task, checklist and template bodies exist as individual files under
+bmad-agent/, again as sections of the web-build-sample/*.txt bundles, and
+partly again under .project/templates. The store keeps every unique body
+exactly once, keyed by its SHA-256 digest, and maps each file path and
+bundle section onto that digest.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SECTION_PATTERN = re.compile(
+    r'^==================== START: (.+?) ====================\n(.*?)\n'
+    r'==================== END: \1 ====================$',
+    re.MULTILINE | re.DOTALL
+)
+
+def normalize_body(body: str) -> str:
+    """Normalise a document body so file and bundle copies hash alike"""
+    return body if body.endswith('\n') else body + '\n'
+
+def content_digest(body: str) -> str:
+    """Return the content address of a (normalised) document body"""
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+class DocumentStore:
+    """Deduplicating blob store with path and bundle-section references
+
+    References are plain strings: a filesystem path for individual files, or
+    ``<bundle path>#section`` for bundle sections, so several projects can
+    share one store without their references colliding.
+    """
+
+    def __init__(self):
+        self._blobs: Dict[str, str] = {}
+        self._refcounts: Dict[str, int] = {}
+        self._refs: Dict[str, str] = {}
+        self._stats: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.RLock()
+
+    def put(self, body: str) -> str:
+        """Intern a body and return its digest (does not add a reference)"""
+        body = normalize_body(body)
+        digest = content_digest(body)
+        with self._lock:
+            if digest not in self._blobs:
+                self._blobs[digest] = body
+                self._refcounts[digest] = 0
+        return digest
+
+    def bind(self, reference: str, body: str) -> str:
+        """Point a reference at a body, releasing whatever it pointed at"""
+        digest = self.put(body)
+        with self._lock:
+            previous = self._refs.get(reference)
+            if previous == digest:
+                return digest
+            self._refs[reference] = digest
+            self._refcounts[digest] += 1
+            if previous is not None:
+                self._release(previous)
+        return digest
+
+    def unbind(self, reference: str):
+        """Drop a reference and free its blob if nothing else uses it"""
+        with self._lock:
+            digest = self._refs.pop(reference, None)
+            self._stats.pop(reference, None)
+            if digest is not None:
+                self._release(digest)
+
+    def _release(self, digest: str):
+        self._refcounts[digest] -= 1
+        if self._refcounts[digest] <= 0:
+            del self._refcounts[digest]
+            del self._blobs[digest]
+
+    def load_file(self, path) -> Optional[str]:
+        """Bind a file's current content, re-reading only when it changed"""
+        path = Path(path).resolve()
+        reference = str(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            self.unbind(reference)
+            return None
+
+        signature = (stat.st_mtime, stat.st_size)
+        with self._lock:
+            if self._stats.get(reference) == signature and reference in self._refs:
+                return self._refs[reference]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            body = f.read()
+        digest = self.bind(reference, body)
+        with self._lock:
+            self._stats[reference] = signature
+        return digest
+
+    def load_directory(self, directory, patterns: Iterable[str] = ("*.md", "*.txt", "*.yml")) -> int:
+        """Bind every matching file below a directory, returning the count"""
+        directory = Path(directory)
+        if not directory.is_dir():
+            return 0
+        count = 0
+        for pattern in patterns:
+            for path in directory.rglob(pattern):
+                if path.is_file() and self.load_file(path):
+                    count += 1
+        return count
+
+    def load_bundle(self, bundle_path) -> int:
+        """Bind each START/END section of a web bundle as ``<bundle path>#section``"""
+        bundle_path = Path(bundle_path).resolve()
+        reference = str(bundle_path)
+        try:
+            stat = bundle_path.stat()
+        except OSError:
+            return 0
+
+        signature = (stat.st_mtime, stat.st_size)
+        prefix = reference + "#"
+        with self._lock:
+            if self._stats.get(reference) == signature:
+                return sum(1 for ref in self._refs if ref.startswith(prefix))
+
+        with open(bundle_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        seen = set()
+        for match in SECTION_PATTERN.finditer(content):
+            name, body = match.groups()
+            self.bind(prefix + name, body)
+            seen.add(prefix + name)
+
+        with self._lock:
+            stale = [ref for ref in self._refs if ref.startswith(prefix) and ref not in seen]
+            self._stats[reference] = signature
+        for ref in stale:
+            self.unbind(ref)
+        return len(seen)
+
+    def digest_of(self, reference: str) -> Optional[str]:
+        """Return the digest a reference currently points at"""
+        with self._lock:
+            return self._refs.get(reference)
+
+    def get(self, reference: str) -> Optional[str]:
+        """Return the body behind a reference"""
+        with self._lock:
+            digest = self._refs.get(reference)
+            return self._blobs.get(digest) if digest else None
+
+    def get_blob(self, digest: str) -> Optional[str]:
+        """Return a body by its digest"""
+        with self._lock:
+            return self._blobs.get(digest)
+
+    def references(self, digest: str) -> List[str]:
+        """Return every reference sharing a body"""
+        with self._lock:
+            return sorted(ref for ref, value in self._refs.items() if value == digest)
+
+    def stats(self) -> Dict[str, int]:
+        """Summarise how much duplication the store is absorbing"""
+        with self._lock:
+            unique_bytes = sum(len(body.encode('utf-8')) for body in self._blobs.values())
+            referenced_bytes = sum(
+                len(self._blobs[digest].encode('utf-8')) for digest in self._refs.values()
+            )
+            return {
+                "references": len(self._refs),
+                "unique_documents": len(self._blobs),
+                "unique_bytes": unique_bytes,
+                "referenced_bytes": referenced_bytes,
+            }
+
+_shared_store: Optional[DocumentStore] = None
+_shared_lock = threading.Lock()
+
+def shared_store() -> DocumentStore:
+    """Return the process-wide store shared by every server instance"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = DocumentStore()
+        return _shared_store
+
+def default_sources(bmad_root: Path, project_root: Path) -> Dict[str, List[Path]]:
+    """Return the directories and bundles the MCP server indexes"""
+    bundle_dir = Path(os.getenv('BMAD_WEB_BUILD_DIR', str(project_root / "web-build-sample")))
+    return {
+        "directories": [
+            bmad_root / name for name in ("personas", "tasks", "templates", "checklists", "data")
+        ] + [project_root / ".project" / "templates"],
+        "bundles": sorted(bundle_dir.glob("*.txt")) if bundle_dir.is_dir() else [],
+    }
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Slow-request flight recorder for the BMAD MCP server
+
+Keeps a fixed-size ring buffer of the most recent requests: method, tool,
+argument sizes, time per stage (parse, dispatch, encode, io) and outcome.
+Recording costs a few clock reads and one small dict per request. Requests
+slower than a threshold are also appended to a compact JSON Lines trace
+file, with their params, so an intermittent latency spike can be examined
+after the fact and replayed with .project/scripts/benchmark.py --replay.
+
+Settings (environment):
+    BMAD_FLIGHT_RECORDER_SIZE  entries kept in memory (default 256)
+    BMAD_SLOW_REQUEST_MS       persist requests slower than this (default 500)
+    BMAD_TRACE_PATH            trace file (default .project/.mcp-trace.jsonl)
+"""
+
+import json
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+DEFAULT_CAPACITY = 256
+DEFAULT_THRESHOLD_MS = 500.0
+# The trace file is rotated to <name>.1 when it grows past this
+MAX_TRACE_BYTES = 5 * 1024 * 1024
+
+def argument_sizes(args: Any) -> Dict[str, int]:
+    """Return the length of each argument: characters for strings, items for collections"""
+    if not isinstance(args, dict):
+        return {}
+    return {
+        name: len(value) if isinstance(value, (str, list, dict)) else 0
+        for name, value in args.items()
+    }
+
+class RequestTrace:
+    """Timings of one request as it moves through the server's stages"""
+
+    __slots__ = ("recorder", "started", "last", "request_bytes", "request", "stages")
+
+    def __init__(self, recorder: "FlightRecorder", request_bytes: int):
+        self.recorder = recorder
+        self.started = self.last = time.perf_counter()
+        self.request_bytes = request_bytes
+        self.request: Optional[Dict[str, Any]] = None
+        self.stages: Dict[str, float] = {}
+
+    def mark(self, stage: str):
+        """Charge the time since the previous mark to a stage"""
+        now = time.perf_counter()
+        self.stages[stage] = (now - self.last) * 1000
+        self.last = now
+
+    def sent(self, io_seconds: float):
+        """Split the time since dispatch into encoding and stdout writes"""
+        now = time.perf_counter()
+        io_ms = io_seconds * 1000
+        self.stages["encode"] = max((now - self.last) * 1000 - io_ms, 0.0)
+        self.stages["io"] = io_ms
+        self.last = now
+
+    @property
+    def stage(self) -> str:
+        """The stage in progress: the first one not timed yet"""
+        for stage in ("parse", "dispatch", "encode"):
+            if stage not in self.stages:
+                return stage
+        return "done"
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def finish(self, outcome: str, response_bytes: int = 0, error: Optional[str] = None) -> Dict[str, Any]:
+        return self.recorder.record(self, outcome, response_bytes, error)
+
+class FlightRecorder:
+    """Ring buffer of recent requests, persisting the slow ones"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, threshold_ms: float = DEFAULT_THRESHOLD_MS,
+                 trace_path: Optional[Path] = None, max_trace_bytes: int = MAX_TRACE_BYTES):
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=max(capacity, 1))
+        self.threshold_ms = threshold_ms
+        self.trace_path = Path(trace_path) if trace_path else None
+        self.max_trace_bytes = max_trace_bytes
+        self.recorded = 0
+        self.persisted = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, project_root: Path) -> "FlightRecorder":
+        project_dir = Path(project_root) / ".project"
+        default_trace = (project_dir if project_dir.is_dir() else Path(tempfile.gettempdir())) / ".mcp-trace.jsonl"
+        try:
+            capacity = int(os.getenv('BMAD_FLIGHT_RECORDER_SIZE', DEFAULT_CAPACITY))
+            threshold_ms = float(os.getenv('BMAD_SLOW_REQUEST_MS', DEFAULT_THRESHOLD_MS))
+        except ValueError as e:
+            logger.warning(f"Invalid flight recorder setting, using defaults: {e}")
+            capacity, threshold_ms = DEFAULT_CAPACITY, DEFAULT_THRESHOLD_MS
+        return cls(capacity, threshold_ms, Path(os.getenv('BMAD_TRACE_PATH', str(default_trace))))
+
+    def start(self, request_bytes: int) -> RequestTrace:
+        return RequestTrace(self, request_bytes)
+
+    def record(self, trace: RequestTrace, outcome: str, response_bytes: int = 0,
+               error: Optional[str] = None) -> Dict[str, Any]:
+        request = trace.request if isinstance(trace.request, dict) else {}
+        params = request.get("params")
+        params = params if isinstance(params, dict) else {}
+        entry = {
+            "at": time.time(),
+            "id": request.get("id"),
+            "method": request.get("method"),
+            "tool": params.get("name") if request.get("method") == "tools/call" else None,
+            "request_bytes": trace.request_bytes,
+            "arg_sizes": argument_sizes(params.get("arguments")),
+            "stages": {stage: round(ms, 3) for stage, ms in trace.stages.items()},
+            "total_ms": round(trace.elapsed_ms, 3),
+            "outcome": outcome,
+            "response_bytes": response_bytes,
+        }
+        if error:
+            entry["error"] = error
+        with self.lock:
+            self.entries.append(entry)
+            self.recorded += 1
+        if entry["total_ms"] >= self.threshold_ms:
+            stages = ", ".join(f"{stage} {ms:.1f}" for stage, ms in entry["stages"].items())
+            logger.warning(f"Slow request: {entry['method']} {entry['tool'] or ''} took "
+                           f"{entry['total_ms']:.1f} ms ({stages})")
+            self.persist(entry, request)
+        return entry
+
+    def persist(self, entry: Dict[str, Any], request: Dict[str, Any]):
+        """Append a slow request, with what is needed to replay it, to the trace file"""
+        if self.trace_path is None:
+            return
+        line = json.dumps({"v": TRACE_VERSION, **entry, "params": request.get("params")},
+                          separators=(",", ":"), ensure_ascii=False, default=str)
+        with self.lock:
+            try:
+                if self.trace_path.exists() and self.trace_path.stat().st_size > self.max_trace_bytes:
+                    os.replace(self.trace_path, self.trace_path.with_name(self.trace_path.name + ".1"))
+                with open(self.trace_path, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+                self.persisted += 1
+            except OSError as e:
+                logger.warning(f"Could not write request trace {self.trace_path}: {e}")
+
+    def snapshot(self, slow_only: bool = False, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Return recent entries (newest last) and latency statistics over the buffer"""
+        with self.lock:
+            entries = list(self.entries)
+        totals = sorted(entry["total_ms"] for entry in entries)
+        if slow_only:
+            entries = [entry for entry in entries if entry["total_ms"] >= self.threshold_ms]
+        if limit is not None:
+            entries = entries[-limit:] if limit > 0 else []
+        stats: Dict[str, Any] = {"requests": len(totals)}
+        if totals:
+            stats.update({
+                "p50_ms": round(statistics.median(totals), 3),
+                "p95_ms": round(totals[min(len(totals) - 1, int(len(totals) * 0.95))], 3),
+                "max_ms": round(totals[-1], 3),
+            })
+        return {
+            "entries": entries,
+            "stats": stats,
+            "threshold_ms": self.threshold_ms,
+            "recorded": self.recorded,
+            "persisted": self.persisted,
+            "trace_path": str(self.trace_path) if self.trace_path else None,
+        }
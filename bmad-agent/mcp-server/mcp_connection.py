@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Per-connection MCP protocol state and response encoding for the BMAD MCP server
+
+The protocol version is negotiated in ``initialize``. Every client gets a
+tool result as one compact JSON text block; clients on a version with
+structured tool output (2025-06-18 and later) also get it as
+``structuredContent``, as the specification recommends. Setting
+BMAD_MCP_STRUCTURED_ONLY=1 drops the text copy for structured clients, to
+halve large payloads when every client reads structuredContent. Responses are
+encoded incrementally and written to stdout in chunks, so a large result is
+never held as one extra string.
+
+A tools/call carrying ``params._meta.progressToken`` gets
+``notifications/progress`` while it runs. Clients that declare the
+experimental ``bmad/partialResults`` capability also receive finished
+pieces of the result in each notification's ``_meta``, so they can use
+early output before the final response arrives.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# Oldest first; the last entry is offered to clients asking for an unknown version
+SUPPORTED_VERSIONS = ["2024-11-05", "2025-03-26", "2025-06-18"]
+STRUCTURED_CONTENT_VERSION = "2025-06-18"
+PROGRESS_MESSAGE_VERSION = "2025-03-26"
+PARTIAL_RESULTS_CAPABILITY = "bmad/partialResults"
+# Plain progress updates closer together than this are dropped; partial results never are
+PROGRESS_INTERVAL = 0.1
+CHUNK_SIZE = 64 * 1024
+
+SERVER_INFO = {"name": "bmad-mcp-server", "version": "1.0.0"}
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+def compact_json(value: Any) -> str:
+    """Encode without indentation or \\u escapes of non-ASCII text"""
+    return _encoder.encode(value)
+
+class Progress:
+    """Reports progress of one tools/call; does nothing without a progress token"""
+
+    def __init__(self, connection: Optional["Connection"] = None, token: Any = None):
+        self.connection = connection
+        self.token = token
+        self.last_sent = 0.0
+        self.last_progress = None
+        self.sent = 0
+
+    @property
+    def active(self) -> bool:
+        return self.connection is not None and self.token is not None
+
+    @property
+    def wants_partial(self) -> bool:
+        """True if partial results would reach the client, so callers can skip building them"""
+        return self.active and self.connection.partial_results
+
+    def update(self, progress: float, total: Optional[float] = None, message: Optional[str] = None,
+               partial: Optional[Dict[str, Any]] = None):
+        """Send a progress notification, with a partial result if the client accepts them"""
+        if not self.active:
+            return
+        # Progress must increase with every notification
+        if self.last_progress is not None and progress <= self.last_progress:
+            return
+        partial = partial if self.connection.partial_results else None
+        now = time.monotonic()
+        final = total is not None and progress >= total
+        if partial is None and not final and now - self.last_sent < PROGRESS_INTERVAL:
+            return
+
+        version = self.connection.protocol_version
+        params: Dict[str, Any] = {"progressToken": self.token, "progress": progress}
+        if total is not None:
+            params["total"] = total
+        if message and version is not None and version >= PROGRESS_MESSAGE_VERSION:
+            params["message"] = message
+        if partial is not None:
+            params["_meta"] = {PARTIAL_RESULTS_CAPABILITY: partial}
+        self.connection.send({"jsonrpc": "2.0", "method": "notifications/progress", "params": params})
+        self.last_sent = now
+        self.last_progress = progress
+        self.sent += 1
+
+class Connection:
+    """One client connection: negotiated protocol version and the output stream"""
+
+    def __init__(self, stream=None, chunk_size: int = CHUNK_SIZE, structured_only: Optional[bool] = None):
+        self.stream = stream or sys.stdout.buffer
+        self.chunk_size = chunk_size
+        if structured_only is None:
+            structured_only = os.getenv('BMAD_MCP_STRUCTURED_ONLY', '').lower() in ('1', 'true', 'yes')
+        self.structured_only = structured_only
+        self.protocol_version: Optional[str] = None
+        self.client_info: Dict[str, Any] = {}
+        self.partial_results = False
+        self.lock = threading.Lock()
+        self.bytes_written = 0
+
+    @property
+    def structured(self) -> bool:
+        """True if the client understands structuredContent"""
+        # Dated versions compare correctly as strings
+        return self.protocol_version is not None and self.protocol_version >= STRUCTURED_CONTENT_VERSION
+
+    def initialize(self, params: Dict[str, Any], capabilities: Dict[str, Any]) -> Dict[str, Any]:
+        """Negotiate the protocol version and return the initialize result"""
+        requested = params.get("protocolVersion")
+        self.protocol_version = requested if requested in SUPPORTED_VERSIONS else SUPPORTED_VERSIONS[-1]
+        self.client_info = params.get("clientInfo") or {}
+        experimental = (params.get("capabilities") or {}).get("experimental") or {}
+        self.partial_results = PARTIAL_RESULTS_CAPABILITY in experimental
+        return {
+            "protocolVersion": self.protocol_version,
+            "capabilities": capabilities,
+            "serverInfo": SERVER_INFO,
+        }
+
+    def progress(self, params: Dict[str, Any]) -> Progress:
+        """Return the progress reporter for a request's params"""
+        meta = params.get("_meta") or {}
+        return Progress(self, meta.get("progressToken"))
+
+    def tool_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Wrap a tool's result dict as a CallToolResult for this client"""
+        failed = isinstance(result, dict) and "error" in result
+        response: Dict[str, Any] = {}
+        if self.structured and self.structured_only:
+            # Errors keep a text block: clients show it to the model even when they ignore structured output
+            response["content"] = [{"type": "text", "text": str(result["error"])}] if failed else []
+        else:
+            # Hosts that only forward content to the model still see the whole result
+            response["content"] = [{"type": "text", "text": compact_json(result)}]
+        if self.structured:
+            response["structuredContent"] = result
+        if failed:
+            response["isError"] = True
+        return response
+
+    def send(self, message: Dict[str, Any]) -> Tuple[int, float]:
+        """Write one JSON-RPC message as a line, encoding and writing it in chunks
+
+        Returns the bytes written and the seconds spent writing them, as
+        opposed to encoding.
+        """
+        pending = []
+        size = 0
+        written = 0
+        io = 0.0
+        with self.lock:
+            for piece in _encoder.iterencode(message):
+                pending.append(piece)
+                size += len(piece)
+                if size >= self.chunk_size:
+                    data = "".join(pending).encode('utf-8')
+                    began = time.perf_counter()
+                    self.stream.write(data)
+                    io += time.perf_counter() - began
+                    written += len(data)
+                    pending = []
+                    size = 0
+            pending.append("\n")
+            data = "".join(pending).encode('utf-8')
+            began = time.perf_counter()
+            self.stream.write(data)
+            self.stream.flush()
+            io += time.perf_counter() - began
+            written += len(data)
+            self.bytes_written += written
+        return written, io
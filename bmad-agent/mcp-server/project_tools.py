@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+.project task and memory bank tools for the BMAD MCP server
+
+Serves the project's .project/tasks and memory bank (core, plans, status,
+task-logs, knowledge) from an in-memory model kept warm inside the
+long-running server, so agents query, create and move tasks without
+spawning manage-tasks.py. The model is the one the project daemon uses
+(.project/scripts/project_daemon.py); a watcher thread refreshes it when
+files change, re-reading only files whose mtime or size differ.
+"""
+
+import importlib
+import logging
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds between rescans without watchdog; with it, a slow safety rescan
+POLL_INTERVAL = 1.0
+SAFETY_INTERVAL = 30.0
+
+TASK_FIELDS = ["priority", "status", "assigned_to", "module"]
+
+def load_project_scripts(project_dir: Path) -> Dict[str, Any]:
+    """Import the shared modules from <project>/.project/scripts"""
+    scripts_dir = str(project_dir / "scripts")
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    return {
+        name: importlib.import_module(name)
+        for name in ("project_daemon", "task_index", "task_ops", "task_rollup")
+    }
+
+class ProjectWatcher:
+    """Refreshes a ProjectState when files under .project change
+
+    With watchdog installed, filesystem events wake the refresh thread;
+    otherwise it rescans every POLL_INTERVAL seconds. Either way a refresh
+    only re-reads changed files.
+    """
+
+    def __init__(self, state, project_dir: Path):
+        self.state = state
+        self.project_dir = project_dir
+        self.changed = threading.Event()
+        self.stopping = threading.Event()
+        self.observer = None
+        self.refreshes = 0
+
+    def start(self):
+        interval = POLL_INTERVAL
+        if Observer is not None:
+            watcher = self
+
+            class Handler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    # Atomic writes go through hidden temp files: look at both ends of a rename
+                    paths = [event.src_path, getattr(event, "dest_path", "")]
+                    if any(path and not Path(path).name.startswith(".") for path in paths):
+                        watcher.changed.set()
+
+            self.observer = Observer()
+            self.observer.schedule(Handler(), str(self.project_dir), recursive=True)
+            self.observer.daemon = True
+            self.observer.start()
+            interval = SAFETY_INTERVAL
+        threading.Thread(target=self._run, args=(interval,), daemon=True).start()
+        return self
+
+    def _run(self, interval: float):
+        while not self.stopping.is_set():
+            self.changed.wait(interval)
+            self.changed.clear()
+            try:
+                self.state.refresh()
+                self.refreshes += 1
+            except Exception as e:
+                logger.warning(f"Project refresh failed: {e}")
+
+    def stop(self):
+        self.stopping.set()
+        self.changed.set()
+        if self.observer is not None:
+            self.observer.stop()
+
+class ProjectTools:
+    """MCP tools over one project's .project directory"""
+
+    def __init__(self, project_root: Path, documents):
+        self.project_dir = Path(project_root).resolve() / ".project"
+        self.documents = documents
+        self.modules = load_project_scripts(self.project_dir)
+        daemon = self.modules["project_daemon"]
+        self.areas = list(daemon.WATCHED_AREAS)
+        self.states = list(self.modules["task_index"].TASK_STATES)
+        self.tasks_root = self.project_dir / "tasks"
+        self.state = daemon.ProjectState(self.project_dir).refresh()
+        self.rollup = self.modules["task_rollup"].TaskRollup(
+            self.project_dir / "status", self.project_dir / "plans"
+        ).attach(self.state.tasks)
+        self.watcher = ProjectWatcher(self.state, self.project_dir).start()
+
+    @classmethod
+    def create(cls, project_root: Path, documents) -> Optional["ProjectTools"]:
+        """Return the tools for a project, or None if it has no .project/tasks"""
+        if not (Path(project_root) / ".project" / "tasks").is_dir():
+            return None
+        try:
+            return cls(project_root, documents)
+        except Exception as e:
+            logger.warning(f"Project tools unavailable: {e}")
+            return None
+
+    def get_tools(self) -> List[Dict[str, Any]]:
+        """Return the MCP tool definitions"""
+        task_filters = {
+            field: {"type": "string", "description": f"Only tasks with this {field.replace('_', ' ')}"}
+            for field in TASK_FIELDS
+        }
+        return [
+            {
+                "name": "list_project_tasks",
+                "description": "List .project tasks from the in-memory task index, filtered and sorted",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "state": {"type": "string", "enum": self.states},
+                        **task_filters,
+                        "sort_by": {
+                            "type": "string",
+                            "description": "filename (default), priority, due_date, title, status or module"
+                        },
+                        "limit": {"type": "integer", "description": "Return at most this many tasks"},
+                        "refresh": {
+                            "type": "boolean",
+                            "description": "Rescan the task directories first instead of relying on the watcher"
+                        }
+                    },
+                    "required": []
+                }
+            },
+            {
+                "name": "get_project_task",
+                "description": "Read a .project task by filename or task ID",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "task": {"type": "string", "description": "Task filename or ID (e.g., 'task-01J...')"}
+                    },
+                    "required": ["task"]
+                }
+            },
+            {
+                "name": "create_project_task",
+                "description": "Create a .project task from the task template",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "description": {"type": "string"},
+                        "priority": {"type": "string", "enum": ["High", "Medium", "Low"]},
+                        "estimated_time": {"type": "string", "description": "e.g., '3h', '2d'"},
+                        "assigned_to": {"type": "string"},
+                        "due_date": {"type": "string", "description": "YYYY-MM-DD or N/A"},
+                        "state": {"type": "string", "enum": self.states},
+                        "depends_on": {"type": "string", "description": "Comma-separated task IDs or None"},
+                        "module": {"type": "string"}
+                    },
+                    "required": ["title"]
+                }
+            },
+            {
+                "name": "move_project_task",
+                "description": "Move a .project task to another state (moving to completed marks it completed)",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "task": {"type": "string", "description": "Task filename or ID"},
+                        "to": {"type": "string", "enum": self.states}
+                    },
+                    "required": ["task", "to"]
+                }
+            },
+            {
+                "name": "list_project_files",
+                "description": "List the Markdown files of a .project area with their titles",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "area": {"type": "string", "enum": self.areas}
+                    },
+                    "required": ["area"]
+                }
+            },
+            {
+                "name": "read_project_file",
+                "description": "Read a .project memory bank file, e.g. 'core/activeContext.md' or 'memory-index.md'",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "path": {"type": "string", "description": "Path relative to .project/"}
+                    },
+                    "required": ["path"]
+                }
+            },
+        ]
+
+    def handles(self, name: str) -> bool:
+        return name in ("list_project_tasks", "get_project_task", "create_project_task",
+                        "move_project_task", "list_project_files", "read_project_file")
+
+    def execute_tool(self, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        if name == "list_project_tasks":
+            return self.list_tasks(**args)
+        elif name == "get_project_task":
+            return self.get_task(args["task"])
+        elif name == "create_project_task":
+            return self.create_task(**args)
+        elif name == "move_project_task":
+            return self.move_task(args["task"], args["to"])
+        elif name == "list_project_files":
+            return self.list_files(args["area"])
+        elif name == "read_project_file":
+            return self.read_file(args["path"])
+        return {"error": f"Unknown tool: {name}"}
+
+    def list_tasks(self, state: Optional[str] = None, sort_by: str = "filename", limit: Optional[int] = None,
+                   refresh: bool = False, module: Optional[str] = None, **filters) -> Dict[str, Any]:
+        """List tasks from the warm index; filters match case-insensitively"""
+        if state and state not in self.states:
+            return {"error": f"Unknown task state '{state}'"}
+        with self.state.lock:
+            if refresh:
+                self.state.tasks.refresh()
+            tasks = self.state.tasks.query(state=state, sort_by=sort_by, **filters)
+        if module:
+            tasks = [entry for entry in tasks if (entry.get("module") or "").lower() == module.lower()]
+        total = len(tasks)
+        if limit is not None:
+            tasks = tasks[:limit]
+        return {"tasks": tasks, "total_count": total}
+
+    def _find(self, task: str) -> Optional[Dict[str, Any]]:
+        task = task.strip()
+        with self.state.lock:
+            entry = self.state.tasks.find(task if task.endswith(".md") else task + ".md")
+            if entry is None:
+                entry = next((e for e in self.state.tasks.entries.values() if e.get("id") == task), None)
+        return entry
+
+    def get_task(self, task: str) -> Dict[str, Any]:
+        entry = self._find(task)
+        if entry is None:
+            return {"error": f"Task '{task}' not found"}
+        path = self.tasks_root / entry["state"] / entry["filename"]
+        digest = self.documents.load_file(path)
+        if digest is None:
+            return {"error": f"Task '{task}' no longer exists"}
+        return {"task": entry, "path": str(path), "content": self.documents.get_blob(digest)}
+
+    def create_task(self, title: str, description: str = "", priority: str = "Medium", estimated_time: str = "TBD",
+                    assigned_to: str = "Self", due_date: str = "N/A", state: str = "active",
+                    depends_on: str = "None", module: str = "N/A") -> Dict[str, Any]:
+        task_ops = self.modules["task_ops"]
+        if not title.strip():
+            return {"error": "A task title is required"}
+        if state not in self.states:
+            return {"error": f"Unknown task state '{state}'"}
+        template = task_ops.load_task_template(self.project_dir / "templates" / "task-template.md")
+        with self.state.lock:
+            path = task_ops.create_task_file(
+                title.strip(), description, priority, estimated_time, assigned_to, due_date,
+                state=state, template=template, index=self.state.tasks, depends_on=depends_on,
+                module=module, tasks_root=self.tasks_root,
+            )
+            self.rollup.publish()
+            entry = self.state.tasks.find(path.name)
+        return {"created": entry, "path": str(path)}
+
+    def move_task(self, task: str, to: str) -> Dict[str, Any]:
+        task_ops = self.modules["task_ops"]
+        if to not in self.states:
+            return {"error": f"Unknown task state '{to}'"}
+        entry = self._find(task)
+        if entry is None:
+            return {"error": f"Task '{task}' not found"}
+        with self.state.lock:
+            try:
+                previous, path = task_ops.move_indexed_task(self.tasks_root, entry["filename"], to, self.state.tasks)
+            except task_ops.TaskMoveError as e:
+                return {"error": str(e)}
+            self.rollup.publish()
+            moved = self.state.tasks.find(path.name)
+        return {"moved": moved, "from": previous, "to": to, "path": str(path)}
+
+    def list_files(self, area: str) -> Dict[str, Any]:
+        try:
+            files = self.state.list_files(area)
+        except ValueError as e:
+            return {"error": str(e)}
+        return {"area": area, "files": files, "total_count": len(files)}
+
+    def read_file(self, path: str) -> Dict[str, Any]:
+        """Read a Markdown file below .project/, served from the document store"""
+        candidate = (self.project_dir / path).resolve()
+        if self.project_dir not in candidate.parents or candidate.suffix != ".md" or not candidate.is_file():
+            return {"error": f"Project file '{path}' not found"}
+        digest = self.documents.load_file(candidate)
+        if digest is None:
+            return {"error": f"Project file '{path}' not found"}
+        return {
+            "path": candidate.relative_to(self.project_dir).as_posix(),
+            "content": self.documents.get_blob(digest),
+            "content_hash": digest,
+        }
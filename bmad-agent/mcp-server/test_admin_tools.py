@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for the admin profiling tools
+"""
+
+import time
+
+from admin_tools import AdminTools
+
+def busy(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+def test_sampling_profile_is_written(tmp_path):
+    admin = AdminTools()
+    output = tmp_path / "profile.collapsed"
+    started = admin.execute_tool("start_server_profiling", {"duration": 60, "interval_ms": 1, "output": str(output)})
+    assert started["status"] == "profiling"
+    busy(0.1)
+    result = admin.execute_tool("stop_server_profiling", {})
+    assert "error" not in result
+    assert result["samples"] > 0
+    assert any("busy" in row["function"] for row in result["top_self"])
+    assert output.read_text(encoding='utf-8').strip()
+
+def test_failed_write_finishes_the_session(tmp_path):
+    admin = AdminTools()
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("", encoding='utf-8')
+    admin.execute_tool("start_server_profiling", {"mode": "cprofile", "output": str(blocker / "out.prof")})
+    busy(0.01)
+    result = admin.execute_tool("stop_server_profiling", {})
+    assert result["error"].startswith("Failed to write profile")
+    assert result["total_calls"] > 0
+
+    restarted = admin.execute_tool("start_server_profiling", {"mode": "cprofile", "output": str(tmp_path / "out.prof")})
+    assert restarted["status"] == "profiling"
+    assert "error" not in admin.execute_tool("stop_server_profiling", {})
+    assert (tmp_path / "out.prof").exists()
+
+def test_invalid_arguments_are_reported():
+    admin = AdminTools()
+    assert admin.execute_tool("start_server_profiling", {"duration": "5"}) == {
+        "error": "duration must be a number, not str"
+    }
+    assert admin.execute_tool("start_server_profiling", {"seconds": 5})["error"].startswith("Unknown argument(s): seconds")
+    assert admin.execute_tool("start_server_profiling", {"all_threads": "yes"})["error"] == (
+        "all_threads must be a boolean, not str"
+    )
+    assert admin.execute_tool("start_server_profiling", {"mode": "trace"})["error"] == "Unknown profiling mode 'trace'"
+    assert admin.session is None
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed document store
+"""
+
+from pathlib import Path
+
+from document_store import DocumentStore, shared_store
+from web_bundler import WebBundler
+
+def test_file_and_bundle_copies_share_one_blob(tmp_path):
+    tasks = tmp_path / "src" / "tasks"
+    tasks.mkdir(parents=True)
+    (tasks / "review.md").write_text("# Review\n\nCheck everything.", encoding='utf-8')
+    (tasks / "ship.md").write_text("# Ship\n\nRelease it.\n", encoding='utf-8')
+    WebBundler(tmp_path / "src", tmp_path / "out", ["tasks"]).build()
+
+    store = DocumentStore()
+    assert store.load_directory(tasks) == 2
+    assert store.load_bundle(tmp_path / "out" / "tasks.txt") == 2
+
+    digest = store.digest_of(str((tasks / "review.md").resolve()))
+    bundle_ref = f"{(tmp_path / 'out' / 'tasks.txt').resolve()}#review"
+    assert store.digest_of(bundle_ref) == digest
+    assert store.references(digest) == sorted([str((tasks / "review.md").resolve()), bundle_ref])
+    stats = store.stats()
+    assert stats["references"] == 4
+    assert stats["unique_documents"] == 2
+    assert stats["referenced_bytes"] == 2 * stats["unique_bytes"]
+
+def test_blob_is_freed_with_its_last_reference():
+    store = DocumentStore()
+    digest = store.bind("a", "shared body")
+    assert store.bind("b", "shared body\n") == digest
+    store.unbind("a")
+    assert store.get_blob(digest) == "shared body\n"
+
+    store.bind("b", "new body")
+    assert store.get_blob(digest) is None
+    assert store.get("b") == "new body\n"
+    assert store.stats()["unique_documents"] == 1
+
+def test_changed_file_rebinds_and_releases_old_content(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("first\n", encoding='utf-8')
+    store = DocumentStore()
+    first = store.load_file(path)
+    assert store.load_file(path) == first
+
+    path.write_text("second version\n", encoding='utf-8')
+    second = store.load_file(path)
+    assert second != first
+    assert store.get_blob(first) is None
+
+    path.unlink()
+    assert store.load_file(path) is None
+    assert store.stats()["references"] == 0
+
+def test_removed_bundle_sections_are_unbound(tmp_path):
+    bundle = tmp_path / "tasks.txt"
+    bundle.write_text(
+        "==================== START: a ====================\nbody a\n"
+        "==================== END: a ====================\n\n\n"
+        "==================== START: b ====================\nbody b\n"
+        "==================== END: b ====================\n\n\n",
+        encoding='utf-8'
+    )
+    store = DocumentStore()
+    assert store.load_bundle(bundle) == 2
+    bundle.write_text(
+        "==================== START: a ====================\nbody a\n"
+        "==================== END: a ====================\n",
+        encoding='utf-8'
+    )
+    assert store.load_bundle(bundle) == 1
+    assert store.get(f"{bundle.resolve()}#b") is None
+
+def test_shared_store_is_one_instance():
+    assert shared_store() is shared_store()
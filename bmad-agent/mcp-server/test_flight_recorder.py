@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the slow-request flight recorder
+"""
+
+import json
+
+from flight_recorder import TRACE_VERSION, FlightRecorder, argument_sizes
+
+def record(recorder, request, outcome="ok", response_bytes=10):
+    trace = recorder.start(len(json.dumps(request)))
+    trace.request = request
+    trace.mark("parse")
+    trace.mark("dispatch")
+    trace.sent(0.0)
+    return trace.finish(outcome, response_bytes)
+
+def tool_call(number, **arguments):
+    return {"jsonrpc": "2.0", "id": number, "method": "tools/call",
+            "params": {"name": "get_document", "arguments": arguments}}
+
+def test_argument_sizes():
+    assert argument_sizes({"text": "abc", "items": [1, 2], "flag": True}) == {"text": 3, "items": 2, "flag": 0}
+    assert argument_sizes(None) == {}
+
+def test_ring_buffer_keeps_the_newest_entries(tmp_path):
+    recorder = FlightRecorder(capacity=3, threshold_ms=10_000, trace_path=tmp_path / "trace.jsonl")
+    for number in range(5):
+        entry = record(recorder, tool_call(number, reference="tasks/review"))
+    assert entry["tool"] == "get_document"
+    assert entry["arg_sizes"] == {"reference": 12}
+    assert set(entry["stages"]) == {"parse", "dispatch", "encode", "io"}
+
+    snapshot = recorder.snapshot()
+    assert [entry["id"] for entry in snapshot["entries"]] == [2, 3, 4]
+    assert snapshot["recorded"] == 5
+    assert snapshot["stats"]["requests"] == 3
+    assert [entry["id"] for entry in recorder.snapshot(limit=1)["entries"]] == [4]
+    assert recorder.snapshot(limit=0)["entries"] == []
+    assert recorder.snapshot(slow_only=True)["entries"] == []
+    assert not (tmp_path / "trace.jsonl").exists()
+
+def test_slow_requests_are_persisted_for_replay(tmp_path):
+    trace_path = tmp_path / "trace.jsonl"
+    recorder = FlightRecorder(threshold_ms=0, trace_path=trace_path)
+    record(recorder, tool_call(1, reference="tasks/review"))
+    record(recorder, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, outcome="error")
+
+    lines = [json.loads(line) for line in trace_path.read_text(encoding='utf-8').splitlines()]
+    assert [line["v"] for line in lines] == [TRACE_VERSION, TRACE_VERSION]
+    assert lines[0]["params"] == {"name": "get_document", "arguments": {"reference": "tasks/review"}}
+    assert lines[1]["method"] == "tools/list" and lines[1]["tool"] is None
+    assert recorder.snapshot(slow_only=True)["persisted"] == 2
+
+def test_trace_file_is_rotated(tmp_path):
+    trace_path = tmp_path / "trace.jsonl"
+    recorder = FlightRecorder(threshold_ms=0, trace_path=trace_path, max_trace_bytes=300)
+    for number in range(10):
+        record(recorder, tool_call(number, reference="x" * 50))
+
+    rotated = tmp_path / "trace.jsonl.1"
+    lines = [line for path in (rotated, trace_path) for line in path.read_text(encoding='utf-8').splitlines()]
+    ids = [json.loads(line)["id"] for line in lines]
+    # Older generations are dropped; what is kept stays in order and ends with the newest
+    assert ids == list(range(ids[0], 10))
+    longest = max(len(line) + 1 for line in lines)
+    for path in (rotated, trace_path):
+        assert path.stat().st_size <= 300 + longest
+
+def test_unwritable_trace_is_logged_not_raised(tmp_path, caplog):
+    recorder = FlightRecorder(threshold_ms=0, trace_path=tmp_path / "missing" / "trace.jsonl")
+    entry = record(recorder, tool_call(1))
+    assert entry["outcome"] == "ok"
+    assert recorder.persisted == 0
+    assert "Could not write request trace" in caplog.text
+
+def test_settings_come_from_the_environment(tmp_path, monkeypatch):
+    (tmp_path / ".project").mkdir()
+    monkeypatch.setenv("BMAD_FLIGHT_RECORDER_SIZE", "4")
+    monkeypatch.setenv("BMAD_SLOW_REQUEST_MS", "25")
+    monkeypatch.delenv("BMAD_TRACE_PATH", raising=False)
+    recorder = FlightRecorder.from_env(tmp_path)
+    assert recorder.entries.maxlen == 4
+    assert recorder.threshold_ms == 25
+    assert recorder.trace_path == tmp_path / ".project" / ".mcp-trace.jsonl"
+
+    monkeypatch.setenv("BMAD_SLOW_REQUEST_MS", "fast")
+    assert FlightRecorder.from_env(tmp_path).threshold_ms == 500
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for MCP protocol negotiation and response encoding
+"""
+
+import io
+import json
+
+import pytest
+
+import mcp_connection
+from mcp_connection import PARTIAL_RESULTS_CAPABILITY, Connection, compact_json
+
+RESULT = {"name": "café", "items": [1, 2, 3]}
+
+def connect(version, structured_only=False, partial_results=False, chunk_size=mcp_connection.CHUNK_SIZE):
+    connection = Connection(io.BytesIO(), chunk_size=chunk_size, structured_only=structured_only)
+    params = {"protocolVersion": version, "clientInfo": {"name": "test"}}
+    if partial_results:
+        params["capabilities"] = {"experimental": {PARTIAL_RESULTS_CAPABILITY: {}}}
+    connection.initialize(params, {"tools": {}})
+    return connection
+
+def sent(connection):
+    return [json.loads(line) for line in connection.stream.getvalue().decode('utf-8').splitlines()]
+
+def test_unknown_version_gets_the_latest():
+    assert connect("1999-01-01").protocol_version == mcp_connection.SUPPORTED_VERSIONS[-1]
+    assert connect("2024-11-05").protocol_version == "2024-11-05"
+
+def test_older_clients_get_one_compact_text_block():
+    result = connect("2025-03-26").tool_result(RESULT)
+    assert result == {"content": [{"type": "text", "text": '{"name":"café","items":[1,2,3]}'}]}
+
+def test_structured_clients_also_get_structured_content():
+    result = connect("2025-06-18").tool_result(RESULT)
+    assert result["structuredContent"] is RESULT
+    assert json.loads(result["content"][0]["text"]) == RESULT
+
+def test_structured_only_drops_the_text_copy():
+    connection = connect("2025-06-18", structured_only=True)
+    assert connection.tool_result(RESULT) == {"content": [], "structuredContent": RESULT}
+    failed = connection.tool_result({"error": "Task not found"})
+    assert failed["content"] == [{"type": "text", "text": "Task not found"}]
+    assert failed["isError"] is True
+    # Clients without structured output always keep the text
+    assert connect("2024-11-05", structured_only=True).tool_result(RESULT)["content"]
+
+def test_errors_are_flagged_for_every_version():
+    for version in mcp_connection.SUPPORTED_VERSIONS:
+        assert connect(version).tool_result({"error": "boom"})["isError"] is True
+
+@pytest.mark.parametrize("chunk_size", [1, 16, mcp_connection.CHUNK_SIZE])
+def test_send_writes_one_compact_line_in_chunks(chunk_size):
+    connection = connect("2025-06-18", chunk_size=chunk_size)
+    message = {"jsonrpc": "2.0", "id": 1, "result": {"text": "ünïcode " * 50}}
+    written, io_seconds = connection.send(message)
+    data = connection.stream.getvalue()
+    assert data == (compact_json(message) + "\n").encode('utf-8')
+    assert written == len(data) == connection.bytes_written
+    assert io_seconds >= 0
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(mcp_connection.time, "monotonic", clock)
+    return clock
+
+def test_progress_needs_a_token():
+    connection = connect("2025-06-18")
+    progress = connection.progress({})
+    assert not progress.active
+    progress.update(1, 2)
+    assert sent(connection) == []
+
+def test_progress_is_throttled_and_monotonic(clock):
+    connection = connect("2025-03-26")
+    progress = connection.progress({"_meta": {"progressToken": "tok"}})
+    progress.update(1, 10, "one")
+    clock.now += mcp_connection.PROGRESS_INTERVAL / 2
+    progress.update(2, 10, "dropped: too soon")
+    clock.now += mcp_connection.PROGRESS_INTERVAL
+    progress.update(2, 10, "two")
+    progress.update(1, 10, "dropped: went backwards")
+    progress.update(10, 10, "final is never throttled")
+
+    notifications = sent(connection)
+    assert [n["params"]["progress"] for n in notifications] == [1, 2, 10]
+    assert notifications[0] == {
+        "jsonrpc": "2.0",
+        "method": "notifications/progress",
+        "params": {"progressToken": "tok", "progress": 1, "total": 10, "message": "one"},
+    }
+    assert progress.sent == 3
+
+def test_progress_message_needs_2025_03_26(clock):
+    connection = connect("2024-11-05")
+    connection.progress({"_meta": {"progressToken": 7}}).update(1, 1, "done")
+    assert sent(connection)[0]["params"] == {"progressToken": 7, "progress": 1, "total": 1}
+
+def test_partial_results_only_reach_clients_that_asked(clock):
+    plain = connect("2025-06-18")
+    progress = plain.progress({"_meta": {"progressToken": "p"}})
+    assert not progress.wants_partial
+    progress.update(1, 3, partial={"piece": 1})
+    progress.update(2, 3, partial={"piece": 2})
+    assert [n["params"].get("_meta") for n in sent(plain)] == [None]
+
+    partial = connect("2025-06-18", partial_results=True)
+    progress = partial.progress({"_meta": {"progressToken": "p"}})
+    assert progress.wants_partial
+    progress.update(1, 3, partial={"piece": 1})
+    # Partial results are never throttled
+    progress.update(2, 3, partial={"piece": 2})
+    assert [n["params"]["_meta"][PARTIAL_RESULTS_CAPABILITY] for n in sent(partial)] == [{"piece": 1}, {"piece": 2}]
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the .project task and memory bank tools
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from document_store import DocumentStore
+from project_tools import ProjectTools
+
+PROJECT_DIR = Path(__file__).resolve().parents[2] / ".project"
+
+@pytest.fixture
+def tools(tmp_path):
+    shutil.copytree(PROJECT_DIR, tmp_path / ".project",
+                    ignore=shutil.ignore_patterns("__pycache__", ".*.json", ".*.jsonl", ".*.lock", ".daemon.*"))
+    for state in ("active", "completed", "backlog"):
+        (tmp_path / ".project" / "tasks" / state).mkdir(parents=True, exist_ok=True)
+    tools = ProjectTools.create(tmp_path, DocumentStore())
+    yield tools
+    tools.watcher.stop()
+
+def test_create_is_none_without_a_task_directory(tmp_path):
+    assert ProjectTools.create(tmp_path, DocumentStore()) is None
+
+def test_created_task_is_listed_read_and_moved(tools):
+    created = tools.execute_tool("create_project_task", {"title": "Write docs", "priority": "High"})
+    task_id = created["created"]["id"]
+    assert Path(created["path"]).parent.name == "active"
+
+    listed = tools.execute_tool("list_project_tasks", {"state": "active", "priority": "high"})
+    assert [entry["id"] for entry in listed["tasks"]] == [task_id]
+    assert "Write docs" in tools.execute_tool("get_project_task", {"task": task_id})["content"]
+
+    moved = tools.execute_tool("move_project_task", {"task": task_id, "to": "completed"})
+    assert (moved["from"], moved["to"]) == ("active", "completed")
+    assert tools.list_tasks(state="active")["total_count"] == 0
+    assert tools.list_tasks(state="completed")["tasks"][0]["id"] == task_id
+
+def test_bad_arguments_return_errors(tools):
+    assert "error" in tools.execute_tool("list_project_tasks", {"state": "archived"})
+    assert "error" in tools.execute_tool("create_project_task", {"title": "  "})
+    assert "error" in tools.execute_tool("get_project_task", {"task": "missing"})
+    assert "error" in tools.execute_tool("move_project_task", {"task": "missing", "to": "completed"})
+    assert "error" in tools.execute_tool("list_project_files", {"area": "secrets"})
+    assert tools.execute_tool("unknown", {}) == {"error": "Unknown tool: unknown"}
+
+def test_read_file_stays_inside_the_project(tools, tmp_path):
+    (tmp_path / "outside.md").write_text("# Outside\n", encoding='utf-8')
+    result = tools.read_file("rules.md")
+    assert result["path"] == "rules.md"
+    assert result["content"] == tools.documents.get_blob(result["content_hash"])
+    assert "error" in tools.read_file("../outside.md")
+    assert "error" in tools.read_file("scripts/task_ops.py")
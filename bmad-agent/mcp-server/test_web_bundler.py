@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental web bundle builder
+"""
+
+import os
+from pathlib import Path
+
+from web_bundler import WebBundler
+
+def make_sources(root: Path):
+    tasks = root / "tasks"
+    tasks.mkdir(parents=True)
+    for name in ("alpha", "beta", "gamma"):
+        (tasks / f"{name}.md").write_text(f"# {name}\n\n{name} body\n", encoding='utf-8')
+    return tasks
+
+def full_build(source: Path, tmp_path: Path) -> bytes:
+    output = tmp_path / "full"
+    WebBundler(source, output, ["tasks"]).build(force=True)
+    return (output / "tasks.txt").read_bytes()
+
+def test_unchanged_sections_are_copied(tmp_path):
+    source = tmp_path / "src"
+    tasks = make_sources(source)
+    output = tmp_path / "out"
+    WebBundler(source, output, ["tasks"]).build()
+
+    assert WebBundler(source, output, ["tasks"]).build()[0]["status"] == "unchanged"
+
+    (tasks / "beta.md").write_text("# beta\n\nrewritten\n", encoding='utf-8')
+    result = WebBundler(source, output, ["tasks"]).build()[0]
+    assert result["status"] == "rebuilt"
+    assert result["changed"] == ["beta"]
+    assert result["copied_sections"] == 2
+    assert (output / "tasks.txt").read_bytes() == full_build(source, tmp_path)
+
+def test_edited_bundle_is_rebuilt_from_sources(tmp_path):
+    source = tmp_path / "src"
+    tasks = make_sources(source)
+    output = tmp_path / "out"
+    WebBundler(source, output, ["tasks"]).build()
+
+    bundle = output / "tasks.txt"
+    bundle.write_bytes(b"hand edited\n" + bundle.read_bytes())
+    (tasks / "gamma.md").write_text("# gamma\n\nrewritten\n", encoding='utf-8')
+    result = WebBundler(source, output, ["tasks"]).build()[0]
+    assert result["copied_sections"] == 0
+    assert bundle.read_bytes() == full_build(source, tmp_path)
+
+def test_same_size_edit_is_detected(tmp_path):
+    source = tmp_path / "src"
+    make_sources(source)
+    output = tmp_path / "out"
+    WebBundler(source, output, ["tasks"]).build()
+
+    bundle = output / "tasks.txt"
+    data = bundle.read_bytes()
+    bundle.write_bytes(data.replace(b"alpha body", b"ALPHA BODY"))
+    stat = bundle.stat()
+    os.utime(bundle, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    result = WebBundler(source, output, ["tasks"]).build()[0]
+    assert result["status"] == "rebuilt"
+    assert bundle.read_bytes() == data
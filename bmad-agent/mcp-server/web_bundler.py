@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Incremental web bundle builder for BMAD agents
+
+Builds the web-build-sample/*.txt bundles from the asset folders under
+bmad-agent/ (personas, tasks, templates, checklists, data). Every source file
+becomes one START/END section. A manifest of per-source hashes and section
+offsets lets a rebuild copy unchanged sections straight out of the previous
+bundle, stream only the changed sources, and leave bundles whose sources did
+not change untouched.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BUNDLE_FOLDERS = ["personas", "tasks", "templates", "checklists", "data"]
+SOURCE_SUFFIXES = {".md", ".txt", ".yml", ".yaml"}
+MANIFEST_NAME = ".bundle-manifest.json"
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 64 * 1024
+
+def section_start(name: str) -> bytes:
+    return f"==================== START: {name} ====================\n".encode('utf-8')
+
+def section_end(name: str) -> bytes:
+    return f"==================== END: {name} ====================\n\n\n".encode('utf-8')
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def collect_sources(folder: Path) -> List[Tuple[str, Path]]:
+    """Return (section name, path) pairs for a bundle, in bundle order
+
+    IDE-only variants (``*.ide.md``) are not part of the web bundles.
+    """
+    sources = []
+    if not folder.is_dir():
+        return sources
+    for path in sorted(folder.iterdir()):
+        if not path.is_file() or path.suffix not in SOURCE_SUFFIXES or ".ide." in path.name:
+            continue
+        sources.append((path.stem, path))
+    return sources
+
+def load_manifest(output_dir: Path) -> Dict[str, Any]:
+    manifest_path = output_dir / MANIFEST_NAME
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "bundles": {}}
+
+def atomic_write_json(path: Path, data: Dict[str, Any]):
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+class WebBundler:
+    def __init__(self, source_root, output_dir, folders: Optional[List[str]] = None):
+        self.source_root = Path(source_root)
+        self.output_dir = Path(output_dir)
+        self.folders = folders or BUNDLE_FOLDERS
+        self.manifest = load_manifest(self.output_dir)
+
+    def _fingerprint(self, name: str, path: Path, previous: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Describe a source, reusing the stored hash when mtime and size match"""
+        stat = path.stat()
+        relative = path.relative_to(self.source_root).as_posix()
+        entry = previous.get(name)
+        if (entry and entry.get("source") == relative
+                and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size):
+            source_hash = entry["hash"]
+        else:
+            source_hash = hash_file(path)
+        return {
+            "name": name,
+            "source": relative,
+            "hash": source_hash,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+
+    def plan(self, bundle: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Return the new section list for a bundle and the names that changed"""
+        previous = {s["name"]: s for s in self.manifest["bundles"].get(bundle, {}).get("sections", [])}
+        sections = [
+            self._fingerprint(name, path, previous)
+            for name, path in collect_sources(self.source_root / bundle)
+        ]
+        changed = [
+            s["name"] for s in sections
+            if s["name"] not in previous or previous[s["name"]]["hash"] != s["hash"]
+        ]
+        return sections, changed
+
+    def _bundle_matches_manifest(self, bundle: str) -> bool:
+        """True if the bundle file is still the one the manifest describes
+
+        A bundle edited, truncated or replaced since the last build no longer
+        has the recorded size and mtime, so its section offsets can't be trusted.
+        """
+        recorded = self.manifest["bundles"].get(bundle)
+        try:
+            stat = (self.output_dir / f"{bundle}.txt").stat()
+        except OSError:
+            return False
+        return (bool(recorded) and stat.st_size == recorded.get("size")
+                and stat.st_mtime_ns == recorded.get("mtime_ns"))
+
+    def _bundle_is_current(self, bundle: str, sections: List[Dict[str, Any]], changed: List[str]) -> bool:
+        recorded = self.manifest["bundles"].get(bundle)
+        if changed or not recorded:
+            return False
+        if [s["name"] for s in recorded["sections"]] != [s["name"] for s in sections]:
+            return False
+        return self._bundle_matches_manifest(bundle)
+
+    def _write_section(self, out, section: Dict[str, Any]):
+        """Stream one section from its source file"""
+        name = section["name"]
+        out.write(section_start(name))
+        last = b'\n'
+        with open(self.source_root / section["source"], 'rb') as src:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                out.write(chunk)
+                last = chunk[-1:]
+        if last != b'\n':
+            out.write(b'\n')
+        out.write(b'\n')
+        out.write(section_end(name))
+
+    def build_bundle(self, bundle: str, force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+        """Rebuild one bundle if (and only where) its sources changed"""
+        sections, changed = self.plan(bundle)
+        bundle_path = self.output_dir / f"{bundle}.txt"
+
+        if not sections:
+            return {"bundle": bundle, "status": "empty", "changed": []}
+        if not force and self._bundle_is_current(bundle, sections, changed):
+            return {"bundle": bundle, "status": "unchanged", "changed": []}
+        if dry_run:
+            return {"bundle": bundle, "status": "would rebuild", "changed": changed}
+
+        recorded = {
+            s["name"]: s for s in self.manifest["bundles"].get(bundle, {}).get("sections", [])
+        }
+        # Sections are copied by offset, so only from the exact file the manifest was written for
+        reusable = set() if force or not self._bundle_matches_manifest(bundle) else {
+            s["name"] for s in sections
+            if s["name"] in recorded and s["name"] not in changed and "offset" in recorded[s["name"]]
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.output_dir), prefix=f".{bundle}.", suffix=".tmp")
+        copied = 0
+        try:
+            old = open(bundle_path, 'rb') if reusable else None
+            try:
+                with os.fdopen(fd, 'wb') as out:
+                    for section in sections:
+                        section["offset"] = out.tell()
+                        previous = recorded.get(section["name"])
+                        if section["name"] in reusable:
+                            old.seek(previous["offset"])
+                            remaining = previous["length"]
+                            while remaining:
+                                chunk = old.read(min(CHUNK_SIZE, remaining))
+                                if not chunk:
+                                    raise IOError(f"{bundle_path} is shorter than its manifest")
+                                out.write(chunk)
+                                remaining -= len(chunk)
+                            copied += 1
+                        else:
+                            self._write_section(out, section)
+                        section["length"] = out.tell() - section["offset"]
+                    size = out.tell()
+                    out.flush()
+                    os.fsync(out.fileno())
+            finally:
+                if old:
+                    old.close()
+            os.replace(tmp_path, bundle_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self.manifest["bundles"][bundle] = {
+            "sections": sections,
+            "size": size,
+            "mtime_ns": bundle_path.stat().st_mtime_ns,
+        }
+        return {
+            "bundle": bundle,
+            "status": "rebuilt",
+            "changed": changed,
+            "copied_sections": copied,
+            "written_sections": len(sections) - copied,
+        }
+
+    def build(self, force: bool = False, dry_run: bool = False) -> List[Dict[str, Any]]:
+        """Build every bundle and persist the manifest"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        results = [self.build_bundle(bundle, force=force, dry_run=dry_run) for bundle in self.folders]
+        if not dry_run and any(r["status"] == "rebuilt" for r in results):
+            atomic_write_json(self.output_dir / MANIFEST_NAME, self.manifest)
+        return results
+
+def main():
+    """Command line entry point"""
+    script_dir = Path(__file__).resolve().parent
+    parser = argparse.ArgumentParser(description="Incrementally build BMAD web bundles")
+    parser.add_argument("--source", default=str(script_dir.parent),
+                        help="bmad-agent directory containing the asset folders")
+    parser.add_argument("--output", default=str(script_dir.parent.parent / "web-build-sample"),
+                        help="directory the .txt bundles are written to")
+    parser.add_argument("--bundle", action="append", dest="bundles",
+                        help="only build the named bundle (repeatable)")
+    parser.add_argument("--force", action="store_true", help="rewrite every section of every bundle")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    args = parser.parse_args()
+
+    bundler = WebBundler(args.source, args.output, args.bundles)
+    for result in bundler.build(force=args.force, dry_run=args.dry_run):
+        line = f"{result['bundle']}.txt: {result['status']}"
+        if result["changed"]:
+            line += f" ({', '.join(result['changed'])})"
+        print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())